@@ -0,0 +1,6 @@
+"""
+Benchmarks for gams2pyomo.
+
+The benchmarks are run as modules at the root directory, e.g.,
+`python -m benchmarks.quicksum`.
+"""
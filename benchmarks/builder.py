@@ -0,0 +1,84 @@
+"""
+Compare building the Pyomo model directly (`GAMSTranslator.build`) with
+generating the code (`GAMSTranslator.translate`) and executing it, on
+scaled-up `examples/trnsport.gms`.
+
+Usage (at the root directory):
+    python -m benchmarks.builder --sizes 20 50 100
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from unittest import mock
+
+# import Pyomo before timing
+import pyomo.environ
+from gams2pyomo import GAMSTranslator
+from .models import transport
+from .quicksum import _DummySolver
+
+
+def generate_and_execute(text):
+    """
+    Translate the GAMS code and execute the generated code with the solve
+    calls stubbed out.
+
+    Returns:
+        tuple: The times (seconds) of the translation, the compilation of the
+            generated code, and its execution.
+    """
+
+    start = time.perf_counter()
+    code = GAMSTranslator(io.StringIO(text)).translate()
+    translated = time.perf_counter()
+    compiled = compile(code, '<generated>', 'exec')
+    compiled_at = time.perf_counter()
+
+    with mock.patch('pyomo.environ.SolverFactory', _DummySolver), \
+            contextlib.redirect_stdout(io.StringIO()):
+        exec(compiled, {})
+    end = time.perf_counter()
+
+    return translated - start, compiled_at - translated, end - compiled_at
+
+
+def build(text):
+    """
+    Build the model directly.
+
+    Returns:
+        float: The time in seconds.
+    """
+
+    start = time.perf_counter()
+    GAMSTranslator(io.StringIO(text)).build()
+    return time.perf_counter() - start
+
+
+def run(sizes, repeat=3):
+
+    print(f"{'size':>8} {'translate':>10} {'compile':>8} {'execute':>8} {'total (s)':>10} "
+          f"{'build (s)':>10} {'speedup':>8}")
+
+    for n in sizes:
+        text = transport(n, n)
+
+        source = min((generate_and_execute(text) for _ in range(repeat)), key=sum)
+        direct = min(build(text) for _ in range(repeat))
+
+        print(f"{n:>5}x{n:<3}{source[0]:>10.3f} {source[1]:>8.3f} {source[2]:>8.3f} "
+              f"{sum(source):>10.3f} {direct:>10.3f} {sum(source) / direct:>8.2f}")
+
+
+def main():
+    args = argparse.ArgumentParser(prog='model builder benchmark')
+    args.add_argument('--sizes', type=int, nargs='+', default=[20, 50, 100])
+    args.add_argument('--repeat', type=int, default=3)
+    args = args.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
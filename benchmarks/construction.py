@@ -0,0 +1,174 @@
+"""
+Measure how long the generated code takes to build the Pyomo model with the
+code generation options, on the examples and on scaled-up models: the
+compilation of the generated code, the construction of the components (the
+execution with the solve calls stubbed out), and the memory of the model.
+
+Usage (at the root directory):
+    python -m benchmarks.construction --sizes 50 100 --modes default no-quicksum
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+import tracemalloc
+from unittest import mock
+
+# import Pyomo before timing
+import pyomo.environ
+from gams2pyomo import GAMSTranslator
+from .models import transport, synthetic
+from .quicksum import _DummySolver
+
+# mode -> code generation options
+MODES = {
+    'default': {},
+    'no-quicksum': {'quicksum': False},
+    'linear-expressions': {'linear_expressions': True},
+    'all-mutable': {'mutability_analysis': False},
+    'no-evaluate-data': {'evaluate_data': False},
+    'bulk-assignments': {'bulk_assignments': True},
+    'lazy-equations': {'lazy_equations': True},
+}
+
+_EXAMPLES = ('examples/trnsport.gms', 'examples/process.gms')
+
+
+def execute(compiled):
+    """
+    Execute the compiled code with the solve calls stubbed out.
+
+    Returns:
+        dict: The namespace of the code, with the model in `m`.
+    """
+
+    namespace = {'__name__': '__generated__'}
+    with mock.patch('pyomo.environ.SolverFactory', _DummySolver), \
+            contextlib.redirect_stdout(io.StringIO()):
+        exec(compiled, namespace)
+    return namespace
+
+
+def measure(text, options, repeat=3):
+    """
+    Translate the GAMS code with the options, and compile and execute the
+    generated code `repeat` times, and once more with `tracemalloc` for the
+    memory.
+
+    Returns:
+        dict: The times (seconds) of the translation, the compilation, and
+            the construction (the minimum over the repetitions), the memory
+            held by the model and the peak memory of the construction
+            (bytes), and the numbers of variables and constraints.
+    """
+
+    start = time.perf_counter()
+    code = GAMSTranslator(io.StringIO(text)).translate(**options)
+    translation = time.perf_counter() - start
+
+    compilation = construction = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compiled = compile(code, '<generated>', 'exec')
+        compiled_at = time.perf_counter()
+        namespace = execute(compiled)
+        end = time.perf_counter()
+        compilation = min(compilation, compiled_at - start)
+        construction = min(construction, end - compiled_at)
+
+    model = namespace['m']
+    res = {
+        'translation': translation,
+        'compilation': compilation,
+        'construction': construction,
+        'variables': model.nvariables(),
+        'constraints': model.nconstraints(),
+    }
+    del namespace, model
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        namespace = execute(compiled)
+        res['memory'], res['peak_memory'] = (m - before for m in tracemalloc.get_traced_memory())
+    finally:
+        tracemalloc.stop()
+
+    return res
+
+
+def models(sizes, synthetic_sizes):
+    """
+    The benchmark models: the examples, `examples/trnsport.gms` scaled up to
+    each size, and the synthetic models (see `models.synthetic`).
+
+    Returns:
+        dict: Name -> GAMS code.
+    """
+
+    res = {}
+    for path in _EXAMPLES:
+        with open(path, encoding='utf8') as f:
+            res[path.split('/')[-1][:-4]] = f.read()
+    for n in sizes:
+        res[f'transport-{n}'] = transport(n, n)
+    for n in synthetic_sizes:
+        res[f'synthetic-{n}'] = synthetic(n)
+    return res
+
+
+def run(sizes, synthetic_sizes, modes, repeat=3):
+    """
+    Run the benchmark for each model and mode.
+
+    Returns:
+        dict: Model -> mode -> the results of `measure`, or the error if the
+            translation or the generated code fails.
+    """
+
+    results = {}
+
+    print(f"{'model':<16} {'mode':<18} {'translate':>10} {'compile':>8} {'construct':>10} "
+          f"{'memory (MB)':>12} {'peak (MB)':>10} {'constraints':>12}")
+
+    for name, text in models(sizes, synthetic_sizes).items():
+        results[name] = {}
+        for mode in modes:
+            try:
+                r = measure(text, MODES[mode], repeat)
+            except Exception as e:
+                # e.g., a statement of the generated code fails in this mode
+                results[name][mode] = {'error': f"{type(e).__name__}: {e}"}
+                print(f"{name:<16} {mode:<18} failed: {type(e).__name__}")
+                continue
+            results[name][mode] = r
+
+            print(f"{name:<16} {mode:<18} {r['translation']:>10.3f} {r['compilation']:>8.3f} "
+                  f"{r['construction']:>10.3f} {r['memory'] / 2 ** 20:>12.2f} "
+                  f"{r['peak_memory'] / 2 ** 20:>10.2f} {r['constraints']:>12}")
+
+    return results
+
+
+def main():
+    args = argparse.ArgumentParser(prog='model construction benchmark')
+    args.add_argument('--sizes', type=int, nargs='+', default=[50, 100],
+                      help="the sizes of the scaled-up transportation models")
+    args.add_argument('--synthetic', type=int, nargs='*', default=[8],
+                      help="the set sizes of the synthetic models")
+    args.add_argument('--modes', nargs='+', choices=list(MODES), default=['default', 'no-quicksum', 'all-mutable'])
+    args.add_argument('--repeat', type=int, default=3)
+    args.add_argument('--json', metavar='FILE', help="save the results as JSON")
+    args = args.parse_args()
+
+    results = run(args.sizes, args.synthetic, args.modes, args.repeat)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
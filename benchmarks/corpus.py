@@ -0,0 +1,219 @@
+"""
+Translate the GAMS files in `test/gams_basic` and `examples`, record the time
+of each translation phase per file, and compare the outputs byte for byte with
+the expected outputs in `benchmarks/expected`.
+
+Usage (at the root directory):
+    python -m benchmarks.corpus --report report.json
+    python -m benchmarks.corpus --update
+    python -m benchmarks.corpus --baseline old_report.json
+
+A file is reported as `match`, `mismatch` (with the first differing line),
+`missing` (no expected output), `known error` (the translation raised the
+exception stored as expected, in a `.err` file), or `error`. With `--baseline`, the files translated slower than in a previous
+report by more than the threshold are also reported. The exit status is 1 if
+there are mismatches, new errors, or slowdowns.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+from gams2pyomo import GAMSTranslator
+from .translation import _MIN_SECONDS
+
+_CORPUS = ('test/gams_basic/**/*.gms', 'examples/*.gms')
+
+EXPECTED_DIR = os.path.join(os.path.dirname(__file__), 'expected')
+
+
+def corpus():
+    """
+    The GAMS files of the corpus, relative to the root directory.
+    """
+    return sorted(f for pattern in _CORPUS for f in glob.glob(pattern, recursive=True))
+
+
+def expected_path(path, extension='.py'):
+    """
+    The expected output of a GAMS file, e.g.,
+    `benchmarks/expected/examples/trnsport.py` for `examples/trnsport.gms`,
+    or its expected exception with the extension `.err`.
+    """
+    return os.path.join(EXPECTED_DIR, os.path.splitext(path)[0] + extension)
+
+
+def _read(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def first_difference(a, b):
+    """
+    The first line (from 1) where the two outputs differ.
+    """
+
+    a, b = a.splitlines(), b.splitlines()
+    for n, (_a, _b) in enumerate(zip(a, b), 1):
+        if _a != _b:
+            return n
+    return min(len(a), len(b)) + 1
+
+
+def check(path, update=False):
+    """
+    Translate a file and compare the output with the expected output.
+
+    Args:
+        path (str): The GAMS file.
+        update (bool, optional): Whether to store the output (or the type of
+            the exception) as the expected output. Defaults to False.
+
+    Returns:
+        dict: The file, the status, the time of each phase and the total
+            time (seconds), the size of the output, and the first differing
+            line or the error.
+    """
+
+    res = {'file': path}
+
+    try:
+        output, statistics = GAMSTranslator(path).translate(return_statistics=True)
+    except Exception as e:
+        error = type(e).__name__
+        res['error'] = f"{error}: {e}"
+
+        expected = expected_path(path, '.err')
+        if update:
+            _write(expected, error.encode('utf8'))
+            if os.path.exists(expected_path(path)):
+                os.remove(expected_path(path))
+        res['status'] = 'known error' if _read(expected) == error.encode('utf8') else 'error'
+        return res
+
+    output = output.encode('utf8')
+    res['phases'] = {name: p['seconds'] for name, p in statistics['phases'].items()}
+    res['seconds'] = sum(res['phases'].values())
+    res['output_size'] = len(output)
+
+    expected = expected_path(path)
+    if update:
+        _write(expected, output)
+        if os.path.exists(expected_path(path, '.err')):
+            os.remove(expected_path(path, '.err'))
+
+    expected = _read(expected)
+    if expected is None:
+        res['status'] = 'missing'
+        return res
+
+    if output == expected:
+        res['status'] = 'match'
+    else:
+        res['status'] = 'mismatch'
+        res['first_difference'] = first_difference(output.decode('utf8'), expected.decode('utf8'))
+
+    return res
+
+
+def slowdowns(report, baseline, threshold=0.2):
+    """
+    The files translated slower than in the baseline report by more than the
+    threshold.
+
+    Returns:
+        list: Tuples of the file, and the baseline and current times.
+    """
+
+    old = {r['file']: r['seconds'] for r in baseline['files'] if 'seconds' in r}
+
+    res = []
+    for r in report['files']:
+        if 'seconds' not in r or old.get(r['file'], 0) < _MIN_SECONDS:
+            continue
+        if r['seconds'] > old[r['file']] * (1 + threshold):
+            res.append((r['file'], old[r['file']], r['seconds']))
+    return res
+
+
+def run(files, update=False):
+    """
+    Check each file.
+
+    Returns:
+        dict: The results of `check` for each file, and the number of files
+            and the total time of each phase.
+    """
+
+    results = []
+
+    print(f"{'status':<11} {'parsing':>8} {'transform':>10} {'assembly':>9} {'total (s)':>10}  file")
+
+    for path in files:
+        r = check(path, update)
+        results.append(r)
+
+        if 'phases' in r:
+            print(f"{r['status']:<11} {r['phases']['parsing']:>8.3f} {r['phases']['transformation']:>10.3f} "
+                  f"{r['phases']['assembly']:>9.3f} {r['seconds']:>10.3f}  {path}" +
+                  (f"  (line {r['first_difference']})" if 'first_difference' in r else ""))
+        else:
+            print(f"{r['status']:<11} {'':>8} {'':>10} {'':>9} {'':>10}  {path}  ({r['error'].splitlines()[0]})")
+
+    totals = {}
+    for r in results:
+        for name, seconds in r.get('phases', {}).items():
+            totals[name] = totals.get(name, 0) + seconds
+
+    statuses = {}
+    for r in results:
+        statuses[r['status']] = statuses.get(r['status'], 0) + 1
+
+    return {'statuses': statuses, 'phases': totals, 'files': results}
+
+
+def main():
+    args = argparse.ArgumentParser(prog='corpus regression benchmark')
+    args.add_argument('files', nargs='*', help="the GAMS files (default: the corpus)")
+    args.add_argument('--update', action='store_true', help="store the outputs as the expected outputs")
+    args.add_argument('--report', metavar='FILE', help="save the report as JSON")
+    args.add_argument('--baseline', metavar='FILE', help="compare the times with a previous report")
+    args.add_argument('--threshold', type=float, default=0.2,
+                      help="the relative slowdown reported with --baseline (default: 0.2)")
+    args = args.parse_args()
+
+    report = run(args.files or corpus(), args.update)
+
+    print(', '.join(f"{n} {status}" for status, n in report['statuses'].items()) + "; " +
+          ', '.join(f"{name} {seconds:.3f}s" for name, seconds in report['phases'].items()))
+
+    failed = report['statuses'].get('mismatch', 0) + report['statuses'].get('error', 0) > 0
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report['slowdowns'] = slowdowns(report, baseline, args.threshold)
+        for path, old, new in report['slowdowns']:
+            print(f"Slowdown: {path} {old:.3f}s -> {new:.3f}s (+{100 * (new / old - 1):.0f}%)")
+        failed = failed or bool(report['slowdowns'])
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=1)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'basic.gms' --------------------------
+
+from pyomo.environ import *
+import math
+
+
+m = ConcreteModel()
+m.total_wind['time'] = sum(m.p_max_pu_t['time', 'wind'] for wind in m.WIND)
+m.total_solar['time'] = math.prod(m.p_max_pu_t['time', 'solar', 'x2'] for solar in m.SOLAR for x2 in m.X2)
+m.marginal_cost_anc['gen', 'anc_type'] = m.anc_scale_follow_cost['anc_type'] * m.load_follow_cost['gen']
+m.marginal_cost_anc['gen', 'anc_type'] = m.anc_scale_follow_cost['anc_type'] + m.load_follow_cost['gen']
+m.marginal_cost_anc['gen', 'anc_type'] = m.anc_scale_follow_cost['anc_type'] - m.load_follow_cost['gen']
+m.marginal_cost_anc['gen', 'anc_type'] = m.anc_scale_follow_cost['anc_type'] / m.load_follow_cost['gen']
@@ -0,0 +1,10 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ----------------------- FILE SOURCE: 'conditional.gms' -----------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.p_max_pu_t['time', 'solar'] = sum(m.p_max_pu_t_sr['time', 'sr'] for sr in m.SR if m.solar_sr['solar', 'sr'])
+if list(m.I).index(i) + 1 >= 2:
+	m.g['i'] = (m.g[m.I.prev(i, 2)] if m.I.ord(i) > 2 else 0) + (m.g[m.I.prev(i, 1)] if m.I.ord(i) > 1 else 0)
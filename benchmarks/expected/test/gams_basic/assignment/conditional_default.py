@@ -0,0 +1,22 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------- FILE SOURCE: 'conditional_default.gms' -------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.I = Set(initialize=['a', 'b', 'c'], ordered=True)
+m.q = Param(m.I, initialize={'a': 1, 'b': 2, 'c': 3}, default=0)
+m.w = Param(m.I, initialize={'b': 4, 'c': 6}, default=0)
+m.s = Param(default=0)
+m.x = Var(m.I, within=NonNegativeReals)
+m.z = Var()
+def e(m, i):
+	return m.x[i] >= (m.w[i] + m.s)
+m.e = Constraint(m.I, rule=e)
+def obj(m):
+	return m.z == quicksum(m.x[i] for i in m.I)
+m.obj = Constraint(rule=obj)
+m._obj_ = Objective(rule=m.z, sense=1)
+opt = SolverFactory('gurobi')
+opt.solve(m, tee=True)
@@ -0,0 +1,11 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'suffix.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.WALL_TIME = m.tanksize1
+m.projectX['project', 'time'].setub(0)
+m.projectX['project', 'time'].setlb(0)
+m.genX['gen', 'time'].setub(m.p_nom['gen'])
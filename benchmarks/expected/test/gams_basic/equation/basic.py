@@ -0,0 +1,16 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'basic.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+def ProfitAcct(m):
+	return m.Profit == (quicksum((m.Netreturns['products'] * m.Production['products']) for products in m.PRODUCTS) - quicksum((m.Hiredata['resources', 'cost'] * m.HireResource['resources']) for resources in m.RESOURCES))
+m.ProfitAcct = Constraint(rule=ProfitAcct)
+def Available(m, resources):
+	return quicksum((m.Resourceusage['resources', 'products'] * m.Production['products']) for products in m.PRODUCTS) <= (m.Endowments['resources'] + m.HireResource['resources'])
+m.Available = Constraint(m.RESOURCES, rule=Available)
+def Hirelimit(m, resources):
+	return m.HireResource['resources'] <= m.Hiredata['resources', 'Maxavailable']
+m.Hirelimit = Constraint(m.RESOURCES, rule=Hirelimit)
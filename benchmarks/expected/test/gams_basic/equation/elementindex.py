@@ -0,0 +1,11 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ---------------------- FILE SOURCE: 'elementindex.gms' -----------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+#  Equation definition
+def ProfitAcct(m):
+	return m.Profit == (quicksum((m.Netreturns['products'] * m.Production['products']) for products in m.PRODUCTS) - quicksum((m.Hiredata['resources', 'cost'] * m.HireResource['resources']) for resources in m.RESOURCES))
+m.ProfitAcct = Constraint(rule=ProfitAcct)
@@ -0,0 +1,13 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ---------------------- FILE SOURCE: 'indexoperator.gms' ----------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+def storage_balance(m, battery, time):
+	if m.ch['time']:
+		return (m.energyX['battery', m.TIME.next(time, 1)] if m.TIME.ord(time) <= len(m.TIME) - 1 else 0) == (m.energyX['battery', 'time'] + m.storeX['battery', 'time'] * m.efficiency_store['battery'] - m.dispatchX['battery', 'time'])
+	else:
+		return Constraint.Skip
+m.storage_balance = Constraint(m.BATTERY, list(m.TIME)[:-1], rule=storage_balance)
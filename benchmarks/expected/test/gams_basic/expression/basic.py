@@ -0,0 +1,8 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'basic.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.profit = sum((m.Netreturns['products'] * m.Production['products']) for products in m.PRODUCTS) - sum((m.Hiredata['resources', 'cost'] * m.HireResource['resources']) for resources in m.RESOURCES)
@@ -0,0 +1,8 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'abort.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+raise ValueError('test')
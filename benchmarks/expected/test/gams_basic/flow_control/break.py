@@ -0,0 +1,11 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'break.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+for i in m.I:
+	if 'i6' == i:
+		break
+	m.cnt = m.cnt + 1
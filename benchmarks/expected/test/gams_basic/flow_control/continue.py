@@ -0,0 +1,11 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------ FILE SOURCE: 'continue.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+for i in m.I:
+	if (list(m.I).index(i) + 1 == 0):
+		continue
+	m.cnt = m.cnt + 1
@@ -0,0 +1,13 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------ FILE SOURCE: 'for_loop.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.s = Param(default=0)
+for s in [np.float64(-3.8), np.float64(-2.4), np.float64(-1.0)]:
+	s.pprint()
+m.s = Param(default=0)
+for s in [np.float64(3.0), np.float64(1.6), np.float64(0.20000000000000018)]:
+	s.pprint()
@@ -0,0 +1,13 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'if-else.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+if m.f <= 0:
+	m.p['i'] = -1
+	m.q['j'] = -1
+else:
+	m.p['i'] = m.p['i'] ** 3
+	m.q['j'] = m.q['j'] ** 3
@@ -0,0 +1,10 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------ FILE SOURCE: 'if-single.gms' ------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+if m.f <= 0:
+	m.p['i'] = -1
+	m.q['j'] = -1
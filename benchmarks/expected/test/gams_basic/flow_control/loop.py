@@ -0,0 +1,10 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'loop.gms' ---------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+for t in m.T:
+	if m.T.ord(t) <= len(m.T) - 1:
+		m.pop[m.T.next(t, 1)] = m.pop['t'] + m.growth['t']
@@ -0,0 +1,20 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'repeat.gms' --------------------------
+
+from pyomo.environ import *
+import math
+
+
+m = ConcreteModel()
+while True:
+	m.a = m.a + 1
+	m.a.pprint()
+	if m.a == 5: break
+while True:
+	m.a = m.a + 0.1
+	m.a.pprint()
+	if abs((m.a - 5)) < 1e-06: break
+while True:
+	m.a = m.a + 1
+	m.a.pprint()
+	if m.a >= 3: break
@@ -0,0 +1,9 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'while.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+while round(m.x, 2) < 10:
+	m.x = m.x + 0.01
@@ -0,0 +1,22 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------ FILE SOURCE: 'comments.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+
+"""The model can be temporally decomposed in a few ways.
+"""
+
+# ***************************
+# ** Model Initialization ***
+# *************************** 
+# ***********
+# ** Time ***
+# ***********
+m.TEST = Set(initialize=None, ordered=True)
+#  Test
+# *ao list asset
+m.TEST2 = Set(initialize=['elem'], ordered=True)
+# *ao param asset 'parameter.capacity.capacity'
@@ -0,0 +1,9 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'display.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.SOLVER_TIME.pprint()
+m.WALL_TIME.pprint()
@@ -0,0 +1,9 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ----------------------- FILE SOURCE: 'func_import.gms' -----------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.d = Param(default=0)
+m.d.pprint()
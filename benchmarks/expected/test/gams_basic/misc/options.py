@@ -0,0 +1,11 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'options.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+# OPTION MINLP=bonmin;
+# OPTION MINLP=ANTIGONE;
+# OPTION MINLP=BARON;
+# OPTION MINLP=COUENNE;
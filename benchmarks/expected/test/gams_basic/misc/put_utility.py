@@ -0,0 +1,7 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ----------------------- FILE SOURCE: 'put_utility.gms' -----------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
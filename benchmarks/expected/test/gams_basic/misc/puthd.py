@@ -0,0 +1,8 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'puthd.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+#  Header Block with column headings for next page (will be used only if necessary)
@@ -0,0 +1,7 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'putpage.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
@@ -0,0 +1,7 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'puttl.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
@@ -0,0 +1,13 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# --------------------- FILE SOURCE: 'parameter-basic.gms' ---------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.date = Param(m.TIME, default=0, doc='Maps time to gams internal date format')
+m.datetime_map = Param(m.TIME, m.DATETIME_COMP, default=0, doc='Maps time to datetime components')
+m.anc_scale_follow_cost = Param(m.ANC_TYPE, initialize={'reg_up': 0.75, 'reg_down': 0.75, 'res_spin': 1, 'res_nonspin': 0.2}, default=0)
+m.anc_scale_mc_prob = Param(m.ANC_TYPE, initialize={'reg_up': 1, 'reg_down': 0.25, 'res_spin': 0.5, 'res_nonspin': 0.25}, default=0, doc='Probability of calling on resource (which adds marginal cost to bid)')
+m.Netreturns = Param(m.PRODUCTS, initialize={'Chairs': 19, 'Tables': 50, 'Dressers': 75}, default=0, doc='Net returns per unit produced')
+m.Endowments = Param(m.RESOURCES, initialize={'RawWood': 700, 'Labor': 1000, 'WarehouseSpace': 240}, default=0, doc='Amount of each resource available')
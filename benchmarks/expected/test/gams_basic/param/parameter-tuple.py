@@ -0,0 +1,8 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# --------------------- FILE SOURCE: 'parameter-tuple.gms' ---------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.product_rate = Param(initialize={'supply1.energy.period1.tier1': 10.4, 'supply1.energy.period1.tier2': 15.2}, default=0)
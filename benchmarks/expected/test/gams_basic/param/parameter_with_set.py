@@ -0,0 +1,15 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------- FILE SOURCE: 'parameter_with_set.gms' --------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.ABC = Param(m.A, m.B, default=0, doc='just something (is)')
+m.DEF = Param(m.A, default=0, doc='something else (yeah)')
+m.XYZ = Param(m.A, m.C, default=0, doc='anohter one (yeah)')
+m.PA = Param(m.T, default=0, doc='Lorem ipsum 1 (something)')
+m.PB = Param(m.T, default=0, doc='Lorem ipsum 2 (something)')
+m.PC = Param(m.T, default=0, doc='Lorem ipsum 3 (something)')
+m.PD = Param(m.ABCD, m.T, default=0, doc='Lorem ipsum 4 (something)')
+m.PE = Param(m.T, default=0, doc='Lorem ipsum 4 (something)')
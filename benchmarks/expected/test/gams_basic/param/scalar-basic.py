@@ -0,0 +1,29 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ---------------------- FILE SOURCE: 'scalar-basic.gms' -----------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.load_shed_cost = Param(default=0)
+m.bad = Param(default=0, doc='string hea')
+m.anc_violation_cost = Param(default=0, doc='exanple with ; / ,')
+m.flow_violation_cost = Param(default=0)
+m.PKGZ = Param(default=0, doc='initial return to ')
+m.capital = Param(initialize=1, doc=' for the government')
+m.ERZ = Param(default=0, doc='initial')
+m.exchange = Param(default=0)
+m.rate = Param(initialize=1)
+m.KSZ = Param(default=0)
+m.initial = Param(default=0)
+m.capital = Param(default=0)
+m.endowment = Param(default=0)
+m.LSZ = Param(default=0)
+m.initial = Param(default=0)
+m.supply = Param(default=0)
+m.of = Param(default=0)
+m.labor = Param(default=0)
+m.PLZ = Param(default=0)
+m.initial = Param(default=0)
+m.wage = Param(default=0)
+m.rate = Param(initialize=1)
@@ -0,0 +1,28 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'scalars.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+#  test
+m.PKGZ = Param(initialize=1, doc='abc')
+m.ERZ = Param(default=0, doc='efg ')
+m.abc = Param(initialize=1)
+m.KSZ = Param(default=0, doc='hij')
+m.LSZ = Param(default=0, doc='lmn ')
+m.efg = Param(default=0)
+m.PLZ = Param(default=0, doc='opq')
+m.ABC = Param(initialize=1, doc='bea')
+m.PKGZ = Param(default=0)
+m.abc = Param(initialize=1)
+m.ERZ = Param(default=0)
+m.efg = Param(initialize=1)
+m.KSZ = Param(default=0)
+m.hij = Param(default=0)
+m.LSZ = Param(default=0)
+m.lmn = Param(initialize=2)
+m.PLZ = Param(default=0)
+m.opq = Param(default=0)
+m.ABC = Param(default=0)
+m.bea = Param(initialize=1)
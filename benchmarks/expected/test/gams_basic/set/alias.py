@@ -0,0 +1,8 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'alias.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.TIME = Set(initialize=None, ordered=True, doc='Time')
@@ -0,0 +1,11 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'basic.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.TIME = Set(initialize=None, ordered=True, doc='Time index of model. Currently assumed to be hourly.')
+m.MONTH = Set(initialize=['m1', 'm2', 'm3'], ordered=True)
+m.HOUR = Set(initialize=None, ordered=True)
+m.DAY_OF_WEEK = Set(initialize=None, ordered=True)
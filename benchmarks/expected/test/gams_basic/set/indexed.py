@@ -0,0 +1,9 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'indexed.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.WEEKEND = Set(initialize=None, ordered=True)
+m.WEEKDAY = Set(initialize=[f'dow{i}' for i in range(2, 7)], ordered=True)
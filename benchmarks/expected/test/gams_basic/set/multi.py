@@ -0,0 +1,16 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'multi.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+#    Date time map
+m.DATETIME_COMP = Set(initialize=['year', 'month', 'day', 'hour', 'minute', 'second'], ordered=True, doc='Datetime components used to map a time index to a real datetime.')
+m.YEAR = Set(initialize=[f'y{i}' for i in range(2018, 2029)], ordered=True, doc='Years possible in the simulat')
+m.MONTH = Set(initialize=[f'm{i}' for i in range(1, 13)], ordered=True, doc='Months of the year')
+m.M2T = Set(initialize=None, ordered=True, doc='Map month to time')
+m.PRODUCTS = Set(initialize=['Chairs', 'Tables', 'Dressers'], ordered=True, doc='Items produced')
+m.RESOURCES = Set(initialize=['RawWood', 'Labor', 'WarehouseSpace'], ordered=True, doc='Resources limiting production')
+m.HIRETERMS = Set(initialize=['Cost', 'Maxavailable'], ordered=True, doc='Resource hiring terms')
+m.WEEKEND_SCHEDULE = Set(initialize=['supply1.energy.m1.h1.period1', 'supply1.energy.m1.h2.period1', 'supply1.energy.m1.h3.period1'], ordered=True)
@@ -0,0 +1,9 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ----------------------- FILE SOURCE: 'pure-string.gms' -----------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.ALLOY = Set(initialize=['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i'], ordered=True, doc='products on the market')
+m.ELEM = Set(initialize=['lead', 'zinc', 'tin'], ordered=True, doc='required elements')
@@ -0,0 +1,11 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'ranged.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.MONTH = Set(initialize=[f'm{i}' for i in range(1, 13)], ordered=True)
+m.HOUR = Set(initialize=[f'h{i}' for i in range(1, 25)], ordered=True)
+m.DAY_OF_WEEK = Set(initialize=[f'dow{i}' for i in range(1, 8)], ordered=True)
+m.DAY_OF_WEEK2 = Set(initialize=['dow1', 'dow2', 'dow3', 'dow4', 'dow5', 'dow6', 'dow7', 'dow9', 'dow10'], ordered=True)
@@ -0,0 +1,8 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ----------------------- FILE SOURCE: 'string-int.gms' ------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.ALLOY = Set(initialize=[f'a{i}' for i in range(1, 11)], ordered=True, doc='products on the market')
@@ -0,0 +1,9 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'basic.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.Resourceusage = Param(m.RESOURCES, m.PRODUCTS, initialize={('RawWood', 'Chairs'): 8, ('RawWood', 'Tables'): 20, ('RawWood', 'Dressers'): 32, ('Labor', 'Chairs'): 12, ('Labor', 'Tables'): 32, ('Labor', 'Dressers'): 45, ('WarehouseSpace', 'Chairs'): 4, ('WarehouseSpace', 'Tables'): 12, ('WarehouseSpace', 'Dressers'): 10}, default=0, doc='Resource usage per unit produced')
+m.Hiredata = Param(m.RESOURCES, m.HIRETERMS, initialize={('RawWood', 'Cost'): 3, ('RawWood', 'Maxavailable'): 200, ('Labor', 'Cost'): 12, ('Labor', 'Maxavailable'): 120, ('WarehouseSpace', 'Cost'): 4, ('WarehouseSpace', 'Maxavailable'): 112}, default=0, doc='Resource hiring data')
@@ -0,0 +1,8 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ----------------------- FILE SOURCE: 'star-index.gms' ------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.compdat = Param(['lead', 'zinc', 'tin', 'price'], m.ALLOY, initialize={('lead', 'a'): 10, ('lead', 'b'): 10, ('lead', 'c'): 40, ('lead', 'd'): 60, ('lead', 'e'): 30, ('lead', 'f'): 30, ('lead', 'g'): 30, ('lead', 'h'): 50, ('lead', 'i'): 20, ('zinc', 'a'): 10, ('zinc', 'b'): 30, ('zinc', 'c'): 50, ('zinc', 'd'): 30, ('zinc', 'e'): 30, ('zinc', 'f'): 40, ('zinc', 'g'): 20, ('zinc', 'h'): 40, ('zinc', 'i'): 30, ('tin', 'a'): 80, ('tin', 'b'): 60, ('tin', 'c'): 10, ('tin', 'd'): 10, ('tin', 'e'): 40, ('tin', 'f'): 30, ('tin', 'g'): 50, ('tin', 'h'): 10, ('tin', 'i'): 50, ('price', 'a'): 4.1, ('price', 'b'): 4.3, ('price', 'c'): 5.8, ('price', 'd'): 6, ('price', 'e'): 7.6, ('price', 'f'): 7.5, ('price', 'g'): 7.3, ('price', 'h'): 6.9, ('price', 'i'): 7.3}, default=0, doc='composition data (pct and price)')
@@ -0,0 +1,10 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# -------------------------- FILE SOURCE: 'basic.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.Production = Var(m.PRODUCTS, within=NonNegativeReals, doc='Number of units produced')
+m.HireResource = Var(m.RESOURCES, within=NonNegativeReals, doc='Resources hired')
+m.Profit = Var(doc='Total sum of net returns')
@@ -0,0 +1,8 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------ FILE SOURCE: 'binary_v.gms' -------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.assignProductToCampaign = Var(m.P, m.N, m.H, within=Binary, doc='binary variable mapping product to campaign')
@@ -0,0 +1,8 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ------------------------- FILE SOURCE: 'free_v.gms' --------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.phi = Var(doc='total cost ($)')
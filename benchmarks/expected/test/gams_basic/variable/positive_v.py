@@ -0,0 +1,18 @@
+# --------------- THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO ---------------
+# ----------------------- FILE SOURCE: 'positive_v.gms' ------------------------
+
+from pyomo.environ import *
+
+
+m = ConcreteModel()
+m.campaignDuration = Var(m.N, m.H, within=NonNegativeReals, doc='duration of the campaigns')
+m.amtProductInCampaign = Var(m.P, m.N, m.H, within=NonNegativeReals, doc='amount of product p produced in campaign n')
+m.productInventory = Var(m.P, m.N, m.H, within=NonNegativeReals, doc='amount of product p stored at the beginning of campaign n')
+m.productTankSize = Var(m.P, within=NonNegativeReals, doc='size of the product tanks in tons')
+m.auxiliaryVariable = Var(m.P, m.N, m.H, within=NonNegativeReals, doc='auxiliary variables')
+m.investmentCost = Var(m.H, within=NonNegativeReals, doc='investment costs')
+m.setupCost = Var(m.H, within=NonNegativeReals, doc='campaign setup costs')
+m.variableCost = Var(m.H, within=NonNegativeReals, doc='variable storage costs')
+m.cycleTime = Var(m.H, within=NonNegativeReals, doc='cycle time')
+m.costPerTon = Var(m.H, within=NonNegativeReals, doc='cost per ton')
+m.campaignLength = Var(m.N, m.H, within=NonNegativeReals, doc='campaignLength is campaignDuration + setuptime ')
@@ -0,0 +1,201 @@
+"""
+Generators of GAMS models used in the benchmarks.
+"""
+
+import random
+
+
+def transport(n_plants, n_markets, seed=0, table=False):
+    """
+    Generate a scaled-up version of `examples/trnsport.gms`.
+
+    Args:
+        n_plants (int): The number of canning plants (set `i`).
+        n_markets (int): The number of markets (set `j`).
+        seed (int, optional): The seed for the random data. Defaults to 0.
+        table (bool, optional): Whether to give the distances as a table, as in
+            the original model. Otherwise, they are computed by an assignment,
+            which keeps the parsing time low for large sizes. Defaults to False.
+
+    Returns:
+        str: The GAMS code.
+    """
+
+    rng = random.Random(seed)
+
+    plants = [f'i{k}' for k in range(1, n_plants + 1)]
+    markets = [f'j{k}' for k in range(1, n_markets + 1)]
+
+    # make sure that the problem is feasible
+    demand = {j: rng.randint(100, 400) for j in markets}
+    total = sum(demand.values())
+    supply = {i: total // n_plants + rng.randint(50, 200) for i in plants}
+
+    lines = [
+        "$title Scaled Transportation Problem",
+        "",
+        "Set",
+        f"   i 'canning plants' / i1*i{n_plants} /",
+        f"   j 'markets'        / j1*j{n_markets} /;",
+        "",
+        "Parameter",
+        "   a(i) 'capacity of plant i in cases'",
+        "        / " + "\n          ".join(f"{i} {v}" for i, v in supply.items()) + " /",
+        "",
+        "   b(j) 'demand at market j in cases'",
+        "        / " + "\n          ".join(f"{j} {v}" for j, v in demand.items()) + " /;",
+        "",
+    ]
+
+    if table:
+        lines += [
+            "Table d(i,j) 'distance in thousands of miles'",
+            "      " + " ".join(markets),
+        ]
+        for i in plants:
+            lines.append(f"   {i} " + " ".join(f"{rng.uniform(0.5, 3):.1f}" for _ in markets))
+        lines[-1] += ";"
+    else:
+        lines += [
+            "Parameter d(i,j) 'distance in thousands of miles';",
+            "d(i,j) = 0.5 + 0.013*ord(i) + 0.007*ord(j);",
+        ]
+
+    lines += [
+        "",
+        "Scalar f 'freight in dollars per case per thousand miles' / 90 /;",
+        "",
+        "Parameter c(i,j) 'transport cost in thousands of dollars per case';",
+        "c(i,j) = f*d(i,j)/1000;",
+        "",
+        "Variable",
+        "   x(i,j) 'shipment quantities in cases'",
+        "   z      'total transportation costs in thousands of dollars';",
+        "",
+        "Positive Variable x;",
+        "",
+        "Equation",
+        "   cost      'define objective function'",
+        "   supply(i) 'observe supply limit at plant i'",
+        "   demand(j) 'satisfy demand at market j';",
+        "",
+        "cost..      z =e= sum((i,j), c(i,j)*x(i,j));",
+        "",
+        "supply(i).. sum(j, x(i,j)) =l= a(i);",
+        "",
+        "demand(j).. sum(i, x(i,j)) =g= b(j);",
+        "",
+        "Model transport / all /;",
+        "",
+        "solve transport using lp minimizing z;",
+        "",
+    ]
+
+    return "\n".join(lines)
+
+
+def synthetic(set_size, n_sets=2, n_parameters=4, n_equations=4, density=0.5, expression_length=2,
+              comment_density=0.1, seed=0):
+    """
+    Generate a synthetic linear GAMS model for the scaling benchmarks.
+
+    The sets `s1`, `s2`, ... are paired cyclically (`s1` with `s2`, `s2` with
+    `s3`, ...). Each pair has a positive variable over it, and the parameters
+    are tables over the pairs, with at least one nonzero entry in each row.
+    Equation `e<k>` is indexed over the first set of a pair and sums the
+    terms `p(sa,sb)*x(sa,sb)` over the second one, for the nonzero parameter
+    entries. The objective is the sum of all the variables.
+
+    Args:
+        set_size (int): The number of elements of each set.
+        n_sets (int, optional): The number of sets, at least 2. Defaults to 2.
+        n_parameters (int, optional): The number of parameter tables. Defaults
+            to 4.
+        n_equations (int, optional): The number of indexed equations. Defaults
+            to 4.
+        density (float, optional): The fraction of nonzero entries in the
+            tables. Defaults to 0.5.
+        expression_length (int, optional): The number of terms in the sum of
+            each equation. Defaults to 2.
+        comment_density (float, optional): The probability of a comment line
+            before each statement and each table row. Defaults to 0.1.
+        seed (int, optional): The seed for the random data. Defaults to 0.
+
+    Returns:
+        str: The GAMS code.
+    """
+
+    if n_sets < 2:
+        raise ValueError("At least two sets are needed.")
+
+    rng = random.Random(seed)
+
+    sets = [f's{k}' for k in range(1, n_sets + 1)]
+    elements = {s: [f'{s}_{k}' for k in range(1, set_size + 1)] for s in sets}
+    pairs = [(sets[k], sets[(k + 1) % n_sets]) for k in range(n_sets)]
+
+    # pair -> the parameters over the pair
+    parameters = {q: [] for q in range(n_sets)}
+    for k in range(n_parameters):
+        parameters[k % n_sets].append(f'p{k + 1}')
+
+    lines = ["$title Synthetic Scaling Model", ""]
+
+    def comment():
+        if rng.random() < comment_density:
+            lines.append(f"* comment {len(lines)}")
+
+    for s in sets:
+        comment()
+        lines.append(f"Set {s} 'set {s}' / {s}_1*{s}_{set_size} /;")
+    lines.append("")
+
+    for q, names in parameters.items():
+        sa, sb = pairs[q]
+        for name in names:
+            comment()
+            lines.append(f"Table {name}({sa},{sb}) 'parameter {name}'")
+            lines.append(" " * 12 + "".join(f"{e:>12}" for e in elements[sb]))
+            for a in elements[sa]:
+                comment()
+                values = [rng.randint(1, 9) if rng.random() < density else 0 for _ in elements[sb]]
+                # no empty equations
+                values[rng.randrange(set_size)] = rng.randint(1, 9)
+                lines.append(f"{a:<12}" + "".join(f"{v:>12}" for v in values))
+            lines[-1] += ";"
+            lines.append("")
+
+    comment()
+    lines.append("Positive Variable " + ", ".join(f"x{q + 1}({sa},{sb})" for q, (sa, sb) in enumerate(pairs)) + ";")
+    lines.append("Variable z 'objective';")
+    lines.append("")
+
+    comment()
+    lines.append("Equation obj, " + ", ".join(f"e{k + 1}({pairs[k % n_sets][0]})" for k in range(n_equations)) + ";")
+    lines.append("")
+
+    for k in range(n_equations):
+        q = k % n_sets
+        sa, sb = pairs[q]
+        names = parameters[q]
+        terms = []
+        for t in range(expression_length):
+            coefficient = names[t % len(names)] + f"({sa},{sb})" if names else str(t + 1)
+            terms.append(f"{coefficient}*x{q + 1}({sa},{sb})")
+        condition = f"${names[0]}({sa},{sb})" if names else ""
+        comment()
+        lines.append(f"e{k + 1}({sa}).. sum({sb}{condition}, {' + '.join(terms)}) =g= {rng.randint(1, 100)};")
+
+    lines.append("")
+    comment()
+    lines.append("obj.. z =e= " + " + ".join(f"sum(({sa},{sb}), x{q + 1}({sa},{sb}))"
+                                             for q, (sa, sb) in enumerate(pairs)) + ";")
+    lines += [
+        "",
+        "Model synthetic / all /;",
+        "",
+        "solve synthetic using lp minimizing z;",
+        "",
+    ]
+
+    return "\n".join(lines)
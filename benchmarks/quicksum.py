@@ -0,0 +1,74 @@
+"""
+Compare the model construction time of the generated code with `quicksum`
+(default) and with the builtin `sum` on scaled-up `examples/trnsport.gms`.
+
+Usage (at the root directory):
+    python -m benchmarks.quicksum --sizes 20 50 100
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from unittest import mock
+
+from gams2pyomo import GAMSTranslator
+from .models import transport
+
+
+class _DummySolver:
+    """
+    A solver that does nothing, such that only the model construction is timed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def solve(self, *args, **kwargs):
+        return None
+
+
+def construct(code):
+    """
+    Execute the generated code with the solve calls stubbed out.
+
+    Returns:
+        float: The execution time in seconds.
+    """
+
+    compiled = compile(code, '<generated>', 'exec')
+    namespace = {}
+    with mock.patch('pyomo.environ.SolverFactory', _DummySolver), \
+            contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        exec(compiled, namespace)
+        end = time.perf_counter()
+    return end - start
+
+
+def run(sizes, repeat=3):
+
+    print(f"{'size':>8} {'sum (s)':>10} {'quicksum (s)':>13} {'speedup':>8}")
+
+    for n in sizes:
+        text = transport(n, n)
+
+        timings = {}
+        for quicksum in (False, True):
+            code = GAMSTranslator(io.StringIO(text)).translate(quicksum=quicksum)
+            timings[quicksum] = min(construct(code) for _ in range(repeat))
+
+        print(f"{n:>5}x{n:<3}{timings[False]:>10.3f} {timings[True]:>13.3f} "
+              f"{timings[False] / timings[True]:>8.2f}")
+
+
+def main():
+    args = argparse.ArgumentParser(prog='quicksum benchmark')
+    args.add_argument('--sizes', type=int, nargs='+', default=[20, 50, 100])
+    args.add_argument('--repeat', type=int, default=3)
+    args = args.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
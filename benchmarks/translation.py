@@ -0,0 +1,180 @@
+"""
+Measure the translation throughput, the time of each translation phase, and
+the peak memory on synthetic models of increasing size (see
+`models.synthetic`), and compare them with a JSON baseline.
+
+Usage (at the root directory):
+    python -m benchmarks.translation --sizes 5 10 20 --save baseline.json
+    python -m benchmarks.translation --sizes 5 10 20 --baseline baseline.json
+
+With `--baseline`, the measures that are slower (or use more memory) than the
+baseline by more than the threshold are reported, and the exit status is 1.
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import tracemalloc
+
+from gams2pyomo import GAMSTranslator
+from .models import synthetic
+
+# the phases shorter than this (seconds) are not compared with the baseline,
+# as their timing is mostly noise
+_MIN_SECONDS = 0.01
+
+
+def measure(text, repeat=3):
+    """
+    Translate the GAMS code `repeat` times, and once more with `tracemalloc`
+    for the peak memory.
+
+    Returns:
+        dict: The number of lines, the total time (seconds) and the time of
+            each phase (the minimum over the repetitions), the throughput
+            (lines per second), and the peak memory (bytes).
+    """
+
+    runs = []
+    for _ in range(repeat):
+        _, statistics = GAMSTranslator(io.StringIO(text)).translate(return_statistics=True)
+        runs.append(statistics['phases'])
+
+    tracemalloc.start()
+    try:
+        _, statistics = GAMSTranslator(io.StringIO(text)).translate(return_statistics=True)
+    finally:
+        tracemalloc.stop()
+
+    lines = text.count('\n') + 1
+    seconds = min(sum(p['seconds'] for p in r.values()) for r in runs)
+
+    return {
+        'lines': lines,
+        'seconds': seconds,
+        'lines_per_second': lines / seconds,
+        'phases': {name: min(r[name]['seconds'] for r in runs) for name in runs[0]},
+        'peak_memory': max(p.get('peak_memory', 0) for p in statistics['phases'].values()),
+    }
+
+
+def run(sizes, repeat=3, **generator):
+    """
+    Run the benchmark for each set size.
+
+    Args:
+        sizes (list): The set sizes.
+        repeat (int, optional): The number of repetitions. Defaults to 3.
+        **generator: The other arguments of `models.synthetic`.
+
+    Returns:
+        dict: The results by set size, with the generator arguments and the
+            Python version.
+    """
+
+    results = {}
+
+    print(f"{'size':>6} {'lines':>7} {'total (s)':>10} {'lines/s':>9} {'parsing':>9} "
+          f"{'transform':>10} {'assembly':>9} {'peak (MB)':>10}")
+
+    for n in sizes:
+        r = measure(synthetic(n, **generator), repeat)
+        results[str(n)] = r
+
+        print(f"{n:>6} {r['lines']:>7} {r['seconds']:>10.3f} {r['lines_per_second']:>9.0f} "
+              f"{r['phases']['parsing']:>9.3f} {r['phases']['transformation']:>10.3f} "
+              f"{r['phases']['assembly']:>9.3f} {r['peak_memory'] / 2 ** 20:>10.2f}")
+
+    return {
+        'python': platform.python_version(),
+        'generator': generator,
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=0.2):
+    """
+    Compare the results with a baseline.
+
+    Args:
+        current (dict): The results, see `run`.
+        baseline (dict): The baseline results.
+        threshold (float, optional): The relative increase that is reported
+            as a regression. Defaults to 0.2.
+
+    Returns:
+        list: The regressions as tuples of the set size, the measure, and the
+            baseline and current values.
+    """
+
+    regressions = []
+
+    for size, r in current['results'].items():
+        if size not in baseline['results']:
+            continue
+        b = baseline['results'][size]
+
+        measures = [('seconds', b['seconds'], r['seconds']),
+                    ('peak_memory', b['peak_memory'], r['peak_memory'])]
+        measures += [(f'phases.{name}', b['phases'][name], seconds)
+                     for name, seconds in r['phases'].items()
+                     if name in b['phases'] and b['phases'][name] >= _MIN_SECONDS]
+
+        for measure, old, new in measures:
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append((size, measure, old, new))
+
+    return regressions
+
+
+def main():
+    args = argparse.ArgumentParser(prog='translation benchmark')
+    args.add_argument('--sizes', type=int, nargs='+', default=[5, 10, 20])
+    args.add_argument('--repeat', type=int, default=3)
+    args.add_argument('--sets', type=int, default=2)
+    args.add_argument('--parameters', type=int, default=4)
+    args.add_argument('--equations', type=int, default=4)
+    args.add_argument('--density', type=float, default=0.5)
+    args.add_argument('--expression-length', type=int, default=2)
+    args.add_argument('--comment-density', type=float, default=0.1)
+    args.add_argument('--save', metavar='FILE', help="save the results as a JSON baseline")
+    args.add_argument('--baseline', metavar='FILE', help="compare the results with a JSON baseline")
+    args.add_argument('--threshold', type=float, default=0.2,
+                      help="the relative increase reported as a regression (default: 0.2)")
+    args = args.parse_args()
+
+    generator = {
+        'n_sets': args.sets,
+        'n_parameters': args.parameters,
+        'n_equations': args.equations,
+        'density': args.density,
+        'expression_length': args.expression_length,
+        'comment_density': args.comment_density,
+    }
+
+    current = run(args.sizes, args.repeat, **generator)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        if baseline['generator'] != current['generator']:
+            print("Warning: the baseline was generated with different arguments: "
+                  f"{baseline['generator']}", file=sys.stderr)
+
+        regressions = compare(current, baseline, args.threshold)
+        for size, measure, old, new in regressions:
+            print(f"Regression (size {size}): {measure} {old:.4g} -> {new:.4g} (+{100 * (new / old - 1):.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {100 * args.threshold:.0f}%.")
+
+
+if __name__ == "__main__":
+    main()
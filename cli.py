@@ -1,6 +1,8 @@
-from gams2pyomo import GAMSTranslator
+from gams2pyomo import GAMSTranslator, format_statistics, include_cache
 from sys import argv
 import argparse
+import cProfile
+import tracemalloc
 
 def main():
     args = argparse.ArgumentParser(
@@ -8,14 +10,115 @@ def main():
     )
     args.add_argument('inputfile')
     args.add_argument('-o', '--outputfile', required=False)
-    args = args.parse_args()
+    args.add_argument('--no-quicksum', action='store_true',
+                      help="use the builtin `sum` instead of `quicksum` in equations")
+    args.add_argument('--linear-expressions', action='store_true',
+                      help="give the linear sums in linear equations to Pyomo's LinearExpression directly")
+    args.add_argument('--bulk-assignments', action='store_true',
+                      help="compute indexed assignments in bulk instead of nested loops")
+    args.add_argument('--persistent-solver', action='store_true',
+                      help="create the solvers used in loops once and reuse them")
+    args.add_argument('--all-mutable', action='store_true',
+                      help="declare all the parameters as mutable")
+    args.add_argument('--no-evaluate-data', action='store_true',
+                      help="keep the computations of constant data in the generated code")
+    args.add_argument('--format', choices=['py', 'lp', 'mps', 'npz'], default='py',
+                      help="write Pyomo code, or the linear model of the first solve as an LP or MPS file, "
+                           "or in the matrix form as a NumPy .npz file")
+    args.add_argument('--eliminate-dead-code', action='store_true',
+                      help="remove the declarations, equations, and assignments that the solves and displays do not use")
+    args.add_argument('--lazy-equations', action='store_true',
+                      help="construct the equations before the first solve of a model with them")
+    args.add_argument('--instrument', action='store_true',
+                      help="time the statements of the generated code and report them at exit")
+    args.add_argument('--profile', action='store_true',
+                      help="print the time and peak memory of the translation phases and other statistics")
+    args.add_argument('--profile-dump', metavar='FILE',
+                      help="profile the translation with cProfile and save the pstats into the file")
+    args.add_argument('--profile-parser', action='store_true',
+                      help="print the parsing time by grammar rule, terminal, and source line, and the ambiguities")
+    args.add_argument('-I', '--include-dir', action='append', default=[], metavar='DIR',
+                      help="a directory of the files included with $include")
+    args.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                      help="a compile-time variable in the names of the included files")
+    args.add_argument('--jobs', type=int, metavar='N',
+                      help="the maximum number of processes parsing the included files (default: the number of CPUs)")
+    args.add_argument('--include-cache', metavar='DIR',
+                      help="store the parse trees of the included files in the directory for later translations "
+                           "(the directory should only be writable by its users)")
+    args.add_argument('--kernel', action='store_true',
+                      help="generate pyomo.kernel code with one matrix constraint per equation (linear models); "
+                           "the coefficients are NumPy expressions of the parameter arrays")
+    args.add_argument('--kernel-data', metavar='NPZFILE',
+                      help="save the large arrays of the kernel code into this NumPy .npz file, which the code "
+                           "loads relative to its own path (default: all the arrays are written in the code)")
+    parser = args
+    args = parser.parse_args()
+    if args.profile and args.profile_parser:
+        parser.error("--profile cannot be combined with --profile-parser, which prints its own profile")
     fp = args.inputfile
     if args.outputfile is None:
-        args.outputfile = args.inputfile.replace(".gms", ".py")
+        args.outputfile = args.inputfile.replace(".gms", "." + args.format)
 
-    gp = GAMSTranslator(fp)
-    res = gp.translate()
+    if args.profile:
+        # the peak memory of the phases
+        tracemalloc.start()
+    profiler = None
+    if args.profile_dump:
+        profiler = cProfile.Profile()
+        profiler.enable()
 
+    if args.include_cache:
+        include_cache.directory = args.include_cache
+
+    gp = GAMSTranslator(fp, include_dirs=args.include_dir, workers=args.jobs,
+                        variables=dict(v.split('=', 1) for v in args.set))
+
+    try:
+        run(gp, args)
+    finally:
+        # also when the translation fails
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile_dump)
+
+    if args.profile:
+        print(format_statistics(gp.statistics))
+
+
+def run(gp, args):
+    """
+    Translate the file with the options of the command line and write the
+    output.
+    """
+
+    if args.profile_parser:
+        print(gp.profile_parse().report())
+        return
+
+    if args.format == 'npz':
+        gp.build_linear().to_matrices().save(args.outputfile)
+        print("Success")
+        return
+    elif args.format != 'py':
+        gp.build_linear().write(args.outputfile, format=args.format)
+        print("Success")
+        return
+
+    if args.kernel:
+        res = gp.translate_kernel(data_file=args.kernel_data, code_file=args.outputfile)
+    else:
+        res = gp.translate(quicksum=not args.no_quicksum,
+                           linear_expressions=args.linear_expressions,
+                           bulk_assignments=args.bulk_assignments,
+                           persistent_solver=args.persistent_solver,
+                           mutability_analysis=not args.all_mutable,
+                           evaluate_data=not args.no_evaluate_data,
+                           dead_code_elimination=args.eliminate_dead_code,
+                           lazy_equations=args.lazy_equations,
+                           instrument=args.instrument)
+        for r in gp.statistics.get('removed', []):
+            print(f"Removed the unused {r['statement']} '{r['name']}' (line {r['lines'][0]})")
 
     with open(args.outputfile, 'w') as f:
         f.write(res)
@@ -23,6 +126,5 @@ def main():
     print("Success")
 
 
-
 if __name__ == "__main__":
     main()
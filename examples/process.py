@@ -105,19 +105,22 @@ m.ratio = 8
 m.dilute = 3.6
 m.f4 = 145
 m.profit = 872
-m_process = m.clone()
-m_process.del_component('rngyield')
-m_process.del_component('rngmotor')
-m_process.del_component('rngddil')
-m_process.del_component('rngdf4')
-m_process._obj_ = Objective(rule=m_process.profit, sense=-1)
+m.rngyield.deactivate()
+m.rngmotor.deactivate()
+m.rngddil.deactivate()
+m.rngdf4.deactivate()
+m._obj_ = Objective(rule=m.profit, sense=-1)
 opt = SolverFactory('ipopt')
-opt.solve(m_process, tee=True)
-m_rproc = m.clone()
-m_rproc.del_component('yield_')
-m_rproc.del_component('motor')
-m_rproc.del_component('ddil')
-m_rproc.del_component('df4')
-m_rproc._obj_ = Objective(rule=m_rproc.profit, sense=-1)
+opt.solve(m, tee=True)
+m.yield_.deactivate()
+m.motor.deactivate()
+m.ddil.deactivate()
+m.df4.deactivate()
+m.rngyield.activate()
+m.rngmotor.activate()
+m.rngddil.activate()
+m.rngdf4.activate()
+m.del_component('_obj_')
+m._obj_ = Objective(rule=m.profit, sense=-1)
 opt = SolverFactory('ipopt')
-opt.solve(m_rproc, tee=True)
+opt.solve(m, tee=True)
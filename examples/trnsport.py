@@ -25,28 +25,24 @@ Keywords: linear programming, transportation problem, scheduling
 
 m.I = Set(initialize=['seattle', 'san_diego'], ordered=True, doc='canning plants')
 m.J = Set(initialize=['new_york', 'chicago', 'topeka'], ordered=True, doc='markets')
-m.a = Param(m.I, mutable=True, initialize={'seattle': 350, 'san_diego': 600}, doc='capacity of plant i in cases')
-m.b = Param(m.J, mutable=True, initialize={'new_york': 325, 'chicago': 300, 'topeka': 275}, doc='demand at market j in cases')
-m.d = Param(m.I, m.J, mutable=True, initialize={('seattle', 'new_york'): 2.5, ('seattle', 'chicago'): 1.7, ('seattle', 'topeka'): 1.8, ('san_diego', 'new_york'): 2.5, ('san_diego', 'chicago'): 1.8, ('san_diego', 'topeka'): 1.4}, doc='distance in thousands of miles')
-m.f = Param(mutable=True, initialize=90, doc='freight in dollars per case per thousand miles')
-m.c = Param(m.I, m.J, mutable=True, doc='transport cost in thousands of dollars per case')
-for i in m.I:
-	for j in m.J:
-		m.c[i, j] = (m.f * m.d[i, j]) / 1000
+m.a = Param(m.I, initialize={'seattle': 350, 'san_diego': 600}, default=0, doc='capacity of plant i in cases')
+m.b = Param(m.J, initialize={'new_york': 325, 'chicago': 300, 'topeka': 275}, default=0, doc='demand at market j in cases')
+m.d = Param(m.I, m.J, initialize={('seattle', 'new_york'): 2.5, ('seattle', 'chicago'): 1.7, ('seattle', 'topeka'): 1.8, ('san_diego', 'new_york'): 2.5, ('san_diego', 'chicago'): 1.8, ('san_diego', 'topeka'): 1.4}, default=0, doc='distance in thousands of miles')
+m.f = Param(initialize=90, doc='freight in dollars per case per thousand miles')
+m.c = Param(m.I, m.J, initialize={('seattle', 'new_york'): 0.225, ('seattle', 'chicago'): 0.153, ('seattle', 'topeka'): 0.162, ('san_diego', 'new_york'): 0.225, ('san_diego', 'chicago'): 0.162, ('san_diego', 'topeka'): 0.12599999999999997}, default=0, doc='transport cost in thousands of dollars per case')
 m.x = Var(m.I, m.J, doc='shipment quantities in cases')
 m.z = Var(doc='total transportation costs in thousands of dollars')
 m.x.domain = NonNegativeReals
 def cost(m):
-	return m.z == sum((m.c[i, j] * m.x[i, j]) for i in m.I for j in m.J)
+	return m.z == quicksum((m.c[i, j] * m.x[i, j]) for i in m.I for j in m.J)
 m.cost = Constraint(rule=cost)
 def supply(m, i):
-	return sum(m.x[i, j] for j in m.J) <= m.a[i]
+	return quicksum(m.x[i, j] for j in m.J) <= m.a[i]
 m.supply = Constraint(m.I, rule=supply)
 def demand(m, j):
-	return sum(m.x[i, j] for i in m.I) >= m.b[j]
+	return quicksum(m.x[i, j] for i in m.I) >= m.b[j]
 m.demand = Constraint(m.J, rule=demand)
-m_transport = m.clone()
-m_transport._obj_ = Objective(rule=m_transport.z, sense=1)
+m._obj_ = Objective(rule=m.z, sense=1)
 opt = SolverFactory('gurobi')
-opt.solve(m_transport, tee=True)
+opt.solve(m, tee=True)
 m.x.pprint()
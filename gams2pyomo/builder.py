@@ -0,0 +1,196 @@
+"""
+This module builds the Pyomo model directly from the transformed components,
+without generating and executing Python code. It requires Pyomo.
+"""
+
+from pyomo.environ import (ConcreteModel, Set, Param, Var, Constraint, Objective,
+                           Any, Binary, NonNegativeReals, Reals, minimize, maximize,
+                           quicksum, prod, exp, log, log10, sqrt, sin, cos, tan, sinh,
+                           cosh, tanh, asin, acos, atan, ceil, floor)
+from .components import evaluate
+from .execution import StatementExecutor
+
+# the functions that also accept Pyomo expressions
+_PYOMO_FUNCTIONS = {
+    'fn_arccos': acos,
+    'fn_arcsin': asin,
+    'fn_arctan': atan,
+    'fn_ceil': ceil,
+    'fn_cos': cos,
+    'fn_cosh': cosh,
+    'fn_exp': exp,
+    'fn_floor': floor,
+    'fn_sin': sin,
+    'fn_sinh': sinh,
+    'fn_tan': tan,
+    'fn_tanh': tanh,
+    'fn_log': log,
+    'fn_log10': log10,
+    'fn_log2': lambda x: log(x) / log(2),
+    'fn_sqrt': sqrt,
+    'sum': quicksum,
+    'prod': prod,
+}
+
+_DOMAINS = {
+    'variable': Reals,
+    'p_variable': NonNegativeReals,
+    'b_variable': Binary,
+}
+
+_SENSES = {
+    'minimizing': minimize,
+    'maximizing': maximize,
+}
+
+
+class ModelBuilder(StatementExecutor):
+    """
+    Build a Pyomo `ConcreteModel` from the components in a container.
+
+    The statements are executed until the first solve statement (see
+    `StatementExecutor`), whose model equations and objective are constructed.
+    The parameter values enter the equations as numbers, and the parameters
+    are added to the model as immutable `Param` components for reference. The
+    model is returned without solving it.
+
+    Args:
+        container (ComponentContainer): The container with the root statements
+            (see `GAMSTransformer` with `assemble=False`).
+    """
+
+    def __init__(self, container):
+
+        super().__init__(container)
+
+        self.model = ConcreteModel()
+
+        container.math_functions.update(_PYOMO_FUNCTIONS)
+
+    def build(self):
+        """
+        Build the model.
+
+        Returns:
+            ConcreteModel: The model, with the objective of the first solve
+                statement.
+        """
+
+        solve = self.run()
+
+        if self.container.model_title:
+            self.model.name = self.container.model_title
+
+        self._build_parameters()
+
+        if solve is not None:
+            for equation in self.model_equations(solve):
+                self._build_equation(equation)
+            self.model.add_component('_obj_', Objective(expr=self.model.component(solve.obj_var),
+                                                        sense=_SENSES[solve.sense]))
+
+        return self.model
+
+    def _declare_set(self, definition):
+
+        name = definition.symbol.name
+        self.model.add_component(name, Set(initialize=self.container.set_elements[name], ordered=True,
+                                           doc=definition.description))
+
+    def _declare_variable(self, definition):
+
+        model = self.model
+        name = definition.symbol.name
+        domain = _DOMAINS[definition.type]
+
+        # the declaration updates the domain
+        if model.component(name) is not None:
+            model.component(name).domain = domain
+            return
+
+        data = definition.data
+        if isinstance(data, list):
+            data = {k: v for (k, v) in data}
+
+        var = Var(*self._index_sets(definition.symbol.index_list), within=domain,
+                  initialize=data or None, doc=definition.description)
+        model.add_component(name, var)
+
+        # the variables are looked up in the same way as the parameters
+        if var.is_indexed():
+            self.container.values[name] = dict(var.items())
+        else:
+            self.container.values[name] = var
+
+    def _set_variable_attribute(self, symbol, key, value):
+
+        var = self.model.component(symbol.name)
+        if not isinstance(var, Var):
+            raise NotImplementedError(f"The attribute of '{symbol!r}' is not supported.")
+
+        v = var[key]
+        if symbol.suffix == 'l':
+            v.set_value(value, skip_validation=True)
+        elif symbol.suffix == 'lo':
+            v.setlb(value)
+        elif symbol.suffix == 'up':
+            v.setub(value)
+        else:  # 'fx'
+            v.fix(value)
+
+    def _index_sets(self, index_list):
+        """
+        Find the set components of the indices of a declaration.
+        """
+
+        res = []
+        for _idx in index_list or []:
+            if _idx == '*':
+                res.append(Any)
+                continue
+            _set = self.container.index_set(_idx)
+            if not _set:
+                raise NotImplementedError(f"The elements of '{_idx}' are not known.")
+            res.append(self.model.component(_set))
+        return res
+
+    def _build_parameters(self):
+        """
+        Add the parameters with their current values to the model.
+        """
+
+        container = self.container
+
+        for name, definition in self.parameters.items():
+            if definition.symbol.index_list:
+                param = Param(*self._index_sets(definition.symbol.index_list),
+                              initialize=container.values[name], default=0, within=Any,
+                              doc=definition.description)
+            else:
+                param = Param(initialize=container.values[name], within=Any,
+                              doc=definition.description)
+            self.model.add_component(name, param)
+
+    def _build_equation(self, equation):
+
+        container = self.container
+        index_list = equation.index_list or []
+
+        def rule(m, *elements):
+
+            scope = dict(zip(index_list, elements))
+
+            if not self.is_generated(equation, scope):
+                return Constraint.Skip
+
+            lhs = evaluate(equation.lhs, container, scope)
+            rhs = evaluate(equation.rhs, container, scope)
+
+            if equation.eq_sign == 'eqn_equality':
+                return lhs == rhs
+            elif equation.eq_sign == 'eqn_less_than':
+                return lhs <= rhs
+            else:
+                return lhs >= rhs
+
+        self.model.add_component(equation.name, Constraint(*self._index_sets(index_list), rule=rule))
@@ -1,10 +1,25 @@
 from .util import find_alias
+from ..util import ElementRange
 import logging, logging.config
+import math
 from abc import abstractclassmethod
+from itertools import product
+from lark import Tree
 
 _PREFIX = 'm.'
 _NL = '\n'
 
+# the highest degree of the equations of the GAMS model types; the others are
+# nonlinear
+_MODEL_TYPE_DEGREES = {
+    'lp': 1,
+    'mip': 1,
+    'rmip': 1,
+    'qcp': 2,
+    'miqcp': 2,
+    'rmiqcp': 2,
+}
+
 logging.config.fileConfig('gams2pyomo/config.ini', disable_existing_loggers=False)
 logger = logging.getLogger('gams_translator.components')
 logger.setLevel(logging.WARNING)
@@ -18,6 +33,103 @@ class BasicElement:
     def assemble(self, container, _indent='', **kwargs):
         pass
 
+    def evaluate(self, container, scope):
+        """
+        Compute the value of the element at translation time.
+
+        Args:
+            container (ComponentContainer): The container with the known values
+                of the sets and parameters.
+            scope (dict): The elements of the controlled indices.
+
+        Raises:
+            NotImplementedError: If the value is not known at translation time.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot be evaluated at translation time.")
+
+    def degree(self, container):
+        """
+        The polynomial degree of the element in the variables: 0 for data, 1
+        for linear, and 2 for quadratic expressions. The other nonlinear
+        expressions, and the elements that are not analyzed, have the degree
+        `math.inf`.
+        """
+        return math.inf
+
+    def _apply_unary(self, value):
+        """
+        Apply the minus and negation operators of the element to its value.
+        """
+        if self.minus:
+            value = - value
+        if self.negate:
+            value = int(not value)
+        return value
+
+    def walk(self):
+        """
+        Iterate through the element and all the elements nested in it
+        (depth-first).
+        """
+        yield self
+        for v in vars(self).values():
+            yield from walk(v)
+
+
+def walk(node):
+    """
+    Iterate through the elements in a (list of) statement(s) or expression(s).
+    """
+    if isinstance(node, BasicElement):
+        yield from node.walk()
+    elif isinstance(node, (list, tuple)):
+        for n in node:
+            yield from walk(n)
+    elif isinstance(node, Tree):
+        # e.g., `conditional`
+        yield from walk(node.children)
+
+
+def degree(node, container):
+    """
+    The polynomial degree of a number, an element, or an expression in the
+    variables (see `BasicElement.degree`).
+    """
+    if isinstance(node, BasicElement):
+        return node.degree(container)
+    if isinstance(node, (list, tuple)):
+        return max((degree(n, container) for n in node), default=0)
+    if isinstance(node, Tree):
+        # e.g., `conditional`
+        return degree(node.children, container)
+    # numbers and elements
+    return 0
+
+
+def classify_degree(d):
+    """
+    The class of an expression of degree `d`: 'linear', 'quadratic', or
+    'nonlinear'.
+    """
+    if d <= 1:
+        return 'linear'
+    if d == 2:
+        return 'quadratic'
+    return 'nonlinear'
+
+
+def evaluate(node, container, scope):
+    """
+    Compute the value of a number or an element at translation time.
+    """
+    if isinstance(node, bool):
+        return int(node)
+    if isinstance(node, (int, float)):
+        return node
+    if isinstance(node, BasicElement):
+        return node.evaluate(container, scope)
+    raise NotImplementedError(f"{node!r} cannot be evaluated at translation time.")
+
 class Symbol(BasicElement):
     """
     The class for symbols.
@@ -58,46 +170,28 @@ class Symbol(BasicElement):
 
         if self.name in container.inner_scope:
             res += self.name
+        elif self.name in container.data_parameters:
+            # the values of a parameter before its declaration (see
+            # `ComponentContainer._collect_mutable_parameters`)
+            res += self._assemble_data(container, _indent, at_begin)
         else:
             res += _PREFIX + self.name
 
-        if self.index_list:
-            res += '['
-            _idx = self.index_list[0]
-            if isinstance(_idx, SpecialIndex):
-                res += f'{_idx.assemble(container, _indent):}'
-            elif _idx.upper() in container.set:
-                res += f'{_idx}'
-            else:
-                __idx = find_alias(_idx, container)
-                # no alias, not defined, treat as specific index
-                if __idx == _idx:
-                    res += f"'{_idx}'"
-                # alias found
-                else:
-                    res += f"{__idx}"
-            for _idx in self.index_list[1:]:
-                res += ', '
-                if isinstance(_idx, SpecialIndex):
-                    res += f'{_idx.assemble(container, _indent)}'
-                elif _idx.upper() in container.set:
-                    res += f'{_idx}'
-                else:
-                    __idx = find_alias(_idx, container)
-                    # no alias, not defined, treat as specific index
-                    if __idx == _idx:
-                        res += f"'{_idx}'"
-                    # alias found
-                    else:
-                        res += f"{__idx}"
-            res += ']'
+        if self.index_list and self.name not in container.data_parameters:
+            res += '[' + ', '.join(self.assemble_index(container, _indent)) + ']'
 
         # add .value suffix
-        if 'value_suffix' in globals():
+        if 'value_suffix' in globals() and self.name not in container.data_parameters:
             global value_suffix
             if value_suffix:
                 res += '.value'
 
+        # GAMS uses zero for a lead/lag out of the set; on the left-hand side,
+        # the assignment is skipped instead (see `Assignment`)
+        guards = self.guards(container)
+        if guards and not at_begin:
+            res = f"({res} if {' and '.join(guards)} else 0)"
+
         if self.minus:
             res = '- ' + res
         if self.negate:
@@ -105,11 +199,118 @@ class Symbol(BasicElement):
 
         return res
 
+    def _assemble_data(self, container, _indent='', at_begin=False):
+        """
+        Assemble the symbol as the dictionary of the values of a parameter
+        that is not declared yet; the missing entries are zero.
+        """
+
+        res = f'{self.name}_data'
+        if not self.index_list:
+            return res
+
+        keys = self.assemble_index(container, _indent)
+        if at_begin:
+            return res + '[' + ', '.join(keys) + ']'
+        if len(keys) == 1:
+            return res + f'.get({keys[0]}, 0)'
+        return res + f".get(({', '.join(keys)}), 0)"
+
+    def evaluate(self, container, scope):
+
+        if self.suffix or self.name not in container.values:
+            raise NotImplementedError(f"The value of '{self!r}' is not known at translation time.")
+
+        values = container.values[self.name]
+
+        if isinstance(values, dict):
+            key = self.evaluate_index(container, scope)
+            # GAMS uses zero for the missing entries
+            res = 0 if key is None else values.get(key, 0)
+        elif self.index_list:
+            raise NotImplementedError(f"The scalar '{self.name}' is indexed.")
+        else:
+            res = values
+
+        return self._apply_unary(res)
+
+    def degree(self, container):
+        # the attributes of variables (e.g., levels) are data
+        return int(not self.suffix and container.is_variable(self.name))
+
+    def evaluate_index(self, container, scope):
+        """
+        Find the elements of the indices of the symbol.
+
+        Returns:
+            The element or a tuple of elements (i.e., the key of the Pyomo
+            component), or None if a lead/lag index is out of the set.
+        """
+
+        res = []
+        for _idx in self.index_list:
+            if isinstance(_idx, SpecialIndex):
+                e = _idx.evaluate(container, scope)
+                if e is None:
+                    return None
+            elif isinstance(_idx, str) and _idx in scope:
+                e = scope[_idx]
+            elif container.index_set(_idx):
+                raise NotImplementedError(f"The index '{_idx}' is not controlled.")
+            else:
+                e = _idx
+            res.append(e)
+
+        if len(res) == 1:
+            return res[0]
+        return tuple(res)
+
+    def guards(self, container):
+        """
+        The conditions for the lead/lag indices of the symbol to be in their
+        sets in the generated code.
+
+        Returns:
+            list: The conditions, as code.
+        """
+
+        res = []
+        for _idx in self.index_list or []:
+            if isinstance(_idx, SpecialIndex):
+                guard = _idx.guard(container)
+                if guard:
+                    res.append(guard)
+        return res
+
+    def assemble_index(self, container, _indent=''):
+        """
+        Assemble each index of the symbol.
+
+        Returns:
+            list: The assembled indices.
+        """
+
+        res = []
+        for _idx in self.index_list:
+            if isinstance(_idx, SpecialIndex):
+                res.append(_idx.assemble(container, _indent))
+            elif _idx.upper() in container.set:
+                res.append(f'{_idx}')
+            else:
+                __idx = find_alias(_idx, container)
+                # no alias, not defined, treat as specific index
+                if __idx == _idx:
+                    res.append(f"'{_idx}'")
+                # alias found
+                else:
+                    res.append(f"{__idx}")
+        return res
+
     def __repr__(self):
         res = self.name
         if self.index_list:
             res += '['
-            res += ', '.join(i for i in self.index_list)
+            res += ', '.join(str(i) for i in self.index_list)
             res += ']'
         if self.suffix:
             res += '.' + self.suffix
@@ -135,6 +336,11 @@ class EquationDefinition(BasicElement):
 
         index_list = self.index_list
 
+        # the sums of linear equations may be built with the linear
+        # expressions of Pyomo (see the `linear_expressions` option)
+        d = self.degree(container)
+        container.linear_equation = d <= 1
+
         # function definition
         # def line
         res = f'def {self.name}(m'
@@ -158,6 +364,7 @@ class EquationDefinition(BasicElement):
 
         # return line
         res += _indent + 'return '
+        container.in_equation = True
         # LHS
         if isinstance(self.lhs, (int, float)):
             res += str(self.lhs)
@@ -165,6 +372,7 @@ class EquationDefinition(BasicElement):
             try:
                 res += self.lhs.assemble(container, _indent, top_level=False)
             except Exception as e:
+                container.in_equation = False
                 msg = "Error while trying to assemble the LHS of the equation."
                 logger.error(msg)
                 raise e
@@ -177,9 +385,12 @@ class EquationDefinition(BasicElement):
             try:
                 res += self.rhs.assemble(container, _indent, top_level=False)
             except Exception as e:
+                container.in_equation = False
                 msg = "Error while trying to assemble the LHS of the equation."
                 logger.error(msg)
                 raise e
+        container.in_equation = False
+        container.linear_equation = False
         res += _NL
 
         # add else -> return skip
@@ -193,11 +404,30 @@ class EquationDefinition(BasicElement):
             res += _indent + 'return Constraint.Skip' + _NL
 
         # declaration line
-        res += self._assemble_declaration()
+        declaration = self._assemble_declaration(container)
+        if container.codegen_options['lazy_equations']:
+            # constructed before the first solve of a model with the equation
+            container.pending_equations[self.name] = (declaration, self)
+        else:
+            res += declaration
+            container.equation_defs.append(self.name)
+
+        container.equation_classes[self.name] = classify_degree(d)
 
         return res
 
-    def _assemble_declaration(self):
+    def degree(self, container):
+        """
+        The degree of the equation, i.e., the highest degree of its sides. A
+        condition on variables makes the equation nonlinear.
+        """
+
+        if degree(self.condition, container) > 0:
+            return math.inf
+
+        return max(degree(self.lhs, container), degree(self.rhs, container))
+
+    def _assemble_declaration(self, container):
 
         res = _PREFIX + self.name + ' = Constraint('
 
@@ -205,8 +435,13 @@ class EquationDefinition(BasicElement):
         if leap_lag_op:
             if self.index_list:
                 for _idx in self.index_list:
-                    if _idx == leap_lag_var:
-                        if leap_lag_op == 'leap':
+                    if _idx == leap_lag_var and (leap_lag_op, leap_lag_val) in \
+                            container.position_maps.get(_idx.upper(), ()):
+                        # the keys of the lead/lag map are the elements for
+                        # which the lead/lag exists
+                        res += f'list({leap_lag_op}_{_idx.upper()}_{leap_lag_val}), '
+                    elif _idx == leap_lag_var:
+                        if leap_lag_op == 'lead':
                             res += f'list({_PREFIX +_idx.upper()})[:-{leap_lag_val}], '
                         else:  # 'lag'
                             res += f'list({_PREFIX +_idx.upper()})[{leap_lag_val}:], '
@@ -249,27 +484,23 @@ class ModelDefinition(BasicElement):
 
     def assemble(self, container, _indent='', **kwargs):
         """
-        No code is directly generated from model statement. The corresponding
-        code is stored in the container and popped out when the model is solved.
+        No code is directly generated from model statement. The model is stored
+        in the container and its equations are activated when it is solved.
 
-        This is to prevent the impact of data manipulation after cloning.
+        All models share the same Pyomo model `m`, as in GAMS all models share
+        the same data and variables.
         """
 
-        # no need to do anything
-        if self.all_equation:
-            container.model_def_scripts[self.name] = f'm_{self.name} = m.clone()' + _NL
-        else:
-            m_name = f'm_{self.name}'
-            # clone the original model
-            res = f'{m_name} = m.clone()' + _NL
-            # iterate through declared equations
-            for eq in container.equation:
-                if eq not in self.equations:
-                    res += f"{m_name}.del_component('{eq}')" + _NL
-            container.model_def_scripts[self.name] = res
+        container.models[self.name] = self
 
         return ''
 
+    def includes(self, equation):
+        """
+        Check if the equation is part of the model.
+        """
+        return self.all_equation or equation in self.equations
+
 
 class SolveStatement(BasicElement):
     """
@@ -283,45 +514,161 @@ class SolveStatement(BasicElement):
 
     def assemble(self, container, _indent='', **kwargs):
 
-        # get the model statement code
-        res = container.model_def_scripts[self.name]
+        # solver created before the loop
+        if self.name in container.persistent_solvers:
+            opt, appsi = container.persistent_solvers[self.name]
+            res = ''
+            # the model is set up before the loop if it is the only one solved
+            if container.persistent_model != self.name:
+                res += self.assemble_model(container, _indent)
+            if appsi:
+                # reuse the solution of the previous iteration
+                res += _indent + f'{opt}.solve({_PREFIX[:-1]}, tee=True, warmstart=True)' + _NL
+            else:
+                res += _indent + f'{opt}.solve({_PREFIX[:-1]}, tee=True)' + _NL
+            return self._instrument(container, res, _indent)
+
+        res = self.assemble_model(container, _indent)
+
+        # assign solver via model type
+        res += _indent + f"opt = SolverFactory('{self.solver_name(container)}')" + _NL
+
+        # solve
+        res += _indent + f'opt.solve({_PREFIX[:-1]}, tee=True)' + _NL
+
+        return self._instrument(container, res, _indent)
+
+    def _instrument(self, container, code, _indent):
+        """
+        Time the solves in loops with the `instrument` option; the root
+        statements are timed by the container.
+        """
+        if container.loop_depth == 0:
+            return code
+        return container.wrap_timer(code, self, _indent)
+
+    def check_model_type(self, container):
+        """
+        Compare the declared model type with the classes of the equations of
+        the model, and record the result in the translation statistics.
+
+        Returns:
+            str: The class of the model: 'linear', 'quadratic', or
+                'nonlinear'.
+        """
+
+        model = container.models[self.name]
+        model_type = self.type.lower()
+
+        classes = {eq: c for eq, c in container.equation_classes.items() if model.includes(eq)}
+        order = ['linear', 'quadratic', 'nonlinear']
+        model_class = max(classes.values(), key=order.index, default='linear')
+
+        container.statistics['models'][self.name] = {'type': model_type, 'class': model_class}
+
+        allowed = classify_degree(_MODEL_TYPE_DEGREES.get(model_type, math.inf))
+        for eq, c in classes.items():
+            if order.index(c) > order.index(allowed):
+                logger.warning(f"The model '{self.name}' is solved as '{self.type}', but the equation '{eq}' is {c}.")
+
+        if order.index(model_class) < order.index(allowed):
+            logger.info(f"The model '{self.name}' is solved as '{self.type}', but its equations are {model_class}.")
+
+        return model_class
+
+    def assemble_model(self, container, _indent=''):
+        """
+        Set up the model to be solved, i.e., its equations and objective.
+        """
+
+        model = container.models[self.name]
+        self.check_model_type(container)
+
+        res = ''
+
+        # activate the equations of the model and deactivate the others; only
+        # the changes are needed if the current states are known, i.e., not in
+        # or after a loop with solve statements
+        known = container.inactive_equations is not None and container.loop_depth == 0
+        for eq in container.equation_defs:
+            active = model.includes(eq)
+            if known and active != (eq in container.inactive_equations):
+                continue
+            if active:
+                res += _indent + f'{_PREFIX + eq}.activate()' + _NL
+            else:
+                res += _indent + f'{_PREFIX + eq}.deactivate()' + _NL
+        if container.loop_depth == 0:
+            container.inactive_equations = {eq for eq in container.equation_defs if not model.includes(eq)}
+        else:
+            container.inactive_equations = None
 
         _sense_dict = {
             'minimizing': 1,
             'maximizing': -1,
         }
 
-        # declare objective
+        # declare objective, replacing the one of the previous solve
         # TODO: what if _obj_ is used
-        res += f'm_{self.name}._obj_ = Objective(rule=m_{self.name}.{self.obj_var}, sense={_sense_dict[self.sense]})' + _NL
+        if container.objective_declared or container.loop_depth > 0:
+            res += _indent + f"{_PREFIX[:-1]}.del_component('_obj_')" + _NL
+        res += _indent + f'{_PREFIX}_obj_ = Objective(rule={_PREFIX + self.obj_var}, sense={_sense_dict[self.sense]})' + _NL
+        container.objective_declared = True
 
-        # assign solver via model type
-        if self.type.lower() in container.options:
-            res += f"opt = SolverFactory('{container.options[self.type.lower()]}')" + _NL
-        else:
-            _default_solvers = {
-                'lp': 'gurobi',
-                'mip': 'gurobi',
-                'nlp': 'ipopt',
-                'cns': 'ipopt',
-                'dnlp': 'ipopt',
-                'minlp': 'baron',
-                'qcp': 'ipopt',
-                'miqcp': 'gurobi',
-                'global': 'baron',
-                # 'mcp', 'mpec', 'Stoch.'
-            }
-            res += f"opt = SolverFactory('{_default_solvers[self.type.lower()]}')" + _NL
+        return res
 
-        # solve
-        res += f'opt.solve(m_{self.name}, tee=True)' + _NL
+    def assemble_persistent_solver(self, container, _indent=''):
+        """
+        Create a solver that is kept between solves. For the solvers with an
+        APPSI interface, only the changes of the model (parameter values,
+        bounds, and fixed variables) are sent to the solver in later solves.
+        """
 
-        # update global variable
-        global last_solved_model
-        last_solved_model = self.name
+        _appsi_solvers = ('gurobi', 'ipopt', 'cplex', 'cbc', 'highs')
+
+        solver = self.solver_name(container)
+        opt = f'opt_{self.name}'
+        appsi = solver in _appsi_solvers
+        container.persistent_solvers[self.name] = (opt, appsi)
+
+        if not appsi:
+            return _indent + f"{opt} = SolverFactory('{solver}')" + _NL
+
+        res = _indent + f"{opt} = SolverFactory('appsi_{solver}')" + _NL
+
+        # the model structure is not changed in the loop
+        if container.persistent_model == self.name:
+            for c in ('check_for_new_or_removed_constraints',
+                      'check_for_new_or_removed_vars',
+                      'check_for_new_or_removed_params',
+                      'check_for_new_objective',
+                      'update_named_expressions'):
+                res += _indent + f'{opt}.update_config.{c} = False' + _NL
 
         return res
 
+    def solver_name(self, container):
+        """
+        The solver assigned via options or the default one of the model type.
+        """
+
+        if self.type.lower() in container.options:
+            return container.options[self.type.lower()]
+
+        _default_solvers = {
+            'lp': 'gurobi',
+            'mip': 'gurobi',
+            'nlp': 'ipopt',
+            'cns': 'ipopt',
+            'dnlp': 'ipopt',
+            'minlp': 'baron',
+            'qcp': 'ipopt',
+            'miqcp': 'gurobi',
+            'global': 'baron',
+            # 'mcp', 'mpec', 'Stoch.'
+        }
+        return _default_solvers[self.type.lower()]
+
 
 class Assignment(BasicElement):
     """
@@ -335,11 +682,225 @@ class Assignment(BasicElement):
 
     def assemble(self, container, _indent='', **kwargs):
 
-        if self.symbol.suffix:
+        if self in container.evaluated_assignments:
+            return self._assemble_values(container, _indent)
+        elif container.codegen_options['bulk_assignments'] and self._is_bulk(container):
+            return self._assemble_bulk(container, _indent)
+        elif self.symbol.suffix:
             return self._assemble_set_attribute(container, self.symbol.suffix, _indent)
         else:
             return self._assemble_basic(container, _indent)
 
+    def evaluate(self, container, scope=None):
+        """
+        Compute the assigned values at translation time. The values of the
+        symbol in the container are updated element by element, in the same
+        order as GAMS does.
+
+        Returns:
+            dict: The assigned values by index; the index of scalars is None.
+        """
+
+        symbol = self.symbol
+
+        if symbol.suffix or symbol.name not in container.values:
+            raise NotImplementedError(f"The values of '{symbol!r}' are not known at translation time.")
+
+        values = container.values[symbol.name]
+
+        if isinstance(values, dict) != bool(symbol.index_list):
+            raise NotImplementedError(f"The indices of '{symbol!r}' do not match its declaration.")
+
+        res = {}
+        for key, _scope in self.evaluate_indices(container, scope):
+            v = evaluate(self.expression, container, _scope)
+            if key is None:
+                container.values[symbol.name] = v
+            else:
+                values[key] = v
+            res[key] = v
+
+        return res
+
+    def evaluate_indices(self, container, scope=None):
+        """
+        Iterate through the elements assigned by the statement, i.e., the
+        elements of the uncontrolled indices that satisfy the condition.
+
+        Yields:
+            tuple: The key of the element (None for scalars) and the scope
+                for evaluating the expression.
+        """
+
+        symbol = self.symbol
+        scope = {} if scope is None else scope
+
+        indices = [i.index if isinstance(i, SpecialIndex) else i for i in (symbol.index_list or [])]
+        indices = [i for i in dict.fromkeys(indices)
+                   if isinstance(i, str) and i not in scope and container.index_set(i)]
+
+        for elements in product(*[container.set_elements[container.index_set(i)] for i in indices]):
+            _scope = dict(scope, **dict(zip(indices, elements)))
+            if self.condition and not evaluate(self.condition.children[0], container, _scope):
+                continue
+            if not symbol.index_list:
+                yield None, _scope
+                continue
+            key = symbol.evaluate_index(container, _scope)
+            # out of the set via lead/lag, skipped as in GAMS
+            if key is not None:
+                yield key, _scope
+
+    def _assemble_values(self, container, _indent=''):
+        """
+        Assign the values computed at translation time.
+        """
+
+        symbol_name = self.symbol.name
+        values = container.evaluated_assignments[self]
+
+        # the final values are given in the declaration
+        if symbol_name in container.folded_values or not values:
+            return ''
+
+        if symbol_name in container.data_parameters:
+            if None in values:
+                return _indent + f"{symbol_name}_data = {values[None]!r}" + _NL
+            return _indent + f"{symbol_name}_data.update({values!r})" + _NL
+
+        if None in values:
+            return _indent + _PREFIX + f"{symbol_name} = {values[None]!r}" + _NL
+
+        return _indent + _PREFIX + f"{symbol_name}.store_values({values!r}, check=False)" + _NL
+
+    def _loop_indices(self, container):
+        """
+        The indices of the symbol that run over a whole set.
+        """
+        if not self.symbol.index_list:
+            return []
+        # the lead/lag indices run over their sets as well
+        indices = [i.index if isinstance(i, SpecialIndex) else i for i in self.symbol.index_list]
+        return [i for i in indices
+                if isinstance(i, str) and i.upper() in container.set and i not in container.inner_scope]
+
+    def _is_bulk(self, container):
+        """
+        Check if the assignment can be computed for all the indices at once.
+
+        This is not the case if the symbol refers to itself on the right-hand
+        side (e.g., `p(t) = p(t-1) + 1`), because GAMS assigns the values in
+        order and later elements see the updated earlier ones.
+        """
+
+        symbol = self.symbol
+
+        if not self._loop_indices(container):
+            return False
+
+        if symbol.suffix:
+            if symbol.suffix not in ('l', 'lo', 'up', 'fx') or symbol.name not in container.variable:
+                return False
+        elif symbol.name not in container.parameter:
+            return False
+
+        for e in walk([self.condition, self.expression]):
+            if isinstance(e, Symbol) and e.name == symbol.name:
+                return False
+
+        return True
+
+    def _assemble_bulk(self, container, _indent=''):
+        """
+        Compute the values for all the indices in a dictionary comprehension
+        and load them with a single call, instead of assigning the elements one
+        by one in nested loops.
+        """
+
+        _method_dict = {
+            'up': 'setub',
+            'lo': 'setlb',
+            'fx': 'fix',
+        }
+
+        symbol = self.symbol
+        target = _PREFIX + symbol.name
+        loop_indices = self._loop_indices(container)
+
+        # evaluate the expressions, such that only numbers are stored
+        expression = self._assemble_expression(container, _indent)
+        if not isinstance(self.expression, (int, float)):
+            expression = f'value({expression})'
+
+        # the whole variable gets the same value, no need to build the values
+        if symbol.suffix in ('lo', 'up', 'fx') and not self.condition \
+                and self._covers_domain(container) \
+                and not self._uses_indices(self.expression, loop_indices):
+            return _indent + f'{target}.{_method_dict[symbol.suffix]}({expression})' + _NL
+
+        # dictionary comprehension
+        keys = symbol.assemble_index(container, _indent)
+        if len(keys) == 1:
+            key = keys[0]
+        else:
+            key = '(' + ', '.join(keys) + ')'
+        values = '{' + f'{key}: {expression}'
+        for _i in loop_indices:
+            values += f' for {_i} in {_PREFIX + _i.upper()}'
+        guards = symbol.guards(container)
+        if guards:
+            values += f" if {' and '.join(guards)}"
+        if self.condition:
+            c = self.condition.children[0]
+            try:
+                values += f' if value({c.assemble(container, _indent, top_level=True)})'
+            except Exception as e:
+                msg = "Error while trying to assemble the condition of the assignment statement."
+                logger.error(msg)
+                raise e
+        values += '}'
+
+        if symbol.name in container.data_parameters:
+            return _indent + f'{symbol.name}_data.update({values})' + _NL
+        elif not symbol.suffix:
+            # the keys are generated from the sets, thus no need to check them
+            if len(loop_indices) == len(keys):
+                return _indent + f'{target}.store_values({values}, check=False)' + _NL
+            return _indent + f'{target}.store_values({values})' + _NL
+        elif symbol.suffix == 'l':
+            return _indent + f'{target}.set_values({values})' + _NL
+        else:
+            # Pyomo has no method to set element-wise bounds at once
+            res = _indent + f'for _k, _v in {values}.items():' + _NL
+            res += _indent + '\t' + f'{target}[_k].{_method_dict[symbol.suffix]}(_v)' + _NL
+            return res
+
+    def _covers_domain(self, container):
+        """
+        Check if the symbol is indexed by exactly the sets it is declared over.
+        """
+        domain = container.domains.get(self.symbol.name)
+        if not domain:
+            return False
+        return [str(i).upper() for i in domain] == \
+            [str(i).upper() for i in self.symbol.index_list] and \
+            len(self._loop_indices(container)) == len(domain)
+
+    @staticmethod
+    def _uses_indices(expression, indices):
+        """
+        Check if the expression depends on any of the given indices.
+        """
+        for e in walk(expression):
+            if isinstance(e, Symbol):
+                if e.name in indices:
+                    return True
+                if e.index_list and any(i in indices for i in e.index_list):
+                    return True
+            elif isinstance(e, SpecialIndex) and e.index in indices:
+                return True
+        return False
+
     def _assemble_basic(self, container, _indent=''):
 
         res, _indent = self._assemble_loop_condition(container, _indent)
@@ -394,8 +955,11 @@ class Assignment(BasicElement):
         symbol = self.symbol
         if symbol.index_list:
             for i in symbol.index_list:
-                # check if the symbol is indexed by a single index or a whole set
-                if isinstance(i, str) and i.upper() in container.set:
+                if isinstance(i, SpecialIndex):
+                    i = i.index
+                # check if the symbol is indexed by a single index or a whole
+                # set; the indices controlled by an outer loop are single ones
+                if isinstance(i, str) and i.upper() in container.set and i not in container.inner_scope:
                     build_loop = True
                     # only store set ot _set_dict
                     _set_dict[i] = i.upper()
@@ -408,6 +972,12 @@ class Assignment(BasicElement):
                 res += _indent + f'for {_i} in {_PREFIX + _s}:' + _NL
                 _indent += '\t'
 
+        # the elements whose lead/lag is out of the set are skipped
+        guards = symbol.guards(container)
+        if guards:
+            res += _indent + f"if {' and '.join(guards)}:" + _NL
+            _indent += '\t'
+
         # conditional lines
         if self.condition:
 
@@ -459,12 +1029,19 @@ class Definition(BasicElement):
 
     def assemble(self, container, _indent='', **kwargs):
 
+        # values computed at translation time
+        initialize = None
+        if self.symbol.name in container.folded_values:
+            initialize = repr(container.folded_values[self.symbol.name])
+
         if self.type == 'set':
-            return self._assemble_set()
+            return self._assemble_set(container)
+        elif self.symbol.name in container.deferred_parameters:
+            return self._assemble_data(container)
         elif self.type == 'scalar':
-            return self._assemble_scalar()
+            return self._assemble_scalar(container, initialize)
         elif self.type == 'parameter':
-            return self._assemble_parameter()
+            return self._assemble_parameter(container, initialize)
         elif self.type in ('variable', 'b_variable', 'p_variable'):
             _domain_dict = {
                 'b_variable': 'b',
@@ -478,7 +1055,7 @@ class Definition(BasicElement):
         else:
             raise NotImplementedError
 
-    def _assemble_set(self):
+    def _assemble_set(self, container):
 
         symbol_name = self.symbol.name
         doc = self.description
@@ -491,26 +1068,142 @@ class Definition(BasicElement):
             res += ')'
         res += _NL
 
+        if symbol_name in container.position_maps:
+            res += self._assemble_position_maps(container.position_maps[symbol_name])
+
+        return res
+
+    def _assemble_position_maps(self, usages):
+        """
+        Build the position dictionaries of the set once, such that `ord` and
+        lead/lag operations are dictionary lookups instead of linear scans.
+
+        Args:
+            usages (set): The `ord` and lead/lag operations on the set, given as
+                tuples (type, value); `ord` has no value.
+        """
+
+        symbol_name = self.symbol.name
+
+        res = ''
+
+        if ('ord', None) in usages:
+            res += f"ord_{symbol_name} = {{e: k for k, e in enumerate({_PREFIX + symbol_name}, 1)}}" + _NL
+
+        shifts = sorted(u for u in usages if u[0] != 'ord')
+        if shifts:
+            seq = f"seq_{symbol_name}"
+            res += f"{seq} = list({_PREFIX + symbol_name})" + _NL
+
+        for (_type, _value) in shifts:
+            name = f"{_type}_{symbol_name}_{_value}"
+            if _type == 'lead':
+                res += f"{name} = dict(zip({seq}, {seq}[{_value}:]))" + _NL
+            elif _type == 'lag':
+                res += f"{name} = dict(zip({seq}[{_value}:], {seq}))" + _NL
+            else:
+                # the shift may exceed the size of the set
+                sign = '+' if _type == 'circular_lead' else '-'
+                res += f"{name} = {{e: {seq}[(k {sign} {_value}) % len({seq})] for k, e in enumerate({seq})}}" + _NL
+
         return res
 
-    def _assemble_scalar(self):
+    def evaluate(self, container, scope=None):
+        """
+        Record the declared elements of a set or values of a parameter in the
+        container. The values of a parameter are given as a dict by index, or
+        as a number for scalars.
+        """
+
+        symbol_name = self.symbol.name
+        data = self.data
+
+        if self.type == 'set':
+            # the ranges compute the elements on demand
+            if isinstance(data, ElementRange):
+                container.set_elements[symbol_name] = data
+                return
+            if not isinstance(data, list) or not all(isinstance(e, (str, int)) for e in data):
+                raise NotImplementedError(f"The elements of set '{symbol_name}' are not known at translation time.")
+            container.set_elements[symbol_name] = list(data)
+        elif self.type == 'scalar' or (self.type == 'parameter' and not self.symbol.index_list):
+            if isinstance(data, list):
+                data = data[0] if data else None
+            if data is None:
+                data = 0
+            if not isinstance(data, (int, float)):
+                raise NotImplementedError(f"The value of '{symbol_name}' is not a number.")
+            container.values[symbol_name] = data
+        elif self.type == 'parameter':
+            if isinstance(data, list):
+                data = {k: v for (k, v) in data}
+            container.values[symbol_name] = dict(data) if data else {}
+        else:
+            raise NotImplementedError(f"The values of '{symbol_name}' are not known at translation time.")
+
+    def _assemble_data(self, container):
+        """
+        Assemble the dictionary of the declared values of a parameter that is
+        declared after its assignments (see `assemble_deferred`).
+        """
+
+        symbol_name = self.symbol.name
+        data = self.data
+
+        container.data_parameters[symbol_name] = self
+
+        if self.type == 'scalar' or not self.symbol.index_list:
+            if isinstance(data, list):
+                data = data[0] if data else None
+            return f"{symbol_name}_data = {0 if data is None else data}" + _NL
+
+        if isinstance(data, list):
+            data = {k: v for (k, v) in data}
+        return f"{symbol_name}_data = {data if data else {}}" + _NL
+
+    def assemble_deferred(self, container):
+        """
+        Declare a parameter whose assignments are all before the first
+        equation definition or solve statement and outside of loops, with the
+        values assigned to its dictionary, such that it is immutable (see
+        `ComponentContainer._collect_mutable_parameters`).
+        """
+
+        initialize = f"{self.symbol.name}_data"
+        del container.data_parameters[self.symbol.name]
+
+        if self.type == 'scalar' or not self.symbol.index_list:
+            return self._assemble_scalar(container, initialize)
+        return self._assemble_parameter(container, initialize)
+
+    def _assemble_scalar(self, container, initialize=None):
         symbol_name = self.symbol.name
         data = self.data
         doc = self.description
 
-        # make all parameters mutable to handle potential update later
-        res = _PREFIX + f"{symbol_name} = Param(mutable=True"
-        if data:
+        _tmp_res = []
+
+        # only the parameters assigned in the code are mutable
+        if self._is_mutable(container):
+            _tmp_res.append("mutable=True")
+
+        if initialize is not None:
+            _tmp_res.append(f"initialize={initialize}")
+        elif data:
             if isinstance(data, list):
-                res += f", initialize={data[0]}"
+                _tmp_res.append(f"initialize={data[0]}")
             else:
-                res += f", initialize={data}"
+                _tmp_res.append(f"initialize={data}")
+        else:
+            # GAMS uses zero for the values that are not given
+            _tmp_res.append("default=0")
         if doc:
-            res += f", doc='{doc}'"
-        res += ")" + _NL
+            _tmp_res.append(f"doc='{doc}'")
+
+        res = _PREFIX + f"{symbol_name} = Param(" + ", ".join(_tmp_res) + ")" + _NL
         return res
 
-    def _assemble_parameter(self):
+    def _assemble_parameter(self, container, initialize=None):
         symbol_name = self.symbol.name
         data = self.data
         doc = self.description
@@ -519,7 +1212,7 @@ class Definition(BasicElement):
         if isinstance(data, list):
             data = {k: v for (k, v) in data}
 
-        res = _PREFIX + f"{symbol_name} = Param("
+        _tmp_res = []
 
         # add index
         if hasattr(self.symbol, 'index_list') and self.symbol.index_list:
@@ -530,26 +1223,44 @@ class Definition(BasicElement):
                         for k in data:
                             if k[i] not in _tmp_list:
                                 _tmp_list.append(k[i])
-                        res += f"{_tmp_list}, "
+                        _tmp_res.append(f"{_tmp_list}")
                 else:
-                    res += _PREFIX + f"{_idx.upper()}, "
+                    _tmp_res.append(_PREFIX + f"{_idx.upper()}")
 
-        # make all parameters mutable to handle potential update later
-        res += "mutable=True"
+        # only the parameters assigned in the code are mutable
+        if self._is_mutable(container):
+            _tmp_res.append("mutable=True")
 
         # data
-        if data:
+        if initialize is not None:
+            _tmp_res.append(f"initialize={initialize}")
+        elif data:
             # when scalar is declared as parameter
             if len(data) == 1 and isinstance(data, list):
-                res += f", initialize={data[0]}"
+                _tmp_res.append(f"initialize={data[0]}")
             else:
-                res += f", initialize={data}"
+                _tmp_res.append(f"initialize={data}")
+        # GAMS uses zero for the entries that are not given
+        _tmp_res.append("default=0")
         # doc
         if doc:
-            res += f", doc='{doc}'"
-        res += ")" + _NL
+            _tmp_res.append(f"doc='{doc}'")
+
+        res = _PREFIX + f"{symbol_name} = Param(" + ", ".join(_tmp_res) + ")" + _NL
         return res
 
+    def _is_mutable(self, container):
+        """
+        Check if the parameter has to be declared as mutable, i.e., if it is
+        assigned anywhere in the code. Immutable parameters enter the
+        equations as plain numbers instead of parameter objects.
+        """
+
+        if not container.codegen_options['mutability_analysis']:
+            return True
+
+        return self.symbol.name in container.assigned_parameters
+
     def _assemble_variable(self, domain, container):
 
         symbol_name = self.symbol.name
@@ -627,6 +1338,55 @@ class SpecialIndex(BasicElement):
         self.type = type
         self.value = value
 
+    def evaluate(self, container, scope):
+        """
+        Find the shifted element, or None if it is out of the set.
+        """
+
+        _set = container.index_set(self.index)
+        if not _set or self.index not in scope:
+            raise NotImplementedError(f"The index '{self.index}' is not controlled.")
+
+        elements = container.set_elements[_set]
+        position = elements.index(scope[self.index])
+        if self.type in ('lead', 'circular_lead'):
+            position += self.value
+        else:
+            position -= self.value
+
+        if self.type.startswith('circular'):
+            return elements[position % len(elements)]
+        if 0 <= position < len(elements):
+            return elements[position]
+        return None
+
+    def position_map(self, container):
+        """
+        The name of the precomputed position map of the operation, or None if
+        the set has none (see `ComponentContainer._collect_position_maps`).
+        """
+
+        if (self.type, self.value) in container.position_maps.get(self.index.upper(), ()):
+            return f'{self.type}_{self.index.upper()}_{self.value}'
+        return None
+
+    def guard(self, container):
+        """
+        The condition for a lead/lag to be in the set in the generated code,
+        or None if there is none (i.e., circular operations).
+        """
+
+        if self.type not in ('lead', 'lag'):
+            return None
+        position_map = self.position_map(container)
+        if position_map:
+            return f'{self.index} in {position_map}'
+        # the last (first) elements have no lead (lag)
+        _set = _PREFIX + self.index.upper()
+        if self.type == 'lead':
+            return f'{_set}.ord({self.index}) <= len({_set}) - {self.value}'
+        return f'{_set}.ord({self.index}) > {self.value}'
+
     def assemble(self, container, _indent='', **kwargs):
 
         # update global variables for lead and lag for special constraint definition
@@ -643,9 +1403,23 @@ class SpecialIndex(BasicElement):
             'circular_lag': 'prevw',
         }
 
+        # use the precomputed map of static sets
+        position_map = self.position_map(container)
+        if position_map:
+            return f'{position_map}[{self.index}]'
+
         res = _PREFIX + self.index.upper() + '.' + _type_dict[self.type] + '('
         res += self.index + ', ' + str(self.value) + ')'
 
         return res
 
+    def __repr__(self):
+        _op_dict = {
+            'lead': '+',
+            'lag': '-',
+            'circular_lead': '++',
+            'circular_lag': '--',
+        }
+        return f'{self.index}{_op_dict[self.type]}{self.value}'
+
 
@@ -1,9 +1,13 @@
-from lark import Token
-from .basic import Definition, ModelDefinition, logger, SolveStatement, Assignment, EquationDefinition, Symbol, _NL
+import time
+from lark import Token, Tree
+from .basic import BasicElement, Definition, ModelDefinition, logger, SolveStatement, Assignment, EquationDefinition, Symbol, SpecialIndex, _NL, walk
 from .expressions import *
+from .expressions import _MATH_FUNCTIONS
 from .flow_control import *
 from .misc import Display, Option, Macro
 from .misc import Alias
+from .instrument import TIMER_CODE, describe, instrument
+from ..hooks import Hooks, statement_lines
 
 _NON_DEF_STATEMENT_TYPES = \
     (EquationDefinition, ModelDefinition, SolveStatement, Assignment,
@@ -13,24 +17,62 @@ _STATEMENT_TYPES = (Definition, ) + _NON_DEF_STATEMENT_TYPES
 _ARITHMETIC_TYPES = (Symbol, int, float, FuncExpression,
                      ArithmeticExpression, SetMinExpression, SetMaxExpression, SumExpression)
 
+# default code generation options; see `ComponentContainer`
+_DEFAULT_OPTIONS = {
+    'quicksum': True,
+    'linear_expressions': False,
+    'bulk_assignments': False,
+    'persistent_solver': False,
+    'mutability_analysis': True,
+    'evaluate_data': True,
+    'dead_code_elimination': False,
+    'lazy_equations': False,
+    'instrument': False,
+}
+
 
 class ComponentContainer(object):
     """The class for storing optimization components from GAMS code.
 
     Args:
         symbols (dict): The symbols declared in the code.
-        equation_defs (list): The equation definitions.
+        equation_defs (list): The names of the defined equations.
         assignments (list): The assignment statements.
         model_defs (list): The optimization definitions.
+        models (dict): The model statements by model name.
         solve (list): The solve statements.
         options (dict): The options.
         if_st (list): The if statements.
         loop_st (list): The loop statements.
         abort_st (list): The abort statements.
         display_statement (list): The display statements.
+        hooks (Hooks): The callbacks of the statement events.
+
+    Code generation options (keyword arguments):
+        quicksum (bool): Emit `quicksum` instead of the builtin `sum` for the
+            indexed sums in equations. Defaults to True.
+        linear_expressions (bool): Give the sums of linear terms in linear
+            equations to Pyomo's `LinearExpression` directly. Defaults to
+            False.
+        bulk_assignments (bool): Compute the indexed assignments of parameters
+            and variable attributes in dictionary comprehensions and load them
+            with a single call instead of nested loops. Defaults to False.
+        persistent_solver (bool): Create the solvers used in loops once before
+            the loops, using the persistent (APPSI) interfaces where available,
+            such that only the changes are sent to the solver in each
+            iteration. Defaults to False.
+        mutability_analysis (bool): Declare only the parameters that are
+            updated after the first equation definition or solve statement, or
+            in loops, as mutable.
+            The others are immutable, such that they enter the equations as
+            numbers. If False, all the parameters are mutable. Defaults to
+            True.
+        evaluate_data (bool): Compute the assignments of parameters that
+            only depend on constant data at translation time, and emit the
+            resulting values instead of the computations. Defaults to True.
     """
 
-    def __init__(self):
+    def __init__(self, **options):
         self.symbols = {
             "set": [],
             "parameter": [],
@@ -45,7 +87,7 @@ class ComponentContainer(object):
         self.equation_defs = []
         self.assignments = []
         self.model_defs = []
-        self.model_def_scripts = {}
+        self.models = {}
         self.solve = []
         self.options = {}
         self.if_st = []
@@ -58,32 +100,117 @@ class ComponentContainer(object):
         self.model_title = ''
 
         self.required_packages = set()
+        # module -> names imported from the module
+        self.required_imports = {}
 
         self.inner_scope = set()
 
+        # whether an equation (i.e., a Pyomo expression) is being assembled
+        self.in_equation = False
+        # whether the equation being assembled is linear
+        self.linear_equation = False
+
+        # equation name -> 'linear', 'quadratic', or 'nonlinear'
+        self.equation_classes = {}
+
+        # equation name -> declaration and definition of the equations defined
+        # but not yet constructed (see the `lazy_equations` option)
+        self.pending_equations = {}
+
+        # the translation statistics, e.g., the classes of the equations and
+        # the solved models
+        self.statistics = {'equations': {}, 'models': {}}
+
+        # the callbacks of the statement events, see `Hooks`
+        self.hooks = Hooks()
+
+        # the number of loops around the statement being assembled
+        self.loop_depth = 0
+
+        # the equations deactivated by the previous solve statement; None if
+        # unknown at translation time
+        self.inactive_equations = set()
+
+        # whether an objective has been declared by a previous solve statement
+        self.objective_declared = False
+
+        # model name -> (name, is APPSI) of the solver created before the loop
+        self.persistent_solvers = {}
+        # the model set up before the loop, if it is the only one solved
+        self.persistent_model = None
+
+        # symbol name -> declared indices
+        self.domains = {}
+
+        # set name -> `ord` and lead/lag operations on the set
+        self.position_maps = {}
+
+        # the parameters assigned after the first equation definition or
+        # solve statement or in loops, except the ones whose final values are
+        # computed at translation time; they are mutable
+        self.assigned_parameters = set()
+        # parameter name -> the index of the root statement with its last
+        # assignment, after which it is declared (immutable)
+        self.deferred_parameters = {}
+        # parameter name -> definition, of the deferred parameters whose
+        # values are in dictionaries while assembling
+        self.data_parameters = {}
+
+        # set name -> elements, known at translation time
+        self.set_elements = {}
+        # alias -> set name
+        self.alias_sets = {}
+        # parameter name -> values (dict by index, or number for scalars),
+        # known at translation time
+        self.values = {}
+        # assignment -> values computed at translation time
+        self.evaluated_assignments = {}
+        # parameter name -> final values, given in the declaration
+        self.folded_values = {}
+        # the functions used by `evaluate`
+        self.math_functions = dict(_MATH_FUNCTIONS)
+
+        for k in options:
+            if k not in _DEFAULT_OPTIONS:
+                raise ValueError(f"Unknown code generation option: '{k}'.")
+        self.codegen_options = dict(_DEFAULT_OPTIONS, **options)
+
     def assemble(self):
 
         logger.info("Assembling...")
 
+        self._eliminate_dead_code()
+        self._evaluate_data()
+        self._collect_position_maps()
+        self._collect_mutable_parameters()
+
         res = ''
+        hooks = self.hooks
 
         # assemble each statement
-        for statement in self.root_statements:
+        for k, statement in enumerate(self.root_statements):
 
             # insert comments before the statements
             res += self.insert_comment(statement)
 
+            # the equations of the models solved in the statement
+            if self.pending_equations:
+                res += self._assemble_pending_equations(statement)
+
             # record alias
             if isinstance(statement, Alias):
                 self.add_alias(statement.aliases)
 
+            if hooks:
+                start = time.perf_counter()
+
             # assemble each statement
             try:
                 # non-definition statements
                 if isinstance(statement, _NON_DEF_STATEMENT_TYPES):
                     _res = statement.assemble(self)
                     if isinstance(_res, str):
-                        res += _res
+                        res += self.wrap_timer(_res, statement)
                     else:
                         raise _res
 
@@ -93,7 +220,7 @@ class ComponentContainer(object):
                     # go through each definition
                     for _c in statement:
                         if isinstance(_c, (Definition, ModelDefinition)):
-                            res += _c.assemble(self)
+                            res += self.wrap_timer(_c.assemble(self), _c)
 
                             # record symbols
                             self.add_symbol(_c)
@@ -112,6 +239,13 @@ class ComponentContainer(object):
                 else:
                     raise NotImplementedError(f"failed to assemble type {type(statement)} at root node.")
             except Exception as e:
+                # reset the state left by the failed statement
+                self.in_equation = False
+                self.linear_equation = False
+                self.loop_depth = 0
+                self.persistent_solvers.clear()
+                self.persistent_model = None
+
                 error_msg = "The statement cannot be translated into Pyomo. It is skipped in the generated code.\n"
                 if hasattr(statement, 'lines'):
                     if statement.lines[0] == statement.lines[1]:
@@ -127,6 +261,20 @@ class ComponentContainer(object):
                         error_msg += f" Argument: {e.args[0]!r}\n"
                 logger.error(error_msg)
 
+                if hooks:
+                    hooks.emit('statement_skipped', statement=statement, lines=statement_lines(statement),
+                               start=start, seconds=time.perf_counter() - start, exception=e)
+            else:
+                if hooks:
+                    hooks.emit('statement_assembled', statement=statement, lines=statement_lines(statement),
+                               start=start, seconds=time.perf_counter() - start)
+
+            # the parameters whose last assignment is the statement
+            for name, last in self.deferred_parameters.items():
+                if last == k and name in self.data_parameters:
+                    definition = self.data_parameters[name]
+                    res += self.wrap_timer(definition.assemble_deferred(self), definition)
+
         # check if there are comments at the end
         if self.comments:
             while self.comments:
@@ -136,28 +284,38 @@ class ComponentContainer(object):
         # add header
         res = self._assemble_header() + res
 
+        if self.pending_equations:
+            self.statistics['unconstructed'] = list(self.pending_equations)
+            logger.info(f"The equations not in solved models are not constructed: "
+                        f"{', '.join(self.pending_equations)}.")
+
+        counts = {c: 0 for c in ('linear', 'quadratic', 'nonlinear')}
+        for c in self.equation_classes.values():
+            counts[c] += 1
+        self.statistics['equations'] = counts
+        logger.info(f"Equations: {counts['linear']} linear, {counts['quadratic']} quadratic, "
+                    f"{counts['nonlinear']} nonlinear.")
+
         logger.info("Done.")
 
         return res
 
     def _assemble_header(self):
 
-        # auto-generated sign
-        header = "# " + "-" * 15 + " THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO " + "-" * 15 + "\n"
-        f_name_len = len(self.f_name)
-        if f_name_len > 0:
-            total_l = 19 + f_name_len
-            left_l = (80 - total_l) // 2
-            right_l = (80 - total_l) - left_l
-            header += "# " + "-" * left_l + f" FILE SOURCE: '{self.f_name}' " + "-" * right_l + "\n\n"
+        header = self.assemble_banner()
 
         # package import
         header += r"from pyomo.environ import *" + _NL
 
         for p in self.required_packages:
             header += rf"import {p}" + _NL
+        for p, names in self.required_imports.items():
+            header += rf"from {p} import {', '.join(sorted(names))}" + _NL
         header += "\n\n"
 
+        if self.codegen_options['instrument']:
+            header += TIMER_CODE + "\n\n"
+
         # model declaration
         header += "m = ConcreteModel("
         if len(self.model_title) > 0:
@@ -166,6 +324,308 @@ class ComponentContainer(object):
 
         return header
 
+    def assemble_banner(self):
+        """
+        The comment lines at the beginning of the generated code.
+        """
+
+        # auto-generated sign
+        header = "# " + "-" * 15 + " THIS SCRIPT WAS AUTO-GENERATED FROM GAMS2PYOMO " + "-" * 15 + "\n"
+        f_name_len = len(self.f_name)
+        if f_name_len > 0:
+            total_l = 19 + f_name_len
+            left_l = (80 - total_l) // 2
+            right_l = (80 - total_l) - left_l
+            header += "# " + "-" * left_l + f" FILE SOURCE: '{self.f_name}' " + "-" * right_l + "\n\n"
+
+        return header
+
+    def _collect_position_maps(self):
+        """
+        Find the sets whose element positions are needed, i.e., the ones used
+        in `ord` and lead/lag operations. Their position maps are generated
+        once right after the set declarations, so only the sets that are not
+        assigned (i.e., static sets) get them; the positions of the others are
+        looked up in the sets.
+        """
+
+        # the assignments computed at translation time are not in the code
+        statements = [s for s in self.root_statements
+                      if not (isinstance(s, Assignment) and s in self.evaluated_assignments)]
+
+        sets = {e.symbol.name.upper() for e in walk(self.root_statements)
+                if isinstance(e, Definition) and e.type == 'set'}
+        sets -= {e.symbol.name.upper() for e in walk(self.root_statements) if isinstance(e, Assignment)}
+
+        for e in walk(statements):
+            if isinstance(e, FuncExpression) and e.operator.data == 'fn_ord' \
+                    and isinstance(e.operands, Symbol):
+                usage = (e.operands.name.upper(), ('ord', None))
+            elif isinstance(e, SpecialIndex):
+                usage = (e.index.upper(), (e.type, e.value))
+            else:
+                continue
+            if usage[0] not in sets:
+                continue
+            self.position_maps.setdefault(usage[0], set()).add(usage[1])
+
+    def _assemble_pending_equations(self, statement):
+        """
+        Construct the equations that are not constructed yet of the models
+        solved in the statement (e.g., in a loop), before the statement.
+        """
+
+        res = ''
+
+        for solve in walk(statement):
+            if not isinstance(solve, SolveStatement) or solve.name not in self.models:
+                continue
+            model = self.models[solve.name]
+            for eq in list(self.pending_equations):
+                if model.includes(eq):
+                    declaration, definition = self.pending_equations.pop(eq)
+                    res += self.wrap_timer(declaration, definition, label=f'equation {eq}')
+                    self.equation_defs.append(eq)
+
+        return res
+
+    def wrap_timer(self, code, statement, _indent='', label=None):
+        """
+        Wrap the code of a statement in a timer with the `instrument` option.
+        """
+        if not self.codegen_options['instrument']:
+            return code
+        return instrument(code, statement, _indent, label)
+
+    def _eliminate_dead_code(self):
+        """
+        Remove the root statements that the solve and display statements do
+        not depend on, i.e., the declarations, equation definitions, models,
+        and assignments of the symbols that are not reachable from them.
+
+        The other statements (e.g., loops, if statements, and options) are
+        kept, and the symbols they refer to are reachable.
+        """
+
+        if not self.codegen_options['dead_code_elimination']:
+            return
+
+        # (names defined, names referred to, statement); the defined names are
+        # None for the statements that are always kept
+        units = []
+        for statement in self.root_statements:
+            for _s in (statement if isinstance(statement, list) else [statement]):
+                units.append(_dependencies(_s))
+
+        # the models of all the equations
+        equations = {n for defined, _, _s in units if isinstance(_s, EquationDefinition) for n in defined}
+        for defined, refs, _s in units:
+            if isinstance(_s, ModelDefinition) and _s.all_equation:
+                refs.update(equations)
+
+        # name -> units defining the name
+        definers = {}
+        for unit in units:
+            for n in unit[0] or ():
+                definers.setdefault(n, []).append(unit)
+
+        live = set()
+        stack = []
+        for defined, refs, _s in units:
+            if defined is None:
+                live.add(id(_s))
+                stack.extend(refs)
+
+        reached = set()
+        while stack:
+            n = stack.pop()
+            if n in reached:
+                continue
+            reached.add(n)
+            for defined, refs, _s in definers.get(n, ()):
+                if id(_s) not in live:
+                    live.add(id(_s))
+                    stack.extend(refs)
+
+        removed = []
+        statements = []
+        for statement in self.root_statements:
+            if isinstance(statement, list):
+                kept = [_s for _s in statement if id(_s) in live]
+                removed += [_s for _s in statement if id(_s) not in live]
+                if kept:
+                    statements.append(kept)
+            elif id(statement) in live:
+                statements.append(statement)
+            else:
+                removed.append(statement)
+        self.root_statements = statements
+
+        self.statistics['removed'] = [describe(_s) for _s in removed]
+        for r in self.statistics['removed']:
+            logger.info(f"Removed the unused {r['statement']} '{r['name']}' (lines {r['lines'][0]}-{r['lines'][1]}).")
+
+    def _evaluate_data(self):
+        """
+        Compute the assignments at root level that only depend on the declared
+        data and on the previously computed values. The other assignments
+        (e.g., the ones referring to variable levels or inside loops) make the
+        values of their symbols unknown from there on.
+
+        If all the assignments of a parameter are computed, and the parameter
+        is not used by other statements (or solves) before its last
+        assignment, its final values are given in its declaration.
+        """
+
+        if not self.codegen_options['evaluate_data']:
+            return
+
+        declarations = {}
+        assignments = {}
+        unknown = set()
+
+        for n, statement in enumerate(self.root_statements):
+
+            # e.g., tables are not given in definition lists
+            if isinstance(statement, Definition):
+                statement = [statement]
+
+            if isinstance(statement, list):
+                for _c in statement:
+                    if not isinstance(_c, Definition):
+                        continue
+                    name = _c.symbol.name
+                    declarations.setdefault(name, []).append(n)
+                    try:
+                        _c.evaluate(self)
+                    except Exception:
+                        self.set_elements.pop(name, None)
+                        self.values.pop(name, None)
+                        unknown.add(name)
+
+            elif isinstance(statement, Alias):
+                self.add_alias_sets(statement.aliases)
+
+            elif isinstance(statement, Assignment):
+                name = statement.symbol.name
+                assignments.setdefault(name, []).append(n)
+                try:
+                    self.evaluated_assignments[statement] = statement.evaluate(self)
+                except Exception as e:
+                    logger.debug(f"Assignment to '{name}' is not computed at translation time: {e!r}")
+                    self.set_elements.pop(name, None)
+                    self.values.pop(name, None)
+                    unknown.add(name)
+
+            else:
+                # the values assigned in loops, if statements, etc.
+                for e in walk(statement):
+                    if isinstance(e, Assignment):
+                        name = e.symbol.name
+                        assignments.setdefault(name, []).append(n)
+                        self.set_elements.pop(name, None)
+                        self.values.pop(name, None)
+                        unknown.add(name)
+
+        for name, positions in assignments.items():
+
+            if name in unknown or len(declarations.get(name, [])) != 1 or name not in self.values:
+                continue
+
+            statement = self.root_statements[declarations[name][0]]
+            if isinstance(statement, Definition):
+                statement = [statement]
+            definition = [d for d in statement if isinstance(d, Definition) and d.symbol.name == name][0]
+            if '*' in (definition.symbol.index_list or []):
+                continue
+
+            # the parameter should not be used before its final values are known
+            used = False
+            for statement in self.root_statements[declarations[name][0] + 1:positions[-1]]:
+                if isinstance(statement, Assignment) and statement in self.evaluated_assignments:
+                    continue
+                for e in walk(statement):
+                    if isinstance(e, SolveStatement) or (isinstance(e, Symbol) and e.name == name):
+                        used = True
+                        break
+                if used:
+                    break
+
+            if not used:
+                self.folded_values[name] = self.values[name]
+
+    def add_alias_sets(self, aliases):
+        """
+        Record the set of the aliases, if its elements are known.
+        """
+
+        for a in aliases:
+            _set = self.index_set(a)
+            if _set:
+                for b in aliases:
+                    self.alias_sets[b] = _set
+                return
+
+    def is_variable(self, name):
+        """
+        Check if the symbol is a declared variable.
+        """
+        return any(name in self.symbols[t] for t in ('variable', 'p_variable', 'b_variable'))
+
+    def index_set(self, idx):
+        """
+        Find the set controlled by an index, considering aliases.
+
+        Returns:
+            str: The name of the set whose elements are known at translation
+                time, or None if the index is a specific element.
+        """
+
+        if not isinstance(idx, str):
+            return None
+        if idx.upper() in self.set_elements:
+            return idx.upper()
+        return self.alias_sets.get(idx)
+
+    def _collect_mutable_parameters(self):
+        """
+        Find the parameters that are assigned after the first equation
+        definition or solve statement, or in loops. They have to be mutable,
+        since the values of an immutable parameter cannot change after its
+        declaration.
+
+        The other assigned parameters are immutable: their values are kept in
+        dictionaries, which the assignments update, and they are declared
+        after their last assignments (see `Definition.assemble_deferred`). The
+        parameters whose final values are computed at translation time are
+        declared with them instead.
+        """
+
+        if not self.codegen_options['mutability_analysis']:
+            return
+
+        parameters = {e.symbol.name for e in walk(self.root_statements)
+                      if isinstance(e, Definition) and e.type in ('scalar', 'parameter')
+                      and '*' not in (e.symbol.index_list or [])}
+
+        # parameter name -> the index of the statement with its last assignment
+        last = {}
+        started = False
+        for k, statement in enumerate(self.root_statements):
+            elements = list(walk(statement))
+            if any(isinstance(e, (EquationDefinition, SolveStatement)) for e in elements):
+                started = True
+            in_loop = isinstance(statement, (LoopStatement, ForStatement, RepeatStatement, WhileStatement))
+            for e in elements:
+                if isinstance(e, Assignment) and not e.symbol.suffix \
+                        and e.symbol.name not in self.folded_values:
+                    if started or in_loop or e.symbol.name not in parameters:
+                        self.assigned_parameters.add(e.symbol.name)
+                    else:
+                        last[e.symbol.name] = k
+
+        self.deferred_parameters = {name: k for name, k in last.items() if name not in self.assigned_parameters}
+
     def add_root_statements(self, statements):
         self.root_statements = statements
 
@@ -222,6 +682,10 @@ class ComponentContainer(object):
 
         if isinstance(component, Definition):
             self.symbols[component.type].append(component.symbol.name)
+            # a redeclaration without indices (e.g., to update the domain of
+            # a variable) does not change the indices
+            if component.symbol.index_list:
+                self.domains[component.symbol.name] = component.symbol.index_list
         elif isinstance(component, ModelDefinition):
             self.model_defs.append(component.name)
         else:
@@ -285,3 +749,49 @@ class ComponentContainer(object):
     #     output.append("\n** end model **")
     #     return " ".join(output)
 
+
+def _references(node, res):
+    """
+    Collect the names (in lower case) that a statement or an expression may
+    refer to. All the strings are collected, e.g., also the elements, such
+    that no reference is missed.
+    """
+    if isinstance(node, str):
+        res.add(node.lower())
+    elif isinstance(node, BasicElement):
+        for v in vars(node).values():
+            _references(v, res)
+    elif isinstance(node, (list, tuple, set)):
+        for n in node:
+            _references(n, res)
+    elif isinstance(node, dict):
+        _references(list(node.items()), res)
+    elif isinstance(node, Tree):
+        _references(node.children, res)
+    return res
+
+
+def _dependencies(statement):
+    """
+    The names that a root statement defines and the ones it refers to. The
+    defined names are None for the statements that are always kept.
+    """
+
+    refs = _references(statement, set())
+
+    if isinstance(statement, Definition):
+        defined = {statement.symbol.name.lower()}
+    elif isinstance(statement, (ModelDefinition, EquationDefinition)):
+        defined = {statement.name.lower()}
+    elif isinstance(statement, Assignment):
+        defined = {statement.symbol.name.lower()}
+    elif isinstance(statement, Alias):
+        defined = {a.lower() for a in statement.aliases}
+    else:
+        defined = None
+
+    if defined:
+        refs -= defined
+
+    return defined, refs, statement
+
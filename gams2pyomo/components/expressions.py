@@ -1,7 +1,95 @@
+import math
+import operator
+from itertools import product
 from lark import Tree
-from .basic import _PREFIX, logger, BasicElement
+from .basic import _PREFIX, logger, BasicElement, Symbol, evaluate, degree
 from .util import find_alias
 
+
+def _round(x, decimals=0):
+    """
+    Round as GAMS does: the halves away from zero (the builtin `round`
+    rounds them to even).
+    """
+
+    decimals = int(decimals)
+    scale = 10 ** decimals
+    res = math.floor(abs(x) * scale + 0.5) / scale
+    res = math.copysign(res, x)
+    return int(res) if decimals <= 0 else res
+
+
+def _power(x, y):
+    """
+    `x ** y` for real results only: a negative base with a fractional
+    exponent is not computed, as Python would return a complex number.
+    """
+
+    # the operands may also be Pyomo expressions (see `ModelBuilder`)
+    if isinstance(x, (int, float)) and isinstance(y, (int, float)) and x < 0 and not float(y).is_integer():
+        raise ValueError(f"The power {x} ** {y} is not real.")
+    return x ** y
+
+
+# the functions used to evaluate the expressions at translation time; the
+# indexed operations are given by their names in GAMS
+_MATH_FUNCTIONS = {
+    'fn_abs': abs,
+    'fn_arccos': math.acos,
+    'fn_arcsin': math.asin,
+    'fn_arctan': math.atan,
+    'fn_ceil': math.ceil,
+    'fn_cos': math.cos,
+    'fn_cosh': math.cosh,
+    'fn_exp': math.exp,
+    'fn_floor': math.floor,
+    'fn_sin': math.sin,
+    'fn_sinh': math.sinh,
+    'fn_tan': math.tan,
+    'fn_tanh': math.tanh,
+    'fn_log': math.log,
+    'fn_log10': math.log10,
+    'fn_log2': math.log2,
+    'fn_sqrt': math.sqrt,
+    'fn_sqr': lambda x: x ** 2,
+    'fn_power': _power,
+    'fn_errorf': lambda x: (1 + math.erf(x / math.sqrt(2))) / 2,
+    'fn_round': _round,
+    'fn_max': max,
+    'fn_min': min,
+    'sum': sum,
+    'prod': math.prod,
+    'smax': max,
+    'smin': min,
+}
+
+def _is_natural(exponent):
+    return isinstance(exponent, (int, float)) and exponent >= 0 and float(exponent).is_integer()
+
+
+def _operation_degree(op, operand_1, operand_2, container):
+    """
+    The degree of an arithmetic operation, or of a relational or logical one
+    (which is nonlinear in the variables).
+    """
+
+    d_1 = degree(operand_1, container)
+    d_2 = degree(operand_2, container)
+
+    if op in ('+', '-'):
+        return max(d_1, d_2)
+    if op == '*':
+        return d_1 + d_2
+    if op == '/':
+        return d_1 if d_2 == 0 else math.inf
+    if op == '**' and d_2 == 0:
+        if d_1 == 0:
+            return 0
+        if _is_natural(operand_2):
+            return d_1 * int(operand_2)
+    return 0 if d_1 == d_2 == 0 else math.inf
+
+
 class FuncExpression(BasicElement):
 
     def __init__(self, operator, operands, meta):
@@ -20,6 +108,7 @@ class FuncExpression(BasicElement):
             'fn_ceil': 'ceil',
             'fn_cos': 'cos',
             'fn_cosh': 'cosh',
+            'fn_exp': 'exp',
             'fn_floor': 'floor',
             'fn_sin': 'sin',
             'fn_sinh': 'sinh',
@@ -71,7 +160,11 @@ class FuncExpression(BasicElement):
                 res += o.assemble(container, _indent)
             res += ') ** 2'
         elif self.operator.data == 'fn_ord':
-            res = f'list({_PREFIX + o.name.upper()}).index({o.name}) + 1'
+            # use the precomputed position map of static sets
+            if ('ord', None) in container.position_maps.get(o.name.upper(), ()):
+                res = f'ord_{o.name.upper()}[{o.name}]'
+            else:
+                res = f'list({_PREFIX + o.name.upper()}).index({o.name}) + 1'
         elif self.operator.data == 'fn_log2':
             res = 'log('
             for _o in o:
@@ -104,9 +197,10 @@ class FuncExpression(BasicElement):
                 res += str(op_1)
             else:
                 res += op_1.assemble(container, _indent)
-        elif self.operator.data == 'fn_max':
-            res = 'max('
-            res += ', '.join([_o.assemble(container, _indent) for _o in o])
+        elif self.operator.data in ('fn_max', 'fn_min'):
+            res = self.operator.data[3:] + '('
+            res += ', '.join([str(_o) if isinstance(_o, (int, float)) else _o.assemble(container, _indent)
+                              for _o in o])
             res += ')'
         else:
             msg = "The operator has not been implemented: "
@@ -121,6 +215,55 @@ class FuncExpression(BasicElement):
 
         return res
 
+    def evaluate(self, container, scope):
+
+        o = self.operands
+        op = self.operator.data
+
+        if op in container.math_functions:
+            if not isinstance(o, list):
+                o = [o]
+            res = container.math_functions[op](*[evaluate(_o, container, scope) for _o in o])
+        elif op == 'fn_card':
+            res = len(container.set_elements[container.index_set(o.name)])
+        elif op == 'fn_ord':
+            _set = container.index_set(o.name)
+            if not _set or o.name not in scope:
+                raise NotImplementedError(f"The index '{o.name}' is not controlled.")
+            res = container.set_elements[_set].index(scope[o.name]) + 1
+        elif op == 'fn_sameas':
+            # the operands are indices or quoted elements
+            elements = []
+            for _o in o:
+                if isinstance(_o, Symbol) and not _o.index_list:
+                    _o = _o.name
+                if not isinstance(_o, str):
+                    raise NotImplementedError("The operands of sameas must be indices or elements.")
+                elements.append(scope.get(_o, _o.strip('\'"')))
+            res = int(elements[0] == elements[1])
+        else:
+            msg = "The operator cannot be evaluated at translation time: "
+            msg += op
+            raise NotImplementedError(msg)
+
+        return self._apply_unary(res)
+
+    def degree(self, container):
+
+        o = self.operands if isinstance(self.operands, list) else [self.operands]
+        op = self.operator.data
+
+        if op in ('fn_card', 'fn_ord', 'fn_sameas'):
+            return 0
+
+        d = degree(o[0], container)
+        if op == 'fn_sqr':
+            return 2 * d
+        if op == 'fn_power' and _is_natural(o[1]):
+            return int(o[1]) * d
+        # the other functions of variables are nonlinear
+        return math.inf if degree(o, container) > 0 else 0
+
 
 class BinaryExpression(BasicElement):
 
@@ -145,6 +288,24 @@ class BinaryExpression(BasicElement):
     top_level_operator = ['rel_eq', 'rel_ge', 'rel_eq', 'rel_ne',
                           'rel_eq_macro', 'abs_gt', 'abs_lt', 'exponentiation']
 
+    evaluate_dict = {
+        'addition': operator.add,
+        'subtraction': operator.sub,
+        'multiplication': operator.mul,
+        'division': operator.truediv,
+        'exponentiation': _power,
+        'rel_le': lambda a, b: int(a <= b),
+        'rel_ge': lambda a, b: int(a >= b),
+        'rel_eq': lambda a, b: int(a == b),
+        'rel_ne': lambda a, b: int(a != b),
+        'rel_eq_macro': lambda a, b: int(a == b),
+        'abs_gt': lambda a, b: int(a > b),
+        'abs_lt': lambda a, b: int(a < b),
+        'bool_and': lambda a, b: int(bool(a) and bool(b)),
+        'bool_or': lambda a, b: int(bool(a) or bool(b)),
+        'bool_xor': lambda a, b: int(bool(a) != bool(b)),
+    }
+
     def __init__(self, operand_1, operator, operand_2):
 
         self.operand_1 = operand_1
@@ -196,11 +357,36 @@ class BinaryExpression(BasicElement):
 
         return res
 
+    def evaluate(self, container, scope):
+
+        if not isinstance(self.operator, Tree) or self.operator.data not in self.evaluate_dict:
+            raise NotImplementedError
+
+        res = self.evaluate_dict[self.operator.data](
+            evaluate(self.operand_1, container, scope),
+            evaluate(self.operand_2, container, scope))
+
+        return self._apply_unary(res)
+
+    def degree(self, container):
+        if not isinstance(self.operator, Tree):
+            return math.inf
+        return _operation_degree(self.operator_dict.get(self.operator.data), self.operand_1, self.operand_2,
+                                 container)
+
 
 class ArithmeticExpression(BasicElement):
 
     top_level_operator = ['+', '-']
 
+    evaluate_dict = {
+        '+': operator.add,
+        '-': operator.sub,
+        '*': operator.mul,
+        '/': operator.truediv,
+        '**': _power,
+    }
+
     def __init__(self, operand_1, operator, operand_2):
 
         self.operand_1 = operand_1
@@ -253,6 +439,20 @@ class ArithmeticExpression(BasicElement):
 
         return res
 
+    def evaluate(self, container, scope):
+
+        if self.operator not in self.evaluate_dict:
+            raise NotImplementedError
+
+        res = self.evaluate_dict[self.operator](
+            evaluate(self.operand_1, container, scope),
+            evaluate(self.operand_2, container, scope))
+
+        return self._apply_unary(res)
+
+    def degree(self, container):
+        return _operation_degree(self.operator, self.operand_1, self.operand_2, container)
+
 
 class ConditionalExpression(BasicElement):
 
@@ -264,6 +464,21 @@ class ConditionalExpression(BasicElement):
     def assemble(self, container, _indent, **kwargs):
         raise NotImplementedError
 
+    def evaluate(self, container, scope):
+
+        # the expression is zero if the condition does not hold
+        if evaluate(self.condition.children[0], container, scope):
+            res = evaluate(self.expression, container, scope)
+        else:
+            res = 0
+
+        return self._apply_unary(res)
+
+    def degree(self, container):
+        if degree(self.condition, container) > 0:
+            return math.inf
+        return degree(self.expression, container)
+
 
 class IndexedExpression(BasicElement):
 
@@ -273,9 +488,41 @@ class IndexedExpression(BasicElement):
         self.exp = exp
         self.condition = condition
 
+    def evaluate_terms(self, container, scope):
+        """
+        Iterate through the values of the expression for all the elements of
+        the indices that satisfy the condition.
+        """
+
+        sets = []
+        for _idx in self.idx:
+            _set = container.index_set(_idx)
+            if not _set:
+                raise NotImplementedError(f"'{_idx}' is not a set.")
+            sets.append(container.set_elements[_set])
+
+        for elements in product(*sets):
+            _scope = dict(scope, **dict(zip(self.idx, elements)))
+            if self.condition is not None and not evaluate(self.condition, container, _scope):
+                continue
+            yield evaluate(self.exp, container, _scope)
+
+    def degree(self, container):
+        """
+        The degree of a sum is the one of its terms; the other indexed
+        operations on variables are nonlinear.
+        """
+        if degree(self.condition, container) > 0:
+            return math.inf
+        d = degree(self.exp, container)
+        return d if d == 0 or isinstance(self, SumExpression) else math.inf
+
 
 class SumExpression(IndexedExpression, BasicElement):
 
+    def evaluate(self, container, scope):
+        return self._apply_unary(container.math_functions['sum'](self.evaluate_terms(container, scope)))
+
     def assemble(self, container, _indent='', **kwargs):
 
         if self.minus:
@@ -283,10 +530,31 @@ class SumExpression(IndexedExpression, BasicElement):
         else:
             res = ''
 
-        res += 'sum('
+        term = None
+        if container.in_equation and container.linear_equation and container.codegen_options['linear_expressions']:
+            term = self._linear_term(container)
 
         try:
-            res += self.exp.assemble(container, _indent)
+            if term is not None:
+                # the terms of linear sums are given to `LinearExpression`
+                # directly, which skips the operator overloading and the
+                # checks of the expression types
+                coef, var = term
+                res += 'LinearExpression(['
+                if coef is None:
+                    res += var.assemble(container, _indent)
+                else:
+                    if isinstance(coef, BasicElement):
+                        coef = coef.assemble(container, _indent, top_level=True)
+                    res += f'MonomialTermExpression(({coef}, {var.assemble(container, _indent)}))'
+                container.required_imports.setdefault('pyomo.core.expr', set()).update(
+                    ['LinearExpression', 'MonomialTermExpression'])
+            # `quicksum` builds the Pyomo expression in place rather than
+            # nesting a new expression object for every term
+            elif container.in_equation and container.codegen_options['quicksum']:
+                res += 'quicksum(' + self.exp.assemble(container, _indent)
+            else:
+                res += 'sum(' + self.exp.assemble(container, _indent)
         except Exception as e:
             msg = "Error while trying to assemble the sum expression."
             logger.error(msg)
@@ -302,13 +570,39 @@ class SumExpression(IndexedExpression, BasicElement):
                 res += str(self.condition)
             else:
                 res += self.condition.assemble(container, _indent)
-        res += ')'
+        res += '])' if term is not None else ')'
 
         return res
 
+    def _linear_term(self, container):
+        """
+        Split the term of the sum into a coefficient and a variable, i.e.,
+        `c * x`, `x * c`, or `x` (coefficient None).
+
+        Returns:
+            tuple: The coefficient and the variable, or None if the term has
+                another form.
+        """
+
+        def is_variable(e):
+            return isinstance(e, Symbol) and not (e.minus or e.negate) and e.degree(container) == 1
+
+        e = self.exp
+        if is_variable(e):
+            return None, e
+        if isinstance(e, ArithmeticExpression) and e.operator == '*' and not (e.minus or e.negate):
+            if is_variable(e.operand_2) and degree(e.operand_1, container) == 0:
+                return e.operand_1, e.operand_2
+            if is_variable(e.operand_1) and degree(e.operand_2, container) == 0:
+                return e.operand_2, e.operand_1
+        return None
+
 
 class ProdExpression(IndexedExpression, BasicElement):
 
+    def evaluate(self, container, scope):
+        return self._apply_unary(container.math_functions['prod'](self.evaluate_terms(container, scope)))
+
     def assemble(self, container, _indent='', **kwargs):
 
         if self.minus:
@@ -343,6 +637,9 @@ class ProdExpression(IndexedExpression, BasicElement):
 
 class SetMaxExpression(IndexedExpression, BasicElement):
 
+    def evaluate(self, container, scope):
+        return self._apply_unary(container.math_functions['smax'](self.evaluate_terms(container, scope)))
+
     def assemble(self, container, _indent='', **kwargs):
 
         # set global variable for adding .value suffix in symbols
@@ -384,6 +681,9 @@ class SetMaxExpression(IndexedExpression, BasicElement):
 
 class SetMinExpression(IndexedExpression, BasicElement):
 
+    def evaluate(self, container, scope):
+        return self._apply_unary(container.math_functions['smin'](self.evaluate_terms(container, scope)))
+
     def assemble(self, container, _indent='', **kwargs):
 
         # set global variable for adding .value suffix in symbols
@@ -1,8 +1,52 @@
 from typing import List
-from .basic import Assignment, _NL, _PREFIX, logger, BasicElement
+from .basic import Assignment, SolveStatement, _NL, _PREFIX, logger, BasicElement, walk
 from .expressions import BinaryExpression
 from .util import gams_arange
 
+def _enter_loop(statements, container, _indent):
+    """
+    Update the container when entering a loop.
+
+    With the `persistent_solver` option, the solvers of the solve statements
+    in an outermost loop are created before the loop and reused in all the
+    iterations.
+
+    Returns:
+        str: The code to be placed before the loop.
+    """
+
+    res = ''
+
+    if container.loop_depth == 0 and container.codegen_options['persistent_solver']:
+        solves = [e for e in walk(statements) if isinstance(e, SolveStatement)]
+
+        # if the same model is always solved with the same objective, the model
+        # structure is not changed in the loop and can be set up once
+        if len({(s.name, s.obj_var, s.sense) for s in solves}) == 1:
+            res += solves[0].assemble_model(container, _indent)
+            container.persistent_model = solves[0].name
+
+        for s in solves:
+            if s.name not in container.persistent_solvers:
+                res += s.assemble_persistent_solver(container, _indent)
+
+    container.loop_depth += 1
+
+    return res
+
+
+def _leave_loop(container):
+    """
+    Update the container when leaving a loop.
+    """
+
+    container.loop_depth -= 1
+
+    if container.loop_depth == 0:
+        container.persistent_solvers.clear()
+        container.persistent_model = None
+
+
 class ElseIfStatement(BasicElement):
     def __init__(self, condition, statement):
 
@@ -99,7 +143,7 @@ class LoopStatement(BasicElement):
 
         container.inner_scope.add(_idx)
 
-        res = ''
+        res = _enter_loop(self.statements, container, _indent)
 
         # loop lines
         res += _indent + f'for {_idx} in {_PREFIX + _set}:' + _NL
@@ -124,7 +168,7 @@ class LoopStatement(BasicElement):
         # statement(s)
         for s in self.statements:
             # TODO: add a list of all assemble-able statement classes
-            if isinstance(s, (Assignment, LoopStatement, BreakStatement, ContinueStatement)):
+            if isinstance(s, (Assignment, LoopStatement, BreakStatement, ContinueStatement, SolveStatement)):
                 res += s.assemble(container, _indent)
             elif isinstance(s, str):
                 res += _indent + s + _NL
@@ -132,6 +176,7 @@ class LoopStatement(BasicElement):
                 raise NotImplementedError
 
         container.inner_scope.clear()
+        _leave_loop(container)
 
         return res
 
@@ -144,8 +189,10 @@ class RepeatStatement(BasicElement):
 
     def assemble(self, container, _indent='', **kwargs):
 
+        res = _enter_loop(self.statements, container, _indent)
+
         # start line
-        res = _indent + 'while True:' + _NL
+        res += _indent + 'while True:' + _NL
         # increase indent
         _indent += '\t'
 
@@ -169,6 +216,8 @@ class RepeatStatement(BasicElement):
         else:
             raise NotImplementedError
 
+        _leave_loop(container)
+
         return res
 
 
@@ -180,8 +229,10 @@ class WhileStatement(BasicElement):
 
     def assemble(self, container, _indent='', **kwargs):
 
+        res = _enter_loop(self.statements, container, _indent)
+
         # start line
-        res = _indent + 'while '
+        res += _indent + 'while '
 
         c = self.conditional
         if isinstance(c, BinaryExpression):
@@ -202,6 +253,8 @@ class WhileStatement(BasicElement):
                 logger.error(msg)
                 raise e
 
+        _leave_loop(container)
+
         return res
 
 
@@ -222,7 +275,7 @@ class ForStatement(BasicElement):
 
         container.inner_scope.add(_idx)
 
-        res = ''
+        res = _enter_loop(self.statements, container, _indent)
 
         # loop lines
         res += _indent + f'for {_idx} in {self.for_list}:' + _NL
@@ -240,6 +293,7 @@ class ForStatement(BasicElement):
                 raise e
 
         container.inner_scope.clear()
+        _leave_loop(container)
 
         return res
 
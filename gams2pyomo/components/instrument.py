@@ -0,0 +1,165 @@
+"""
+The instrumentation of the generated code (see the `instrument` option of
+`ComponentContainer`): the root statements and the solve statements are
+wrapped in timers, which are reported when the script exits. The memory
+changes are only traced if the environment variable `GAMS2PYOMO_TRACE_MEMORY`
+is set when the script runs.
+"""
+
+import re
+from .basic import Definition, ModelDefinition, EquationDefinition, Assignment, SolveStatement, _NL
+from .misc import Alias
+
+# the timer, placed before the model declaration in the generated code
+TIMER_CODE = '''import atexit, json, os, sys, time, tracemalloc
+from contextlib import contextmanager
+
+# the memory is only traced on request, as tracing slows down the allocations
+_trace_memory = bool(os.environ.get('GAMS2PYOMO_TRACE_MEMORY'))
+if _trace_memory:
+\ttracemalloc.start()
+# (statement, lines) -> [calls, seconds, memory change in bytes, indices]
+_timings = {}
+
+
+@contextmanager
+def _timer(statement, lines, component=None, counted=False):
+\tmemory = tracemalloc.get_traced_memory()[0] if _trace_memory else None
+\tstart = time.perf_counter()
+\t# the number of the elements assigned by the statement, if counted
+\tcount = [0]
+\ttry:
+\t\tyield count
+\tfinally:
+\t\tentry = _timings.setdefault((statement, lines), [0, 0.0, 0 if _trace_memory else None, None])
+\t\tentry[0] += 1
+\t\tentry[1] += time.perf_counter() - start
+\t\tif _trace_memory:
+\t\t\tentry[2] += tracemalloc.get_traced_memory()[0] - memory
+\t\tif counted:
+\t\t\tentry[3] = (entry[3] or 0) + count[0]
+\t\tif component is not None:
+\t\t\tc = m.component(component)
+\t\t\tif c is None:
+\t\t\t\tc = m.component(component.upper())
+\t\t\tif c is not None:
+\t\t\t\tentry[3] = len(c) if c.is_indexed() else 1
+
+
+def _report():
+\ttotal = sum(e[1] for e in _timings.values()) or 1
+\trows = sorted(_timings.items(), key=lambda item: item[1][1], reverse=True)
+\tprint(f"{'seconds':>10} {'%':>6} {'calls':>6} {'indices':>8} {'memory (MB)':>12}  lines      statement", file=sys.stderr)
+\tfor (statement, lines), (calls, seconds, memory, indices) in rows:
+\t\tmb = '-' if memory is None else f"{memory / 2 ** 20:.3f}"
+\t\tprint(f"{seconds:>10.4f} {100 * seconds / total:>6.1f} {calls:>6} {'' if indices is None else indices:>8} "
+\t\t      f"{mb:>12}  {lines[0]:>4}-{lines[1]:<5} {statement}", file=sys.stderr)
+\tif os.environ.get('GAMS2PYOMO_REPORT'):
+\t\twith open(os.environ['GAMS2PYOMO_REPORT'], 'w') as f:
+\t\t\tjson.dump([{'statement': s, 'lines': l, 'calls': e[0], 'seconds': e[1], 'memory': e[2], 'indices': e[3]}
+\t\t\t           for (s, l), e in rows], f, indent=1)
+
+
+atexit.register(_report)
+'''
+
+
+def describe(statement):
+    """
+    Describe a root statement, e.g., for the translation statistics.
+
+    Returns:
+        dict: The kind of the statement, the name of the symbol, and the
+            source lines.
+    """
+
+    if isinstance(statement, Definition):
+        kind, name = statement.type, statement.symbol.name
+    elif isinstance(statement, (ModelDefinition, SolveStatement)):
+        kind, name = type(statement).__name__.replace('Statement', '').replace('Definition', '').lower(), \
+            statement.name
+    elif isinstance(statement, EquationDefinition):
+        kind, name = 'equation definition', statement.name
+    elif isinstance(statement, Assignment):
+        kind, name = 'assignment', repr(statement.symbol)
+    elif isinstance(statement, Alias):
+        kind, name = 'alias', ', '.join(statement.aliases)
+    else:
+        kind, name = type(statement).__name__.replace('Statement', '').lower(), ''
+
+    return {'statement': kind, 'name': name, 'lines': getattr(statement, 'lines', (0, 0))}
+
+
+def instrument(code, statement, _indent='', label=None):
+    """
+    Wrap the code of a statement in a timer, labeled with the kind and the
+    name of the statement by default.
+    """
+
+    # e.g., only comments
+    if all(not line.strip() or line.lstrip().startswith('#') for line in code.splitlines()):
+        return code
+
+    d = describe(statement)
+    if label is None:
+        label = f"{d['statement']} {d['name']}".strip()
+
+    # the number of indices of the constructed components
+    component = None
+    if isinstance(statement, Definition):
+        component = statement.symbol.name
+    elif isinstance(statement, EquationDefinition):
+        component = statement.name
+
+    res = _indent + f"with _timer({label!r}, {tuple(d['lines'])!r}"
+    if component is not None:
+        res += f", {str(component)!r}"
+    if isinstance(statement, Assignment):
+        # the number of the assigned elements
+        res += ", counted=True) as _count:" + _NL
+        code = _count_assignments(code)
+    else:
+        res += "):" + _NL
+    for line in code.splitlines(keepends=True):
+        if line.strip():
+            res += _indent + '\t' + line[len(_indent):]
+        else:
+            res += line
+    if not res.endswith(_NL):
+        res += _NL
+
+    return res
+
+
+# e.g., `m.p.store_values({...}, check=False)`
+_BULK_CALL = re.compile(r'(\s*)(\S+)\.(store_values|set_values|update)\((\{.*\})(, check=False)?\)')
+# e.g., `m.x.setlb(0)` for all the elements
+_WHOLE_CALL = re.compile(r'(\s*)(m\.\w+)\.(setlb|setub|fix)\(.*\)')
+
+
+def _count_assignments(code):
+    """
+    Count the elements assigned by the code of an assignment into `_count`:
+    the code assigns one element in its last line, which is in the loops, or
+    all the elements of a dictionary or of the variable at once.
+    """
+
+    lines = code.rstrip(_NL).split(_NL)
+    last = lines[-1]
+
+    m = _BULK_CALL.fullmatch(last)
+    if m:
+        indent, target, method, values, check = m.groups()
+        lines[-1:] = [indent + f"_values = {values}",
+                      indent + f"{target}.{method}(_values{check or ''})",
+                      indent + "_count[0] += len(_values)"]
+        return _NL.join(lines) + _NL
+
+    m = _WHOLE_CALL.fullmatch(last)
+    if m:
+        lines.append(m.group(1) + f"_count[0] += len({m.group(2)})")
+        return _NL.join(lines) + _NL
+
+    indent = last[:len(last) - len(last.lstrip())]
+    lines.append(indent + "_count[0] += 1")
+    return _NL.join(lines) + _NL
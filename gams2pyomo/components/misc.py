@@ -79,9 +79,6 @@ class Display(BasicElement):
     def assemble(self, container, _indent='', **kwargs):
 
         prefix = _PREFIX
-        if 'last_solved_model' in globals():
-            global last_solved_model
-            prefix = 'm_' + last_solved_model + '.'
 
         _tmp_res = []
         for symbol in self.symbols:
@@ -96,6 +93,9 @@ class Display(BasicElement):
                 else:
                     logger.warn(f"Not supported suffix type for display: '.{symbol.suffix}'")
                     continue
+            elif symbol.name in container.data_parameters:
+                # not declared yet, see `Definition.assemble_deferred`
+                _res = f"print({symbol.name!r}, {symbol.name}_data)" + _NL
             else:
                 _res = symbol.assemble(container, _indent) + '.pprint()' + _NL
 
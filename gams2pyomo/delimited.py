@@ -0,0 +1,144 @@
+"""
+This module reads the delimited data included in `$onDelim` blocks, e.g.,
+
+    parameter d(i,j) /
+    $onDelim
+    $include distances.csv
+    $offDelim
+    /;
+
+The files are not parsed with the grammar: `IncludeResolver` replaces the
+include with a `$onDelim` line with the path of the file, which is read here
+when the statement is transformed. The rows are read with the `csv` module in
+chunks and put into the data of the set, parameter, or table directly, so the
+memory besides the data is bounded by the chunk size.
+"""
+
+import csv
+import re
+from itertools import islice
+
+# the number of rows converted at a time
+CHUNK_ROWS = 10000
+
+# the buffer size of the files (bytes)
+BUFFER_SIZE = 2 ** 20
+
+# the special values of GAMS
+_SPECIAL_VALUES = {'eps': 0, 'inf': float('inf'), '+inf': float('inf'), '-inf': float('-inf'),
+                   'na': float('nan'), 'undf': float('nan')}
+
+_NUMBER = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+
+
+class DelimitedData:
+    """
+    The delimited files included in the data of a statement, read when the
+    type and the dimension of the symbol are known.
+
+    Args:
+        paths (list): The files.
+    """
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+
+    def set_elements(self, dim):
+        """
+        The elements of a set: a row has the labels of an element (and may
+        have its text, which is skipped).
+
+        Returns:
+            list: The elements, as tuples if `dim` > 1.
+        """
+
+        res = []
+        labels = _Labels()
+        for chunk in self._chunks():
+            if dim == 1:
+                res += [labels[row[0]] for row in chunk if row and row[0]]
+            else:
+                res += [tuple([labels[e] for e in row[:dim]]) for row in chunk if len(row) >= dim]
+        return res
+
+    def parameter_values(self, dim):
+        """
+        The values of a parameter: a row has the labels of an index and the
+        value. The rows without a value are skipped.
+
+        Returns:
+            dict: Index (a tuple if `dim` > 1) -> value.
+        """
+
+        res = {}
+        labels = _Labels()
+        for chunk in self._chunks():
+            if dim == 1:
+                res.update((labels[row[0]], _value(row[1])) for row in chunk if len(row) > 1 and row[1])
+            else:
+                res.update((tuple([labels[e] for e in row[:dim]]), _value(row[dim]))
+                           for row in chunk if len(row) > dim and row[dim])
+        return res
+
+    def table_values(self, dim):
+        """
+        The values of a table: the first row has the labels of the last
+        index after `dim - 1` headers, and the other rows have the labels of
+        the other indices and the values. The empty values are skipped.
+
+        Returns:
+            dict: Index (a tuple) -> value.
+        """
+
+        res = {}
+        labels = _Labels()
+        for path in self.paths:
+            columns = None
+            for chunk in self._chunks([path]):
+                if columns is None and chunk:
+                    columns = [labels[c] for c in chunk[0][dim - 1:]]
+                    chunk = chunk[1:]
+                for row in chunk:
+                    index = tuple([labels[e] for e in row[:dim - 1]])
+                    res.update((index + (column, ), _value(v)) for column, v in zip(columns, row[dim - 1:]) if v)
+        return res
+
+    def _chunks(self, paths=None):
+        """
+        Iterate through the rows of the files in lists of `CHUNK_ROWS` rows.
+        """
+
+        for path in (self.paths if paths is None else paths):
+            with open(path, newline='', encoding='utf8', buffering=BUFFER_SIZE) as f:
+                reader = csv.reader(f, skipinitialspace=True)
+                while True:
+                    chunk = list(islice(reader, CHUNK_ROWS))
+                    if not chunk:
+                        break
+                    yield chunk
+
+
+class _Labels(dict):
+    """
+    The labels as elements, with the numbers converted as in the code. The
+    elements are shared by the indices with the same label.
+    """
+
+    def __missing__(self, label):
+        element = label.strip()
+        if _NUMBER.fullmatch(element):
+            v = float(element)
+            element = int(v) if v.is_integer() else v
+        self[label] = element
+        return element
+
+
+def _value(value):
+
+    try:
+        v = float(value)
+    except ValueError:
+        if value.strip().lower() not in _SPECIAL_VALUES:
+            raise ValueError(f"The delimited value '{value}' is not a number.")
+        return _SPECIAL_VALUES[value.strip().lower()]
+    return int(v) if v.is_integer() else v
@@ -0,0 +1,200 @@
+"""
+This module executes the transformed statements at translation time. It is the
+base of the backends that build a model directly instead of generating code.
+"""
+
+import logging
+import logging.config
+from itertools import product
+from lark import Token
+from .components import (Definition, ModelDefinition, EquationDefinition, SolveStatement,
+                         Assignment, Alias, Display, Option, Macro, SpecialIndex, evaluate, walk)
+
+logging.config.fileConfig('gams2pyomo/config.ini', disable_existing_loggers=False)
+logger = logging.getLogger('gams_translator.execution')
+logger.setLevel(logging.WARNING)
+
+_VARIABLE_TYPES = ('variable', 'p_variable', 'b_variable')
+
+
+class StatementExecutor:
+    """
+    Execute the root statements of a container until the first solve
+    statement.
+
+    The data assignments are computed with `evaluate`, and the values are kept
+    in the container. The subclasses declare the sets and variables, set the
+    variable attributes (`.l`, `.lo`, `.up`, `.fx`), and build the model of the
+    solve statement from the equations, with the parameter values at that
+    point, as GAMS does. The variables should be entered in `container.values`
+    such that the equations evaluate to the expressions of the backend.
+
+    Loops, if statements, and the statements that depend on solution values
+    are not supported.
+
+    Args:
+        container (ComponentContainer): The container with the root statements
+            (see `GAMSTransformer` with `assemble=False`).
+    """
+
+    def __init__(self, container):
+
+        self.container = container
+
+        # name -> definition of the parameters, in declaration order
+        self.parameters = {}
+        # name -> equation definition
+        self.equations = {}
+
+        # equation name -> lead/lag indices on the equation indices
+        self._shifts = {}
+
+    def run(self):
+        """
+        Execute the statements.
+
+        Returns:
+            SolveStatement: The first solve statement, or None if there is no
+                solve statement.
+        """
+
+        container = self.container
+        statements = container.root_statements
+
+        for n, statement in enumerate(statements):
+
+            # e.g., tables are not given in definition lists
+            if isinstance(statement, Definition):
+                statement = [statement]
+
+            if isinstance(statement, list):
+                for _c in statement:
+                    if isinstance(_c, Definition):
+                        self._execute_definition(_c)
+                    elif isinstance(_c, ModelDefinition):
+                        container.models[_c.name] = _c
+            elif isinstance(statement, Alias):
+                container.add_alias_sets(statement.aliases)
+            elif isinstance(statement, Assignment):
+                self._execute_assignment(statement)
+            elif isinstance(statement, EquationDefinition):
+                self.equations[statement.name] = statement
+            elif isinstance(statement, ModelDefinition):
+                container.models[statement.name] = statement
+            elif isinstance(statement, SolveStatement):
+                if n + 1 < len(statements):
+                    logger.info("The statements after the first solve statement are not executed.")
+                return statement
+            elif isinstance(statement, (Option, Macro)):
+                # record the options and the title
+                statement.assemble(container)
+            elif isinstance(statement, (Display, Token)):
+                # displays and comment blocks
+                continue
+            elif isinstance(statement, Exception):
+                logger.error(f"The statement cannot be executed and is skipped: {statement!r}")
+            else:
+                msg = f"{type(statement).__name__} cannot be executed at translation time"
+                if hasattr(statement, 'lines'):
+                    msg += f" (lines {statement.lines[0]}-{statement.lines[1]})"
+                raise NotImplementedError(msg + ".")
+
+        return None
+
+    def _execute_definition(self, definition):
+
+        name = definition.symbol.name
+
+        if definition.type in ('set', 'scalar', 'parameter'):
+            definition.evaluate(self.container)
+            if definition.type == 'set':
+                self._declare_set(definition)
+            else:
+                self.parameters[name] = definition
+        elif definition.type in _VARIABLE_TYPES:
+            self._declare_variable(definition)
+        elif definition.type != 'equation':
+            raise NotImplementedError(f"Definition type '{definition.type}' is not supported.")
+
+    def _execute_assignment(self, assignment):
+
+        symbol = assignment.symbol
+
+        # parameters
+        if not symbol.suffix:
+            assignment.evaluate(self.container)
+            return
+
+        if symbol.suffix not in ('l', 'lo', 'up', 'fx'):
+            raise NotImplementedError(f"The attribute of '{symbol!r}' is not supported.")
+
+        for key, scope in assignment.evaluate_indices(self.container):
+            value = evaluate(assignment.expression, self.container, scope)
+            self._set_variable_attribute(symbol, key, value)
+
+    def _declare_set(self, definition):
+        """
+        Declare a set; its elements are in `container.set_elements`.
+        """
+        pass
+
+    def _declare_variable(self, definition):
+        """
+        Declare a variable, or update its domain if it has been declared.
+        """
+        raise NotImplementedError
+
+    def _set_variable_attribute(self, symbol, key, value):
+        """
+        Set the attribute given by the suffix of the symbol for the variable
+        element `key` (None for scalars).
+        """
+        raise NotImplementedError
+
+    def model_equations(self, solve):
+        """
+        The equations of the model of the solve statement.
+        """
+        definition = self.container.models[solve.name]
+        return [e for e in self.equations.values() if definition.includes(e.name)]
+
+    def is_generated(self, equation, scope):
+        """
+        Check if the equation is generated for the elements in `scope`, i.e.,
+        if the condition holds and the lead/lag operations on the equation
+        indices are in the sets, as in the generated code.
+        """
+
+        if equation.name not in self._shifts:
+            index_list = equation.index_list or []
+            self._shifts[equation.name] = [
+                e for e in walk([equation.lhs, equation.rhs])
+                if isinstance(e, SpecialIndex) and e.index in index_list]
+
+        if equation.condition is not None and not evaluate(equation.condition, self.container, scope):
+            return False
+
+        return all(s.evaluate(self.container, scope) is not None for s in self._shifts[equation.name])
+
+    def equation_scopes(self, equation):
+        """
+        Iterate through the elements of the equation indices for which the
+        equation is generated.
+
+        Yields:
+            tuple: The elements and the scope for evaluating the equation.
+        """
+
+        index_list = equation.index_list or []
+
+        sets = []
+        for _idx in index_list:
+            _set = self.container.index_set(_idx)
+            if not _set:
+                raise NotImplementedError(f"The elements of '{_idx}' are not known.")
+            sets.append(self.container.set_elements[_set])
+
+        for elements in product(*sets):
+            scope = dict(zip(index_list, elements))
+            if self.is_generated(equation, scope):
+                yield elements, scope
@@ -0,0 +1,117 @@
+"""
+This module defines the event hooks of the translation, with which external
+tools can trace the translation phases and the root statements (see
+`GAMSTranslator` and `ComponentContainer`).
+"""
+
+import time
+
+# the translation events
+EVENTS = (
+    'phase_start',
+    'phase_end',
+    'statement_parsed',
+    'statement_transformed',
+    'statement_assembled',
+    'statement_skipped',
+)
+
+
+class Hooks:
+    """
+    The callbacks registered for the translation events.
+
+    A callback is called as `callback(event, info)`, where `info` is a dict
+    with the time of the event (`time`, from `time.perf_counter`) and
+    - for the phase events: the name of the phase (`phase`), and for
+      `phase_end` the duration (`seconds`) and the peak memory
+      (`peak_memory`) if `tracemalloc` is tracing;
+    - for the statement events: the statement (`statement`, a Lark tree for
+      `statement_parsed` and a component otherwise), its source lines
+      (`lines`, or None if unknown), its start time (`start`) and duration
+      (`seconds`), and for `statement_skipped` the exception (`exception`).
+      The statements are parsed together, so the timing of
+      `statement_parsed` is None; the parsing time is in the `parsing` phase.
+
+    An empty `Hooks` is falsy, and the events are only prepared if there are
+    callbacks.
+    """
+
+    def __init__(self):
+
+        # event -> callbacks
+        self._callbacks = {}
+
+    def __bool__(self):
+        return bool(self._callbacks)
+
+    def __contains__(self, event):
+        return event in self._callbacks or '*' in self._callbacks
+
+    def register(self, event, callback):
+        """
+        Register a callback for an event, or for all the events with `'*'`.
+
+        Returns:
+            The callback.
+        """
+
+        if event != '*' and event not in EVENTS:
+            raise ValueError(f"Unknown event '{event}'; the events are: {', '.join(EVENTS)}.")
+        self._callbacks.setdefault(event, []).append(callback)
+        return callback
+
+    def unregister(self, event, callback):
+        """
+        Remove a callback registered for an event.
+        """
+
+        callbacks = self._callbacks.get(event, [])
+        if callback not in callbacks:
+            raise ValueError(f"The callback is not registered for '{event}'.")
+        callbacks.remove(callback)
+        if not callbacks:
+            del self._callbacks[event]
+
+    def emit(self, event, **info):
+        """
+        Call the callbacks of an event.
+        """
+
+        callbacks = self._callbacks.get(event, []) + self._callbacks.get('*', [])
+        if not callbacks:
+            return
+
+        info.setdefault('time', time.perf_counter())
+        for callback in callbacks:
+            callback(event, info)
+
+
+def statement_lines(statement):
+    """
+    The first and the last source line of a root statement: a component, a
+    definition list, a Lark tree, or a token.
+
+    Returns:
+        tuple: The lines, or None if unknown.
+    """
+
+    if isinstance(statement, list):
+        lines = [_l for _l in map(statement_lines, statement) if _l is not None]
+        return (lines[0][0], lines[-1][1]) if lines else None
+
+    # components
+    lines = getattr(statement, 'lines', None)
+    if lines is not None:
+        return tuple(lines)
+
+    # trees (with `propagate_positions`)
+    meta = getattr(statement, 'meta', None)
+    if meta is not None and not meta.empty:
+        return (meta.line, meta.end_line)
+
+    # tokens
+    if getattr(statement, 'line', None) is not None:
+        return (statement.line, statement.end_line)
+
+    return None
@@ -0,0 +1,545 @@
+"""
+This module resolves the `$include` dollar control option (see
+`GAMSTranslator`).
+
+The code is divided into units at the includes between statements: the code
+of each included file and the code between its includes. The units are
+parsed on their own, in parallel processes if there are several, and the parse
+trees of the included files are cached by the hash of their contents, such
+that a file included by several models is parsed once. The root statements of
+all the units are then transformed together in order, so the symbols declared
+in any file are known in the following ones.
+
+The includes inside a statement (e.g., the elements of a set) are replaced by
+the contents of the file before the parsing, so the line numbers of the
+following statements of the unit include the lines of the file, except for the
+delimited data in `$onDelim` blocks, which is read without the parser (see
+`DelimitedData`).
+"""
+
+import hashlib
+import logging
+import os
+import json
+import re
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from lark import Token, Tree
+from lark.tree import Meta
+from .source import open_source, decode, leading_comments_end
+
+logger = logging.getLogger('gams_translator.include')
+
+# the units of at least this many characters in total are parsed in parallel
+PARALLEL_THRESHOLD = 20000
+
+# the dollar control options handled when dividing the code; the others are
+# kept in the code
+_DIRECTIVE = re.compile(r'^[ \t]*\$(include|set|setglobal|setlocal|ontext|offtext|ondelim|offdelim)\b[ \t]*(.*?)[ \t]*$',
+                        re.MULTILINE | re.IGNORECASE)
+_VARIABLE = re.compile(r'%(\w+)%')
+
+# a line of code, i.e., not empty nor a comment
+_CODE_LINE = re.compile(r'^(?!\*)[ \t]*\S', re.MULTILINE)
+
+with open(os.path.join(os.path.dirname(__file__), 'gams.lark'), 'rb') as f:
+    # the cached trees are only valid for the grammar they are parsed with
+    _GRAMMAR_HASH = hashlib.sha256(f.read()).digest()
+
+
+class IncludeCache:
+    """
+    The parse trees of the included files, by the hash of their code and the
+    grammar. The most recently used trees are kept in memory, and if a
+    directory is given, all the trees are also stored there and shared with
+    other processes.
+
+    The stored trees are JSON files with the code, so loading them cannot run
+    code, and a file whose code does not match its hash is ignored. A tree
+    edited in the directory is still used as it is, so the directory should
+    not be writable by others than the users of the cache.
+
+    Args:
+        size (int, optional): The number of trees kept in memory. Defaults
+            to 128.
+        directory (str, optional): The directory of the stored trees.
+            Defaults to None.
+    """
+
+    def __init__(self, size=128, directory=None):
+
+        self.size = size
+        self.directory = directory
+        self._trees = OrderedDict()
+
+    @staticmethod
+    def key(text):
+        return hashlib.sha256(_GRAMMAR_HASH + text.encode('utf8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """
+        The cached tree, or None.
+        """
+
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            return tree
+
+        if self.directory is not None and os.path.exists(self._path(key)):
+            with open(self._path(key), encoding='utf8') as f:
+                stored = json.load(f)
+            if self.key(stored['text']) == key:
+                tree = _load_tree(stored['tree'])
+                self._remember(key, tree)
+
+        return tree
+
+    def put(self, key, tree, text):
+
+        self._remember(key, tree)
+
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            # write and rename, such that other processes read complete files
+            temp = self._path(key) + f'.{os.getpid()}'
+            with open(temp, 'w', encoding='utf8') as f:
+                json.dump({'text': text, 'tree': _dump_tree(tree)}, f, separators=(',', ':'))
+            os.replace(temp, self._path(key))
+
+    def _remember(self, key, tree):
+        self._trees[key] = tree
+        self._trees.move_to_end(key)
+        while len(self._trees) > self.size:
+            self._trees.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove the trees from the memory (not from the directory).
+        """
+        self._trees.clear()
+
+    def __len__(self):
+        return len(self._trees)
+
+
+# the cache shared by the translators
+include_cache = IncludeCache()
+
+
+class Unit:
+    """
+    A part of the code parsed on its own.
+
+    Attributes:
+        text (str): The code.
+        file (str): The included file of the code, or None for the code of
+            the translated file.
+        line (int): The line of the (outermost) `$include` of the file in
+            the translated file, where its statements are located; None for
+            the code of the translated file.
+        lines (list): For the code of the translated file, the lines of the
+            code from which the lines of the file are counted: tuples of the
+            line of the code, the line of the file, and whether the following
+            lines are the code of an included file, located at that line.
+    """
+
+    __slots__ = ('text', 'file', 'line', 'lines')
+
+    def __init__(self, text, file=None, line=None, lines=None):
+        self.text, self.file, self.line = text, file, line
+        self.lines = lines if lines is not None else [(1, 1, False)]
+
+    def source_line(self, n):
+        """
+        The line in the translated file of a line of the code.
+        """
+
+        if self.line is not None:
+            return self.line
+
+        first, line, included = self.lines[bisect_right(self.lines, (n, float('inf'))) - 1]
+        return line if included else line + n - first
+
+
+class IncludeResolver:
+    """
+    Resolve the includes of a GAMS code and parse it.
+
+    The included files are looked for in the directory of the including
+    file, in `include_dirs`, and in the working directory; the extension
+    `.gms` is added to a name without one. The compile-time variables in the
+    names (`%name%`) are replaced by their values in `variables` and from the
+    `$set`, `$setglobal`, and `$setlocal` options before the include. The
+    includes of files that are not found are kept in the code.
+
+    Args:
+        directory (str, optional): The directory of the translated file.
+            Defaults to the working directory.
+        include_dirs (list, optional): Other directories of the included
+            files. Defaults to ().
+        variables (dict, optional): The compile-time variables, e.g., from the
+            command line. Defaults to None.
+        workers (int, optional): The maximum number of processes parsing the
+            units. Defaults to the number of CPUs.
+        cache (IncludeCache, optional): The cache of the parse trees of the
+            included files. Defaults to `include_cache`.
+    """
+
+    def __init__(self, directory=None, include_dirs=(), variables=None, workers=None, cache=None):
+
+        self.directory = directory if directory is not None else os.getcwd()
+        self.include_dirs = list(include_dirs)
+        self.variables = {k.lower(): str(v) for k, v in (variables or {}).items()}
+        # with the values set in the code so far
+        self._variables = dict(self.variables)
+        self.workers = workers if workers is not None else _cpus()
+        self.cache = cache if cache is not None else include_cache
+
+        # the included files of the last parsing: the file, the line of the
+        # `$include` in the translated file, and whether it was inlined into
+        # a statement or its tree was cached
+        self.includes = []
+
+    def parse(self, text, path=None):
+        """
+        Parse the code with the included files.
+
+        Args:
+            text (str): The code.
+            path (str, optional): The translated file, if any. Defaults to
+                None.
+
+        Returns:
+            Tree: The parse tree, with the root statements of all the units.
+        """
+
+        self.includes = []
+        units = self.units(text, path)
+
+        # the trees by unit; the code of the translated file is not cached
+        trees = [None] * len(units)
+        todo = []
+        keys = {}
+        for n, unit in enumerate(units):
+            if unit.file is not None:
+                keys[n] = self.cache.key(unit.text)
+                trees[n] = self.cache.get(keys[n])
+            if trees[n] is None:
+                todo.append(n)
+
+        cached = {units[n].file for n in keys if trees[n] is not None}
+        for include in self.includes:
+            include['cached'] = include['file'] in cached
+
+        parsed = self._parse_all([units[n].text for n in todo])
+        for n, tree in zip(todo, parsed):
+            trees[n] = tree
+            if n in keys:
+                self.cache.put(keys[n], tree, units[n].text)
+
+        children = []
+        for unit, tree in zip(units, trees):
+            if unit.line is not None or unit.lines != [(1, 1, False)]:
+                tree = _relocate(tree, unit.source_line)
+            children += tree.children
+
+        return Tree('start', children)
+
+    def units(self, text, path=None):
+        """
+        Divide the code into units at the includes between statements.
+
+        Returns:
+            list: The units (`Unit`) in order.
+        """
+
+        units = []
+        self._variables = dict(self.variables)
+        stack = [os.path.normpath(os.path.abspath(path))] if path is not None else []
+        self._split(text, None, self.directory, stack, None, units)
+        return units
+
+    def _split(self, text, file, directory, stack, line, units):
+        """
+        Add the units of the code of a file (None for the translated file) to
+        `units`. `line` is the line of the outermost include of the file.
+        """
+
+        parts = []
+        # the start of the current unit in the text, the lines of the unit
+        # (see `Unit.lines`) and their number, and the line number at
+        # `position` in the text
+        start = 0
+        lines, n_lines = [(1, 1, False)], 0
+        n = position = 0
+
+        for m, name, replacement in self._includes(text, directory):
+
+            if name in stack:
+                raise ValueError(f"The file '{name}' includes itself.")
+
+            n += text.count('\n', position, m.start())
+            position = m.start()
+            at = n + 1 if line is None else line
+
+            if replacement is not None:
+                # the delimited data, on the same line
+                parts += [text[start:m.start()], replacement]
+                start = m.end()
+                if name is not None:
+                    self.includes.append({'file': name, 'line': at, 'inlined': False, 'delimited': True})
+                continue
+
+            if not _between_statements(text, m.start()):
+                # replace the include with the code of the file, located at
+                # the line of the include
+                code = self._expand(_read(name), name, stack + [name])
+                parts += [text[start:m.start()], code]
+                n_lines += text.count('\n', start, m.start())
+                lines.append((n_lines + 1, at, True))
+                n_lines += code.count('\n')
+                lines.append((n_lines + 1, at, False))
+                start = m.end()
+                self.includes.append({'file': name, 'line': at, 'inlined': True, 'delimited': False})
+                continue
+
+            parts.append(text[start:m.start()])
+            self._add(''.join(parts), file, line, lines, units)
+
+            self.includes.append({'file': name, 'line': at, 'inlined': False, 'delimited': False})
+            self._split(_read(name), name, os.path.dirname(name), stack + [name], at, units)
+
+            # the next unit starts after the line of the include
+            parts = []
+            start = m.end() + 1
+            lines, n_lines = [(1, n + 2, False)], 0
+
+        parts.append(text[start:])
+        self._add(''.join(parts), file, line, lines, units)
+
+    def _expand(self, text, file, stack):
+        """
+        The code of a file with the included files inserted.
+        """
+
+        parts = []
+        start = 0
+        for m, name, replacement in self._includes(text, os.path.dirname(file)):
+            if name in stack:
+                raise ValueError(f"The file '{name}' includes itself.")
+            if replacement is None:
+                replacement = self._expand(_read(name), name, stack + [name])
+            parts += [text[start:m.start()], replacement]
+            start = m.end()
+        parts.append(text[start:])
+
+        return ''.join(parts)
+
+    def _includes(self, text, directory):
+        """
+        Iterate through the includes of the code outside the comment blocks,
+        with the located files, and set the compile-time variables in order.
+
+        The includes of delimited data (in `$onDelim` blocks) are replaced by
+        a `$onDelim` line with the file, which is read when transformed (see
+        `DelimitedData`), and the lines of the options are emptied, as are
+        the lines of the `$set` options: the matches are yielded with the
+        file (or None) and the replacement. Otherwise, the replacement is
+        None.
+        """
+
+        comment_block = False
+        # the `$onDelim` of the current block, and whether it has includes
+        delim = None
+        delim_includes = False
+        for m in _DIRECTIVE.finditer(text):
+            option, argument = m.group(1).lower(), m.group(2)
+
+            if option == 'ontext':
+                comment_block = True
+            elif option == 'offtext':
+                comment_block = False
+            elif comment_block:
+                continue
+            elif option == 'ondelim':
+                delim, delim_includes = m, False
+            elif option == 'offdelim':
+                if delim_includes:
+                    yield m, None, ''
+                delim = None
+            elif option == 'include':
+                name = self.locate(argument, directory)
+                if name is None:
+                    logger.warning(f"The included file '{argument}' is not found; the $include is kept.")
+                    continue
+                if delim is None:
+                    yield m, name, None
+                    continue
+                if not delim_includes:
+                    yield delim, None, ''
+                    delim_includes = True
+                yield m, name, f'$onDelim {name}'
+            elif argument:
+                # $set name value
+                key, *value = argument.split(None, 1)
+                self._variables[key.lower()] = value[0].strip('"\'') if value else ''
+                # consumed here, so the line is emptied
+                yield m, None, ''
+
+    def locate(self, name, directory=None):
+        """
+        The path of an included file, or None if it is not found.
+
+        Args:
+            name (str): The argument of the `$include`.
+            directory (str, optional): The directory of the including file.
+                Defaults to `directory`.
+        """
+
+        name = _VARIABLE.sub(lambda m: self._variables.get(m.group(1).lower(), m.group(0)), name)
+        name = name.strip('"\'')
+
+        names = [name] if os.path.splitext(name)[1] else [name + '.gms', name]
+        directories = [directory or self.directory] + self.include_dirs + [os.getcwd()]
+        for d in directories:
+            for _name in names:
+                path = os.path.join(d, _name)
+                if os.path.isfile(path):
+                    return os.path.normpath(os.path.abspath(path))
+        return None
+
+    @staticmethod
+    def _add(text, file, line, lines, units):
+        """
+        Add the code as a unit, without its leading comment lines, if it has
+        code.
+        """
+
+        start = leading_comments_end(text)
+        if not _CODE_LINE.search(text, start):
+            return
+
+        # the leading comment lines are before the first include
+        k = text.count('\n', 0, start)
+        lines = [(1, lines[0][1] + k, False)] + [(first - k, _line, included) for first, _line, included in lines[1:]]
+        units.append(Unit(text[start:], file, line, lines))
+
+    def _parse_all(self, texts):
+        """
+        Parse the codes, in parallel if there are several and they are large
+        enough.
+        """
+
+        workers = min(self.workers, len(texts))
+        if workers > 1 and sum(map(len, texts)) >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(workers) as executor:
+                # the largest first, for the balance between the processes
+                order = sorted(range(len(texts)), key=lambda n: len(texts[n]), reverse=True)
+                trees = dict(zip(order, executor.map(_parse, [texts[n] for n in order])))
+            return [trees[n] for n in range(len(texts))]
+
+        return [_parse(t) for t in texts]
+
+
+def _cpus():
+    """
+    The number of CPUs available to the process.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _parse(text):
+    # imported here for the worker processes
+    from .main import lark_gams
+    return lark_gams.parse(text)
+
+
+def _read(path):
+    """
+    The code of an included file, with the line endings as in text mode.
+    """
+    with open_source(path) as source:
+        return decode(source)
+
+
+def _between_statements(text, position):
+    """
+    Whether a line starts between statements, i.e., the previous line of code
+    ends a statement (`;`) or is a dollar control option, or there is none.
+    """
+
+    end = position
+    while end > 0:
+        start = text.rfind('\n', 0, end - 1) + 1
+        line = text[start:end].strip()
+        if line and not line.startswith('*'):
+            return line.endswith(';') or line.startswith('$')
+        end = start
+    return True
+
+
+def _relocate(tree, source_line):
+    """
+    A copy of the tree with the line numbers mapped by a function.
+    """
+
+    children = [_relocate(c, source_line) if isinstance(c, Tree) else c for c in tree.children]
+
+    meta = None
+    _meta = tree._meta
+    if _meta is not None and not _meta.empty:
+        meta = Meta()
+        meta.__dict__.update(_meta.__dict__)
+        meta.line, meta.end_line = source_line(_meta.line), source_line(_meta.end_line)
+
+    # e.g., the comment blocks at the root
+    if tree.data == 'start':
+        for n, c in enumerate(children):
+            if isinstance(c, Token) and c.line is not None:
+                c = children[n] = Token.new_borrow_pos(c.type, c.value, c)
+                c.line, c.end_line = source_line(c.line), source_line(c.end_line)
+
+    return Tree(tree.data, children, meta)
+
+
+def _dump_tree(tree):
+    """
+    A parse tree as JSON-compatible lists: a tree as its rule, its position
+    (or None), and its children; a token as its type, its value, and its
+    position.
+    """
+
+    if isinstance(tree, Token):
+        return ['token', tree.type, str(tree),
+                [tree.start_pos, tree.line, tree.column, tree.end_line, tree.end_column, tree.end_pos]]
+
+    meta = tree._meta
+    position = None
+    if meta is not None and not meta.empty:
+        position = [meta.start_pos, meta.line, meta.column, meta.end_line, meta.end_column, meta.end_pos]
+    return ['tree', tree.data, position, [_dump_tree(c) for c in tree.children]]
+
+
+def _load_tree(data):
+    """
+    A parse tree from `_dump_tree`.
+    """
+
+    if data[0] == 'token':
+        _, type_, value, (start_pos, line, column, end_line, end_column, end_pos) = data
+        return Token(type_, value, start_pos, line, column, end_line, end_column, end_pos)
+
+    _, rule, position, children = data
+    meta = None
+    if position is not None:
+        meta = Meta()
+        meta.empty = False
+        meta.start_pos, meta.line, meta.column, meta.end_line, meta.end_column, meta.end_pos = position
+    return Tree(rule, [_load_tree(c) for c in children], meta)
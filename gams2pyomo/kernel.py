@@ -0,0 +1,598 @@
+"""
+This module generates array-oriented Pyomo code for linear GAMS models: each
+equation becomes one `pyomo.kernel` matrix constraint over NumPy arrays,
+instead of a rule function called for each element.
+"""
+
+import keyword
+import math
+import os
+import re
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+from .linear import LinearModelBuilder, _Vectorizer
+
+_NL = '\n'
+
+# the arrays with more elements are saved into the data file
+LITERAL_SIZE = 1000
+
+# the parameters are dense arrays over their sets; the equations with larger
+# parameters are written as data
+DENSE_SIZE = 10 ** 7
+
+_SENSES = {
+    'minimizing': 'pmo.minimize',
+    'maximizing': 'pmo.maximize',
+}
+
+# the names of the generated code
+_RESERVED = {'m', 'np', 'os', 'pmo', 'csr_matrix', 'opt'}
+
+# the operators of the generated expressions
+_OPERATORS = {
+    np.add: '+',
+    np.subtract: '-',
+    np.multiply: '*',
+    np.true_divide: '/',
+    np.power: '**',
+    np.less: '<',
+    np.less_equal: '<=',
+    np.equal: '==',
+    np.not_equal: '!=',
+    np.greater: '>',
+    np.greater_equal: '>=',
+    np.bitwise_and: '&',
+    np.bitwise_or: '|',
+}
+
+
+class KernelCodeGenerator:
+    """
+    Generate `pyomo.kernel` code for the linear model of the first solve
+    statement.
+
+    The model is compiled with `LinearModelBuilder`. The parameters of the
+    equations are NumPy arrays over the elements of their sets, with the
+    values at the solve statement, and the coefficients and right-hand sides
+    of an equation are NumPy expressions of the parameter arrays, so the code
+    can be run with other parameter values. Which rows and terms exist (the
+    conditions and lead/lag operations) is decided at translation time. The
+    equations that are not vectorized (see `_Vectorizer`) are written with
+    the coefficients computed at translation time.
+
+    The variables of a GAMS variable are a `variable_list`, with the keys of
+    the elements in `_<name>_keys`, and the rows of an equation are a
+    `matrix_constraint` with a CSR matrix over all the columns.
+
+    Args:
+        container (ComponentContainer): The container with the root statements
+            (see `GAMSTransformer` with `assemble=False`).
+        data_file (str, optional): The NumPy `.npz` file for the arrays with
+            more than `LITERAL_SIZE` elements; the smaller arrays are written
+            in the code. If None, all the arrays are written in the code.
+            Defaults to None.
+        code_file (str, optional): The file of the generated code, which
+            loads the data file by its path relative to the code file.
+            Defaults to a code file in the directory of the data file.
+    """
+
+    def __init__(self, container, data_file=None, code_file=None):
+
+        self.container = container
+        self.data_file = data_file
+        self.code_file = code_file
+
+        # array name -> array, saved into the data file
+        self.arrays = {}
+
+        # the lines of the parameter arrays, and parameter name -> array name
+        self._parameters = []
+        self._parameter_names = {}
+
+        # equation name -> the names and arrays of its arrays
+        self._blocks = {}
+        self._block = None
+        # id -> name and array of the arrays of the current equation
+        self._block_arrays = {}
+
+    def assemble(self):
+        """
+        Generate the code.
+
+        Returns:
+            str: The generated Python code.
+        """
+
+        builder = _KernelModelBuilder(self.container, self)
+        model = builder.build()
+
+        body = self._assemble_variables(model)
+        body += self._assemble_constraints(model, builder.expressions)
+        body += self._assemble_objective(builder.solve)
+
+        solve = builder.solve
+        body += f"opt = pmo.SolverFactory('{solve.solver_name(self.container)}')" + _NL
+        body += "opt.solve(m, tee=True)" + _NL
+
+        res = self.container.assemble_banner()
+        if self.arrays:
+            res += "import os" + _NL
+        res += "import numpy as np" + _NL
+        res += "import pyomo.kernel as pmo" + _NL
+        res += "from scipy.sparse import csr_matrix" + _NL
+        res += "\n\n"
+        if self.container.model_title:
+            res += f"# {self.container.model_title}" + _NL
+
+        if self.arrays:
+            np.savez(self.data_file, **self.arrays)
+            # the data file is found from the directory of the code
+            code_dir = os.path.dirname(os.path.abspath(self.code_file or self.data_file))
+            path = os.path.relpath(os.path.abspath(self.data_file), code_dir)
+            res += f"_data = np.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), {path!r}))" + _NL
+
+        if self._parameters:
+            res += "# the parameters over the elements of their sets" + _NL
+            res += ''.join(self._parameters)
+
+        res += "m = pmo.block()" + _NL
+
+        return res + body
+
+    def _array(self, name, values, dtype=float):
+        """
+        The code of a NumPy array, written in the code or loaded from the data
+        file if it is large.
+        """
+
+        values = np.asarray(values, dtype=dtype)
+        if self.data_file is not None and values.size > LITERAL_SIZE:
+            self.arrays[name] = values
+            return f"_data[{name!r}]"
+        if not values.size:
+            return f"np.zeros({values.shape}, dtype=np.{values.dtype.name})"
+        return f"np.array({_literal(values.tolist())})"
+
+    def parameter(self, name, values, sets=None):
+        """
+        Write a parameter of the equations: a number for scalars, or an array
+        over the elements of its sets.
+
+        Returns:
+            str: The name of the parameter in the code.
+        """
+
+        if name not in self._parameter_names:
+            code = name + '_' if name in _RESERVED or keyword.iskeyword(name) else name
+            self._parameter_names[name] = code
+            if sets is None:
+                self._parameters.append(f"{code} = {_number(values)}" + _NL)
+            else:
+                self._parameters.append(f"{code} = {self._array(code, values)}  # {name}({', '.join(sets)})" + _NL)
+        return self._parameter_names[name]
+
+    def index(self, array):
+        """
+        Write an array of the current equation, e.g., the positions of the
+        elements of the rows.
+
+        Returns:
+            str: The name of the array in the code.
+        """
+
+        if id(array) not in self._block_arrays:
+            name = f"_{self._block}_{len(self._block_arrays)}"
+            self._blocks[self._block].append((name, array))
+            # the array is kept such that its id is not reused
+            self._block_arrays[id(array)] = (name, array)
+        return self._block_arrays[id(array)][0]
+
+    def start(self, equation):
+        """
+        Start the arrays of an equation.
+        """
+        self._block = equation
+        self._blocks[equation] = []
+        self._block_arrays = {}
+
+    def discard(self, equation):
+        """
+        Discard the arrays of an equation that is not vectorized.
+        """
+        del self._blocks[equation]
+        self._block_arrays = {}
+
+    def _assemble_variables(self, model):
+
+        res = ""
+
+        for name, (start, keys) in model.variable_blocks.items():
+
+            stop = start + (1 if keys is None else len(keys))
+            lower = model.lower[start:stop]
+            upper = model.upper[start:stop]
+
+            args = []
+            if model.integer[start]:
+                args.append("domain_type=pmo.IntegerSet")
+
+            if keys is None:
+                if lower[0] != -math.inf:
+                    args.append(f"lb={_number(lower[0])}")
+                if upper[0] != math.inf:
+                    args.append(f"ub={_number(upper[0])}")
+                res += f"m.{name} = pmo.variable({', '.join(args)})" + _NL
+                continue
+
+            res += f"_{name}_keys = {keys!r}" + _NL
+
+            # the same bounds for all the elements
+            if len(set(lower)) == 1 and len(set(upper)) == 1:
+                if lower[0] != -math.inf:
+                    args.append(f"lb={_number(lower[0])}")
+                if upper[0] != math.inf:
+                    args.append(f"ub={_number(upper[0])}")
+                res += f"m.{name} = pmo.variable_list(pmo.variable({', '.join(args)}) " \
+                       f"for _ in range({len(keys)}))" + _NL
+                continue
+
+            args += ["lb=lb", "ub=ub"]
+            res += f"m.{name} = pmo.variable_list(pmo.variable({', '.join(args)}) for lb, ub in " \
+                   f"zip({self._array(f'{name}_lb', lower)}.tolist(), " \
+                   f"{self._array(f'{name}_ub', upper)}.tolist()))" + _NL
+
+        # the columns of the matrices
+        columns = []
+        for name, (start, keys) in model.variable_blocks.items():
+            columns.append(f"m.{name}" if keys is None else f"*m.{name}")
+        res += "_x = [" + ", ".join(columns) + "]" + _NL
+
+        return res
+
+    def _assemble_constraints(self, model, expressions):
+
+        res = ""
+        n_columns = len(model.columns)
+        row_terms = model.row_terms()
+
+        for name, rows in model.equation_blocks.items():
+
+            if not rows:
+                continue
+
+            # the rows in CSR format
+            terms = row_terms[rows.start:rows.stop]
+            indptr = np.cumsum([0] + [len(col) for col, _ in terms])
+            indices = [k for col, _ in terms for k in col]
+
+            # the rows of an equation have the same sense
+            sense = model.senses[rows.start]
+            bound = {'E': 'rhs', 'L': 'ub', 'G': 'lb'}[sense]
+
+            if name in expressions:
+                data, rhs = (e.array_code() if isinstance(e, _Expression) else self._array(f'{name}_{k}', e)
+                             for e, k in zip(expressions[name], ('data', bound)))
+                # the arrays used by the expressions, e.g., not the ones of
+                # the sums of zeros
+                for array_name, array in self._blocks[name]:
+                    if re.search(rf"\b{array_name}\b", data + rhs):
+                        res += f"{array_name} = {self._array(array_name, array, array.dtype)}" + _NL
+                if len(data) > 80:
+                    res += f"_{name}_data = {data}" + _NL
+                    data = f"_{name}_data"
+            else:
+                res += f"# the coefficients of '{name}' are computed at translation time" + _NL
+                data = self._array(f'{name}_data', [c for _, coef in terms for c in coef])
+                rhs = self._array(f'{name}_{bound}', model.rhs[rows.start:rows.stop])
+
+            matrix = f"csr_matrix(({data}, " \
+                     f"{self._array(f'{name}_indices', indices, int)}, " \
+                     f"{self._array(f'{name}_indptr', indptr, int)}), " \
+                     f"shape=({len(rows)}, {n_columns}))"
+
+            res += f"m.{name} = pmo.matrix_constraint({matrix}, {bound}={rhs}, x=_x)" + _NL
+
+        return res
+
+    def _assemble_objective(self, solve):
+
+        # the objective variable is scalar, see `LinearModelBuilder`
+        return f"m._obj_ = pmo.objective(m.{solve.obj_var}, sense={_SENSES[solve.sense]})" + _NL
+
+
+class _KernelModelBuilder(LinearModelBuilder):
+    """
+    Compile the linear model with the expressions of the coefficients and
+    right-hand sides of the vectorized equations, for `KernelCodeGenerator`.
+    """
+
+    def __init__(self, container, generator):
+
+        super().__init__(container)
+
+        self.generator = generator
+        self._vectorizer = _KernelVectorizer(container, self.variables, self.domains, self.parameters, generator)
+
+        # equation name -> the expressions of the coefficients and the
+        # right-hand sides
+        self.expressions = {}
+
+    def _vectorized_rows(self, equation):
+
+        self.generator.start(equation.name)
+        try:
+            res = super()._vectorized_rows(equation)
+        except NotImplementedError:
+            self.generator.discard(equation.name)
+            raise
+
+        self.expressions[equation.name] = res[3], res[5]
+        return res
+
+
+class _KernelVectorizer(_Vectorizer):
+    """
+    Evaluate the equations as `_Vectorizer`, with the data as `_Expression`
+    of the parameter arrays of `KernelCodeGenerator`.
+    """
+
+    def __init__(self, container, variables, domains, parameters, generator):
+        super().__init__(container, variables, domains)
+        self.parameters = parameters
+        self.generator = generator
+
+    def _full(self, value, size):
+        return _Expression(super()._full(value, size), _number(float(value)), self.generator,
+                           scalar=True, constant=True)
+
+    def _scalar(self, name, value, rows):
+        code = self.generator.parameter(name, float(value))
+        return _Expression(super()._full(value, rows.size), code, self.generator, scalar=True)
+
+    def _parameter(self, name, sets, positions, valid, rows):
+
+        definition = self.parameters.get(name)
+        domain = [self.container.index_set(_idx) for _idx in definition.symbol.index_list or []] \
+            if definition is not None else []
+        if len(domain) != len(sets) or not all(domain):
+            raise NotImplementedError(f"The sets of '{name}' are not known.")
+        domain = tuple(domain)
+
+        sizes = [len(self._set_positions(s)) for s in domain]
+        if math.prod(sizes) > DENSE_SIZE:
+            raise NotImplementedError(f"The parameter '{name}' is too large.")
+
+        # the dense array over the sets of the parameter
+        keys, table = self._table(name, domain)
+        values = np.zeros(math.prod(sizes))
+        values[keys] = table
+        values = values.reshape(sizes)
+        code = self.generator.parameter(name, values, domain)
+
+        # the positions of the elements on the sets of the parameter, e.g.,
+        # for the indices over subsets
+        index = []
+        for _set, _domain, p in zip(sets, domain, positions):
+            if _set != _domain:
+                domain_positions = self._set_positions(_domain)
+                p = np.array([domain_positions.get(e, -1) for e in self._set_positions(_set)], dtype=np.int64)[p]
+                valid = valid & (p >= 0)
+                p = np.maximum(p, 0)
+            index.append(p)
+
+        if len(index) == 1 and np.array_equal(index[0], np.arange(sizes[0])):
+            # e.g., the parameter over the set of the equation
+            res = _Expression(values, code, self.generator)
+        else:
+            res = _Expression(values[tuple(index)], f"{code}[{', '.join(map(self.generator.index, index))}]",
+                              self.generator)
+        if not valid.all():
+            # e.g., the lead/lag operations out of the sets
+            res = _Expression(np.where(valid, res.values, 0.0),
+                              f"np.where({self.generator.index(valid)}, {res.code}, 0.0)", self.generator)
+        return res
+
+
+class _Expression(NDArrayOperatorsMixin):
+    """
+    An array computed at translation time with the code that computes it in
+    the generated code. The NumPy operations of `_Vectorizer` on the array
+    build the code (see `__array_ufunc__` and `__array_function__`).
+
+    Args:
+        values (numpy.ndarray): The values.
+        code (str): The code of the values.
+        generator (KernelCodeGenerator): The generator, which writes the
+            arrays of the code.
+        scalar (bool, optional): Whether the code is a number, broadcast to
+            the shape of the values. Defaults to False.
+        constant (bool, optional): Whether the code is a literal number.
+            Defaults to False.
+        atomic (bool, optional): Whether the code needs no parentheses as an
+            operand. Defaults to True.
+        negated (_Expression, optional): The expression whose negation is
+            the code. Defaults to None.
+    """
+
+    __slots__ = ('values', 'code', 'generator', 'scalar', 'constant', 'atomic', 'negated')
+
+    def __init__(self, values, code, generator, scalar=False, constant=False, atomic=True, negated=None):
+        self.values = values
+        self.code = code
+        self.generator = generator
+        self.scalar = scalar
+        self.constant = constant
+        self.atomic = atomic
+        self.negated = negated
+
+    def __array__(self, dtype=None, copy=None):
+        return self.values if dtype is None else self.values.astype(dtype)
+
+    def __len__(self):
+        return len(self.values)
+
+    def all(self):
+        return self.values.all()
+
+    def any(self):
+        return self.values.any()
+
+    def operand(self):
+        """
+        The code as an operand.
+        """
+        return self.code if self.atomic else f"({self.code})"
+
+    def array_code(self):
+        """
+        The code of an array with the shape of the values.
+        """
+        return f"np.full({len(self.values)}, {self.code})" if self.scalar else self.code
+
+    def astype(self, dtype):
+        if self.scalar:
+            return _Expression(self.values.astype(dtype), f"{dtype.__name__}({self.code})", self.generator,
+                               scalar=True, constant=self.constant and _is_number(self.values))
+        return _Expression(self.values.astype(dtype), f"{self.operand()}.astype({dtype.__name__})",
+                           self.generator)
+
+    def __getitem__(self, index):
+
+        values = self.values[index]
+        if self.scalar:
+            return _Expression(values, self.code, self.generator, scalar=True, constant=self.constant,
+                               atomic=self.atomic)
+
+        # e.g., the rows in their order
+        if len(values) == len(self.values) and \
+                (index.dtype == bool or np.array_equal(index, np.arange(len(index)))):
+            return self
+        return _Expression(values, f"{self.operand()}[{self.generator.index(index)}]", self.generator)
+
+    def _wrap(self, value):
+        """
+        An operand as an expression.
+        """
+        if isinstance(value, _Expression):
+            return value
+        if isinstance(value, np.ndarray) and value.ndim:
+            return _Expression(value, self.generator.index(value), self.generator)
+        return _Expression(np.asarray(value), _number(value), self.generator, scalar=True, constant=True)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+
+        if method != '__call__' or kwargs or ufunc.nout != 1:
+            return NotImplemented
+
+        values = ufunc(*(np.asarray(i) for i in inputs))
+        operands = [self._wrap(i) for i in inputs]
+        scalar = all(o.scalar for o in operands)
+
+        if all(o.constant for o in operands) and values.size:
+            return _Expression(values, _number(values.flat[0]), self.generator, scalar=True, constant=True)
+
+        # the operations with zero and one
+        if len(operands) == 2:
+            a, b = operands
+            if ufunc is np.multiply and (_is(a, 0) or _is(b, 0)) and not values.any():
+                return _Expression(values, '0.0', self.generator, scalar=True, constant=True)
+            if ufunc is np.subtract and _is(a, 0):
+                return _negative(values, b)
+            if ufunc is np.multiply and _is(a, 1) or ufunc is np.add and _is(a, 0):
+                return _Expression(values, b.code, self.generator, scalar, atomic=b.atomic, negated=b.negated)
+            if ufunc in (np.multiply, np.true_divide) and _is(b, 1) or ufunc in (np.add, np.subtract) and _is(b, 0):
+                return _Expression(values, a.code, self.generator, scalar, atomic=a.atomic, negated=a.negated)
+
+        if ufunc in _OPERATORS and len(operands) == 2:
+            code = f"{operands[0].operand()} {_OPERATORS[ufunc]} {operands[1].operand()}"
+            return _Expression(values, code, self.generator, scalar, atomic=False)
+        if ufunc is np.negative:
+            return _negative(values, operands[0])
+        return _Expression(values, f"np.{ufunc.__name__}({', '.join(o.code for o in operands)})", self.generator,
+                           scalar)
+
+    def __array_function__(self, func, types, args, kwargs):
+
+        values = func(*_unwrap(args), **_unwrap(kwargs))
+
+        if func is np.bincount:
+            # the sums and the scattered values, see `_Vectorizer`
+            index = self.generator.index(args[0])
+            weights = self._wrap(kwargs['weights'])
+            size = kwargs['minlength']
+            if _is(weights, 0):
+                return _Expression(values, '0.0', self.generator, scalar=True, constant=True)
+            if weights.scalar:
+                return _Expression(values, f"{weights.operand()} * np.bincount({index}, minlength={size})",
+                                   self.generator, atomic=False)
+            return _Expression(values, f"np.bincount({index}, weights={weights.code}, minlength={size})",
+                               self.generator)
+
+        if func is np.concatenate:
+            operands = [self._wrap(a) for a in args[0]]
+            if all(o.scalar for o in operands) and len({o.code for o in operands}) == 1:
+                return _Expression(values, operands[0].code, self.generator, scalar=True,
+                                   constant=operands[0].constant, atomic=operands[0].atomic)
+            return _Expression(values, f"np.concatenate(({', '.join(o.array_code() for o in operands)}, ))",
+                               self.generator)
+
+        raise NotImplementedError(f"'{func.__name__}' is not supported in the generated code.")
+
+
+def _negative(values, expression):
+    """
+    The negation of an expression, without the double negations.
+    """
+    negated = expression.negated
+    if negated is not None:
+        return _Expression(values, negated.code, expression.generator, expression.scalar, atomic=negated.atomic)
+    return _Expression(values, f"- {expression.operand()}", expression.generator, expression.scalar,
+                       atomic=False, negated=expression)
+
+
+def _unwrap(value):
+    if isinstance(value, _Expression):
+        return value.values
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+def _is(expression, number):
+    """
+    Check if an expression is the given number.
+    """
+    if not expression.constant:
+        return False
+    if expression.values.size:
+        return (expression.values == number).all()
+    # e.g., the sums over no elements
+    return expression.code in (_number(number), _number(float(number)))
+
+
+def _is_number(values):
+    return values.size and (values == values.flat[0]).all()
+
+
+def _literal(values):
+    """
+    The code of a (nested) list of numbers.
+    """
+    if isinstance(values, list):
+        return '[' + ', '.join(_literal(v) for v in values) + ']'
+    return _number(values)
+
+
+def _number(v):
+    if isinstance(v, (bool, np.bool_)):
+        return repr(bool(v))
+    if isinstance(v, (int, np.integer)):
+        return repr(int(v))
+    if v == math.inf:
+        return 'np.inf'
+    if v == -math.inf:
+        return '-np.inf'
+    return repr(float(v))
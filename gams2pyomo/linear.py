@@ -0,0 +1,1244 @@
+"""
+This module compiles linear GAMS models (LP, MIP) into a sparse coefficient
+representation and writes them as LP or MPS files, without Pyomo.
+"""
+
+import logging
+import math
+from functools import reduce
+from itertools import product
+import numpy as np
+from lark import Tree
+from .components import (Symbol, SpecialIndex, ArithmeticExpression, BinaryExpression, ConditionalExpression,
+                         SumExpression, FuncExpression, evaluate, walk)
+from .execution import StatementExecutor
+
+logger = logging.getLogger('gams_translator.linear')
+
+_LINEAR_MODEL_TYPES = ('lp', 'mip', 'rmip')
+
+# the name of the objective row, as the objective of the generated code
+_OBJECTIVE = '_obj_'
+
+_SENSES = {
+    'eqn_equality': 'E',
+    'eqn_less_than': 'L',
+    'eqn_greater_than': 'G',
+}
+
+
+class LinearExpression:
+    """
+    A linear expression: a sparse dict of column index -> coefficient and a
+    constant. The arithmetic operations that would make the expression
+    nonlinear raise a ValueError.
+    """
+
+    __slots__ = ('terms', 'constant')
+
+    def __init__(self, terms=None, constant=0):
+        self.terms = {} if terms is None else terms
+        self.constant = constant
+
+    @staticmethod
+    def _simplify(terms, constant):
+        # drop the variables such that constant expressions are numbers
+        if terms:
+            return LinearExpression(terms, constant)
+        return constant
+
+    def _scale(self, factor):
+        return self._simplify({k: v * factor for k, v in self.terms.items()}, self.constant * factor)
+
+    def __add__(self, other):
+        if isinstance(other, LinearExpression):
+            terms = dict(self.terms)
+            for k, v in other.terms.items():
+                terms[k] = terms.get(k, 0) + v
+            return self._simplify(terms, self.constant + other.constant)
+        return LinearExpression(dict(self.terms), self.constant + other)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return self._scale(-1)
+
+    def __sub__(self, other):
+        return self + (- other)
+
+    def __rsub__(self, other):
+        return (- self) + other
+
+    def __mul__(self, other):
+        if isinstance(other, LinearExpression):
+            raise ValueError("the product of variables is nonlinear")
+        return self._scale(other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, LinearExpression):
+            raise ValueError("the division by a variable is nonlinear")
+        return self._scale(1 / other)
+
+    def __rtruediv__(self, other):
+        raise ValueError("the division by a variable is nonlinear")
+
+    def __pow__(self, other):
+        if other == 1:
+            return self
+        raise ValueError("the power of a variable is nonlinear")
+
+    def __rpow__(self, other):
+        raise ValueError("the exponent with a variable is nonlinear")
+
+    def __abs__(self):
+        raise ValueError("the absolute value of a variable is nonlinear")
+
+    def __bool__(self):
+        raise ValueError("variables cannot be used in conditions")
+
+
+def linear_sum(terms):
+    """
+    Sum up numbers and linear expressions in place.
+    """
+
+    res = LinearExpression()
+    for t in terms:
+        if isinstance(t, LinearExpression):
+            for k, v in t.terms.items():
+                res.terms[k] = res.terms.get(k, 0) + v
+            res.constant += t.constant
+        else:
+            res.constant += t
+    return LinearExpression._simplify(res.terms, res.constant)
+
+
+class LinearModel:
+    """
+    The sparse coefficient representation of a linear model.
+
+    Args:
+        name (str): The model name.
+        columns (list): The variable names, e.g., `x(seattle,chicago)`.
+        lower (list): The lower bounds of the variables.
+        upper (list): The upper bounds of the variables.
+        integer (list): Whether the variables are integer.
+        rows (list): The constraint names.
+        coefficients (list): The coefficients of the rows in COO format, as
+            arrays of row indices, column indices, and coefficients, one
+            triplet per group of rows added together (see `add_rows`).
+        senses (list): The row senses, 'E', 'L', or 'G'.
+        rhs (list): The right-hand sides of the rows.
+        objective (dict): The objective coefficients by column index.
+        maximize (bool): Whether the objective is maximized.
+        variable_blocks (dict): Variable name -> the index of its first
+            column and the keys of its elements (None for scalars); the
+            columns of a variable are consecutive.
+        equation_blocks (dict): Equation name -> the range of its rows.
+    """
+
+    def __init__(self, name=''):
+        self.name = name
+        self.columns = []
+        self.lower = []
+        self.upper = []
+        self.integer = []
+        self.rows = []
+        self.coefficients = []
+        self.senses = []
+        self.rhs = []
+        self.objective = {}
+        self.maximize = False
+        self.variable_blocks = {}
+        self.equation_blocks = {}
+
+    def add_column(self, name, lower=-math.inf, upper=math.inf, integer=False):
+        self.columns.append(name)
+        self.lower.append(lower)
+        self.upper.append(upper)
+        self.integer.append(integer)
+        return len(self.columns) - 1
+
+    def add_rows(self, names, row, col, data, sense, rhs):
+        """
+        Add rows with the same sense.
+
+        Args:
+            names (list): The row names.
+            row (numpy.ndarray): The row indices of the coefficients, from 0
+                for the first added row, in increasing order.
+            col (numpy.ndarray): The column indices of the coefficients.
+            data (numpy.ndarray): The coefficients.
+            sense (str): 'E', 'L', or 'G'.
+            rhs (numpy.ndarray): The right-hand sides.
+        """
+
+        start = len(self.rows)
+        self.rows.extend(names)
+        self.senses.extend([sense] * len(names))
+        self.rhs.extend(np.asarray(rhs, dtype=float).tolist())
+        self.coefficients.append((np.asarray(row, dtype=np.int64) + start,
+                                  np.asarray(col, dtype=np.int64),
+                                  np.asarray(data, dtype=float)))
+
+    def _coo(self):
+        """
+        The coefficients of all the rows in COO format, ordered by row.
+        """
+
+        if not self.coefficients:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return tuple(np.concatenate(a) for a in zip(*self.coefficients))
+
+    def row_terms(self):
+        """
+        The coefficients by row.
+
+        Returns:
+            list: The column indices and the coefficients of each row, as two
+                lists.
+        """
+
+        row, col, data = self._coo()
+        bounds = np.searchsorted(row, np.arange(len(self.rows) + 1)).tolist()
+        col, data = col.tolist(), data.tolist()
+        return [(col[a:b], data[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def write(self, file, format=None):
+        """
+        Write the model into a file.
+
+        Args:
+            file (str or file object): The file path or a text file object.
+            format (str, optional): 'lp' or 'mps'. Defaults to the extension
+                of the file path.
+        """
+
+        if format is None:
+            format = str(file).rsplit('.', 1)[-1].lower()
+        if format not in ('lp', 'mps'):
+            raise ValueError(f"Unknown file format: '{format}'.")
+
+        writer = self.write_lp if format == 'lp' else self.write_mps
+
+        if isinstance(file, str):
+            with open(file, 'w') as f:
+                writer(f)
+        else:
+            writer(file)
+
+    def write_lp(self, f):
+        """
+        Write the model in the CPLEX LP format, line by line.
+        """
+
+        columns = self.columns
+
+        f.write(f"\\ Problem name: {self.name}\n\n")
+        f.write("maximize\n" if self.maximize else "minimize\n")
+        f.write(f" {_OBJECTIVE}:")
+        _write_lp_terms(f, list(self.objective), list(self.objective.values()), columns)
+        f.write("\n\nsubject to\n")
+
+        _lp_senses = {'E': '=', 'L': '<=', 'G': '>='}
+        for name, (col, data), sense, rhs in zip(self.rows, self.row_terms(), self.senses, self.rhs):
+            f.write(f" {name}:")
+            _write_lp_terms(f, col, data, columns)
+            f.write(f" {_lp_senses[sense]} {_number(rhs)}\n")
+
+        f.write("\nbounds\n")
+        for name, lb, ub in zip(columns, self.lower, self.upper):
+            if lb == -math.inf and ub == math.inf:
+                f.write(f" {name} free\n")
+            elif lb == ub:
+                f.write(f" {name} = {_number(lb)}\n")
+            elif lb != 0 or ub != math.inf:
+                f.write(f" {_number(lb)} <= {name} <= {_number(ub)}\n")
+
+        integers = [name for name, i in zip(columns, self.integer) if i]
+        if integers:
+            f.write("\ngenerals\n")
+            for name in integers:
+                f.write(f" {name}\n")
+
+        f.write("\nend\n")
+
+    def write_mps(self, f):
+        """
+        Write the model in the free MPS format, line by line.
+        """
+
+        f.write(f"NAME {self.name.replace(' ', '_') or 'model'}\n")
+        f.write("OBJSENSE\n    MAX\n" if self.maximize else "OBJSENSE\n    MIN\n")
+
+        f.write(f"ROWS\n N  {_OBJECTIVE}\n")
+        for name, sense in zip(self.rows, self.senses):
+            f.write(f" {sense}  {name}\n")
+
+        # the coefficients are written by column
+        by_column = [[] for _ in self.columns]
+        for k, c in self.objective.items():
+            by_column[k].append((_OBJECTIVE, c))
+        row, col, data = self._coo()
+        for k, r, c in zip(col.tolist(), row.tolist(), data.tolist()):
+            by_column[k].append((self.rows[r], c))
+
+        f.write("COLUMNS\n")
+        integer = False
+        for name, entries, is_integer in zip(self.columns, by_column, self.integer):
+            if is_integer != integer:
+                marker = 'INTORG' if is_integer else 'INTEND'
+                f.write(f"    MARKER  'MARKER'  '{marker}'\n")
+                integer = is_integer
+            if not entries:
+                # the column should be declared even without coefficients
+                entries = [(_OBJECTIVE, 0)]
+            for row, c in entries:
+                f.write(f"    {name}  {row}  {_number(c)}\n")
+        if integer:
+            f.write("    MARKER  'MARKER'  'INTEND'\n")
+
+        f.write("RHS\n")
+        for name, rhs in zip(self.rows, self.rhs):
+            if rhs != 0:
+                f.write(f"    RHS  {name}  {_number(rhs)}\n")
+
+        f.write("BOUNDS\n")
+        for name, lb, ub in zip(self.columns, self.lower, self.upper):
+            if lb == ub:
+                f.write(f" FX BND  {name}  {_number(lb)}\n")
+                continue
+            if lb == -math.inf:
+                f.write(f" MI BND  {name}\n")
+            elif lb != 0:
+                f.write(f" LO BND  {name}  {_number(lb)}\n")
+            if ub != math.inf:
+                f.write(f" UP BND  {name}  {_number(ub)}\n")
+
+        f.write("ENDATA\n")
+
+    def to_matrices(self):
+        """
+        Convert the model into the matrix form: minimize or maximize `c @ x`
+        subject to `A @ x (senses) b` and `lower <= x <= upper`.
+
+        The coefficients are concatenated from the arrays of the rows (see
+        `add_rows`).
+
+        Returns:
+            MatrixModel: The model in the matrix form.
+        """
+
+        row, col, data = self._coo()
+
+        c = np.zeros(len(self.columns))
+        if self.objective:
+            c[list(self.objective)] = list(self.objective.values())
+
+        return MatrixModel(
+            name=self.name,
+            c=c,
+            data=data, row=row, col=col,
+            senses=np.array(self.senses, dtype='<U1'),
+            b=np.array(self.rhs, dtype=float),
+            lower=np.array(self.lower, dtype=float),
+            upper=np.array(self.upper, dtype=float),
+            integer=np.array(self.integer, dtype=bool),
+            rows=list(self.rows),
+            columns=list(self.columns),
+            maximize=self.maximize,
+        )
+
+
+class MatrixModel:
+    """
+    A linear model in the matrix form: minimize or maximize `c @ x` subject to
+    `A @ x (senses) b` and `lower <= x <= upper`, where the senses are 'E',
+    'L', or 'G'.
+
+    The constraint matrix is kept in COO format (`data`, `row`, `col`), which
+    `coo` and `csr` convert into SciPy sparse matrices.
+
+    Args:
+        name (str): The model name.
+        c (numpy.ndarray): The objective coefficients.
+        data (numpy.ndarray): The nonzero coefficients of the constraints.
+        row (numpy.ndarray): The row indices of the coefficients.
+        col (numpy.ndarray): The column indices of the coefficients.
+        senses (numpy.ndarray): The row senses.
+        b (numpy.ndarray): The right-hand sides.
+        lower (numpy.ndarray): The lower bounds of the variables.
+        upper (numpy.ndarray): The upper bounds of the variables.
+        integer (numpy.ndarray): Whether the variables are integer.
+        rows (list): The row names, e.g., `supply(seattle)`.
+        columns (list): The column names, e.g., `x(seattle,chicago)`.
+        maximize (bool): Whether the objective is maximized.
+    """
+
+    def __init__(self, name, c, data, row, col, senses, b, lower, upper, integer, rows, columns,
+                 maximize=False):
+        self.name = name
+        self.c = c
+        self.data = data
+        self.row = row
+        self.col = col
+        self.senses = senses
+        self.b = b
+        self.lower = lower
+        self.upper = upper
+        self.integer = integer
+        self.rows = rows
+        self.columns = columns
+        self.maximize = maximize
+
+        # name -> index
+        self.row_index = {name: i for i, name in enumerate(rows)}
+        self.column_index = {name: i for i, name in enumerate(columns)}
+
+    @property
+    def shape(self):
+        return len(self.rows), len(self.columns)
+
+    def coo(self):
+        """
+        The constraint matrix as a `scipy.sparse.coo_matrix`.
+        """
+        from scipy.sparse import coo_matrix
+        return coo_matrix((self.data, (self.row, self.col)), shape=self.shape)
+
+    def csr(self):
+        """
+        The constraint matrix as a `scipy.sparse.csr_matrix`.
+        """
+        return self.coo().tocsr()
+
+    def inequality_form(self):
+        """
+        Split the constraints into `A_ub @ x <= b_ub` and `A_eq @ x == b_eq`,
+        e.g., for `scipy.optimize.linprog`. The 'G' rows are negated.
+
+        Returns:
+            tuple: `A_ub`, `b_ub`, `A_eq`, and `b_eq`; the matrices are in CSR
+                format.
+        """
+
+        A = self.csr()
+        sign = np.where(self.senses == 'G', -1.0, 1.0)
+        A = A.multiply(sign[:, None]).tocsr()
+        b = self.b * sign
+
+        eq = self.senses == 'E'
+        return A[~eq], b[~eq], A[eq], b[eq]
+
+    def save(self, file):
+        """
+        Save the model into a NumPy `.npz` file, with the matrix in COO
+        format and the names as string arrays.
+        """
+
+        np.savez(file, c=self.c, data=self.data, row=self.row, col=self.col,
+                 shape=np.array(self.shape), senses=self.senses, b=self.b,
+                 lower=self.lower, upper=self.upper, integer=self.integer,
+                 rows=np.array(self.rows, dtype=str), columns=np.array(self.columns, dtype=str),
+                 maximize=self.maximize)
+
+
+def _number(v):
+    if v == math.inf:
+        return '+inf'
+    if v == -math.inf:
+        return '-inf'
+    # the integral coefficients without the decimal point
+    res = repr(float(v))
+    return res[:-2] if res.endswith('.0') else res
+
+
+def _write_lp_terms(f, col, data, columns):
+    """
+    Write the terms of a linear expression, a few terms per line.
+    """
+    if not col:
+        # a row should have at least one term
+        f.write(f" 0 {columns[0]}")
+        return
+    for n, (k, c) in enumerate(zip(col, data)):
+        if n and n % 8 == 0:
+            f.write("\n   ")
+        f.write(f" {'-' if c < 0 else '+'} {_number(abs(c))} {columns[k]}")
+
+
+def _name(symbol_name, key):
+    """
+    The name of a variable or constraint element, e.g., `x(seattle,chicago)`.
+    """
+    if key is None:
+        return symbol_name
+    if not isinstance(key, tuple):
+        key = (key, )
+    return symbol_name + '(' + ','.join(str(k).replace(' ', '_') for k in key) + ')'
+
+
+class _Rows:
+    """
+    The rows of a vectorized evaluation: the positions of the elements of the
+    controlled indices in their sets, one entry per row.
+    """
+
+    __slots__ = ('positions', 'size')
+
+    def __init__(self, positions, size):
+        self.positions = positions
+        self.size = size
+
+    def subset(self, index):
+        """
+        The rows selected by an index array or a mask.
+        """
+        positions = {k: v[index] for k, v in self.positions.items()}
+        size = int(np.count_nonzero(index)) if index.dtype == bool else len(index)
+        return _Rows(positions, size)
+
+
+class _Terms:
+    """
+    The linear expressions of the rows of a vectorized evaluation, in COO
+    format: the terms `coef * x[col]` of the rows `row`, and the constants of
+    all the rows.
+    """
+
+    __slots__ = ('row', 'col', 'coef', 'constant')
+
+    def __init__(self, row, col, coef, constant):
+        self.row = row
+        self.col = col
+        self.coef = coef
+        self.constant = constant
+
+    def __neg__(self):
+        return _Terms(self.row, self.col, - self.coef, - self.constant)
+
+    def scale(self, factor):
+        return _Terms(self.row, self.col, self.coef * factor[self.row], self.constant * factor)
+
+
+def _add(a, b):
+    if not isinstance(a, _Terms):
+        a, b = b, a
+    if not isinstance(a, _Terms):
+        return a + b
+    if not isinstance(b, _Terms):
+        return _Terms(a.row, a.col, a.coef, a.constant + b)
+    return _Terms(np.concatenate((a.row, b.row)), np.concatenate((a.col, b.col)),
+                  np.concatenate((a.coef, b.coef)), a.constant + b.constant)
+
+
+def _multiply(a, b):
+    if isinstance(a, _Terms) and isinstance(b, _Terms):
+        raise NotImplementedError("the product of variables is nonlinear")
+    if isinstance(a, _Terms):
+        return a.scale(b)
+    if isinstance(b, _Terms):
+        return b.scale(a)
+    return a * b
+
+
+def _divide(a, b):
+    if isinstance(b, _Terms):
+        raise NotImplementedError("the division by a variable is nonlinear")
+    if not b.all():
+        # the error is raised element by element
+        raise NotImplementedError("division by zero")
+    if isinstance(a, _Terms):
+        return a.scale(1 / b)
+    return a / b
+
+
+def _power(a, b):
+    if isinstance(b, _Terms):
+        raise NotImplementedError("the exponent with a variable is nonlinear")
+    if isinstance(a, _Terms):
+        if (b == 1).all():
+            return a
+        raise NotImplementedError("the power of a variable is nonlinear")
+    fractional = b != np.floor(b)
+    if ((a < 0) & fractional).any() or ((a == 0) & (b < 0)).any():
+        raise NotImplementedError("the power is not real")
+    return a ** b
+
+
+def _on_data(operation):
+    """
+    An operation on data only, e.g., a comparison.
+    """
+    def apply(*operands):
+        if any(isinstance(o, _Terms) for o in operands):
+            raise NotImplementedError("variables cannot be used in conditions")
+        return operation(*operands).astype(float)
+    return apply
+
+
+def _grid(sizes):
+    """
+    The positions of all the combinations of elements of sets with the given
+    sizes, in the order of `itertools.product`, one array per set.
+    """
+    return np.indices(sizes, dtype=np.int64).reshape(len(sizes), math.prod(sizes))
+
+
+def _round_array(x, decimals=0):
+    # the halves away from zero, see `_round` in the expressions
+    scale = 10.0 ** decimals
+    return np.copysign(np.floor(np.abs(x) * scale + 0.5) / scale, x)
+
+
+# the operations of the vectorized evaluation, by the operators of
+# `ArithmeticExpression` and `BinaryExpression`
+_ARRAY_OPERATIONS = {
+    '+': _add,
+    '-': lambda a, b: _add(a, - b),
+    '*': _multiply,
+    '/': _divide,
+    '**': _power,
+    'addition': _add,
+    'subtraction': lambda a, b: _add(a, - b),
+    'multiplication': _multiply,
+    'division': _divide,
+    'exponentiation': _power,
+    'rel_le': _on_data(np.less_equal),
+    'rel_ge': _on_data(np.greater_equal),
+    'rel_eq': _on_data(np.equal),
+    'rel_ne': _on_data(np.not_equal),
+    'rel_eq_macro': _on_data(np.equal),
+    'abs_gt': _on_data(np.greater),
+    'abs_lt': _on_data(np.less),
+    'bool_and': _on_data(lambda a, b: (a != 0) & (b != 0)),
+    'bool_or': _on_data(lambda a, b: (a != 0) | (b != 0)),
+    'bool_xor': _on_data(lambda a, b: (a != 0) != (b != 0)),
+}
+
+# the functions of the vectorized evaluation, on data only
+_ARRAY_FUNCTIONS = {
+    'fn_abs': np.abs,
+    'fn_arccos': np.arccos,
+    'fn_arcsin': np.arcsin,
+    'fn_arctan': np.arctan,
+    'fn_ceil': np.ceil,
+    'fn_cos': np.cos,
+    'fn_cosh': np.cosh,
+    'fn_exp': np.exp,
+    'fn_floor': np.floor,
+    'fn_sin': np.sin,
+    'fn_sinh': np.sinh,
+    'fn_tan': np.tan,
+    'fn_tanh': np.tanh,
+    'fn_log': np.log,
+    'fn_log10': np.log10,
+    'fn_log2': np.log2,
+    'fn_sqrt': np.sqrt,
+    'fn_sqr': np.square,
+    'fn_power': _power,
+    'fn_round': _round_array,
+    'fn_max': lambda *a: reduce(np.maximum, a),
+    'fn_min': lambda *a: reduce(np.minimum, a),
+}
+
+
+class _Vectorizer:
+    """
+    Evaluate the equations for all the elements of their indices at once, as
+    NumPy arrays over the rows: the indices are arrays of element positions,
+    the conditions and the lead/lag operations out of the sets are masks, and
+    the sums repeat the rows for the elements of their indices.
+
+    The expressions that are not supported raise a NotImplementedError, and
+    the equation is evaluated element by element instead; the errors of the
+    equation (e.g., nonlinear terms) are raised that way.
+
+    Args:
+        container (ComponentContainer): The container with the values of the
+            sets and parameters.
+        variables (dict): Variable name -> column index, or dict of element
+            -> column index (see `LinearModelBuilder`).
+        domains (dict): Variable name -> the index of its first column and
+            the sets of its indices; the columns are in the order of the
+            elements of the sets.
+    """
+
+    def __init__(self, container, variables, domains):
+
+        self.container = container
+        self.variables = variables
+        self.domains = domains
+
+        # set name -> element -> position
+        self._positions = {}
+        # (symbol name, sets) -> the sorted keys and the values of the symbol
+        self._tables = {}
+
+    def rows(self, equation):
+        """
+        The rows of the elements of the equation indices for which the
+        equation is generated (see `StatementExecutor.is_generated`).
+
+        Returns:
+            _Rows: The rows, in the order of `StatementExecutor.equation_scopes`.
+        """
+
+        index_list = equation.index_list or []
+        sizes = [len(self._elements(_idx)) for _idx in index_list]
+        rows = _Rows(dict(zip(index_list, _grid(sizes))), math.prod(sizes))
+
+        mask = np.ones(rows.size, dtype=bool)
+        if equation.condition is not None:
+            mask &= self._condition(equation.condition, rows)
+        for e in walk([equation.lhs, equation.rhs]):
+            if isinstance(e, SpecialIndex) and e.index in index_list:
+                mask &= self._shift(e, rows)[1]
+
+        return rows.subset(mask)
+
+    def keys(self, equation, rows):
+        """
+        The keys of the rows (None for scalar equations).
+        """
+
+        index_list = equation.index_list or []
+        if not index_list:
+            return [None] * rows.size
+        columns = [[elements[p] for p in rows.positions[_idx].tolist()]
+                   for _idx, elements in zip(index_list, map(self._elements, index_list))]
+        if len(columns) == 1:
+            return columns[0]
+        return list(zip(*columns))
+
+    def evaluate(self, node, rows):
+        """
+        Evaluate an expression for the rows.
+
+        Returns:
+            numpy.ndarray or _Terms: The values of the rows, or their linear
+                expressions if they have variables.
+        """
+
+        if isinstance(node, bool):
+            node = int(node)
+        if isinstance(node, (int, float)):
+            return self._full(node, rows.size)
+
+        if isinstance(node, Symbol):
+            res = self._symbol(node, rows)
+        elif isinstance(node, ArithmeticExpression):
+            res = self._operation(node.operator, node.operand_1, node.operand_2, rows)
+        elif isinstance(node, BinaryExpression):
+            if not isinstance(node.operator, Tree):
+                raise NotImplementedError
+            res = self._operation(node.operator.data, node.operand_1, node.operand_2, rows)
+        elif isinstance(node, ConditionalExpression):
+            res = self._where(node.condition.children[0], node.expression, rows)
+        elif isinstance(node, SumExpression):
+            res = self._sum(node, rows)
+        elif isinstance(node, FuncExpression):
+            res = self._function(node, rows)
+        else:
+            raise NotImplementedError(f"{type(node).__name__} is not vectorized.")
+
+        if node.minus:
+            res = - res
+        if node.negate:
+            res = _on_data(lambda v: v == 0)(res)
+        return res
+
+    def _elements(self, idx):
+
+        _set = self.container.index_set(idx)
+        if not _set:
+            raise NotImplementedError(f"The elements of '{idx}' are not known.")
+        return self.container.set_elements[_set]
+
+    def _condition(self, node, rows):
+
+        res = self.evaluate(node, rows)
+        if isinstance(res, _Terms):
+            raise NotImplementedError("variables cannot be used in conditions")
+        return np.asarray(res) != 0
+
+    def _shift(self, special, rows):
+        """
+        The positions of a lead/lag operation, and whether they are in the
+        set.
+        """
+
+        if special.index not in rows.positions or not isinstance(special.value, int):
+            raise NotImplementedError(f"The index '{special.index}' is not controlled.")
+
+        n = len(self._elements(special.index))
+        positions = rows.positions[special.index]
+        if special.type in ('lead', 'circular_lead'):
+            positions = positions + special.value
+        else:
+            positions = positions - special.value
+
+        if special.type.startswith('circular'):
+            return positions % n, np.ones(rows.size, dtype=bool)
+        valid = (positions >= 0) & (positions < n)
+        return np.where(valid, positions, 0), valid
+
+    def _symbol(self, symbol, rows):
+
+        name = symbol.name
+        container = self.container
+
+        if symbol.suffix or name not in container.values:
+            raise NotImplementedError(f"The value of '{symbol!r}' is not known at translation time.")
+
+        values = self.variables.get(name, container.values[name])
+
+        if not isinstance(values, dict):
+            if symbol.index_list:
+                raise NotImplementedError(f"The scalar '{name}' is indexed.")
+            if name in self.variables:
+                return _Terms(np.arange(rows.size), np.full(rows.size, values, dtype=np.int64),
+                              self._full(1, rows.size), self._full(0, rows.size))
+            if not isinstance(values, (int, float)):
+                raise NotImplementedError(f"The value of '{name}' is not a number.")
+            return self._scalar(name, values, rows)
+
+        if not symbol.index_list:
+            raise NotImplementedError(f"The indices of '{name}' are missing.")
+
+        # the positions of the elements of the indices
+        sets, positions = [], []
+        valid = np.ones(rows.size, dtype=bool)
+        for _idx in symbol.index_list:
+            if isinstance(_idx, SpecialIndex):
+                p, v = self._shift(_idx, rows)
+                valid &= v
+                _set = container.index_set(_idx.index)
+            elif isinstance(_idx, str) and _idx in rows.positions:
+                p = rows.positions[_idx]
+                _set = container.index_set(_idx)
+            elif container.index_set(_idx):
+                raise NotImplementedError(f"The index '{_idx}' is not controlled.")
+            else:
+                # a specific element
+                p = np.zeros(rows.size, dtype=np.int64)
+                _set = (_idx, )
+            sets.append(_set)
+            positions.append(p)
+
+        if name in self.variables:
+            return self._variable(name, tuple(sets), positions, valid, rows)
+        return self._parameter(name, tuple(sets), positions, valid, rows)
+
+    def _full(self, value, size):
+        """
+        An array of a constant.
+        """
+        return np.full(size, float(value))
+
+    def _scalar(self, name, value, rows):
+        """
+        The value of a scalar parameter for the rows.
+        """
+        return self._full(value, rows.size)
+
+    def _lookup(self, name, sets, positions, valid):
+        """
+        Find the entries of a parameter or variable on the elements of the
+        sets at the positions.
+
+        Returns:
+            tuple: Whether the entries are found, and their indices in the
+                table of the symbol (see `_table`).
+        """
+
+        keys, _ = self._table(name, sets)
+        sizes = [len(self._set_positions(s)) for s in sets]
+        key = np.ravel_multi_index(positions, sizes)
+
+        k = np.minimum(np.searchsorted(keys, key), max(len(keys) - 1, 0))
+        if not len(keys):
+            return np.zeros(len(key), dtype=bool), k
+        return valid & (keys[k] == key), k
+
+    def _parameter(self, name, sets, positions, valid, rows):
+        """
+        The values of a parameter at the positions of the elements of its
+        indices, for the rows.
+        """
+
+        # GAMS uses zero for the missing entries
+        found, k = self._lookup(name, sets, positions, valid)
+        _, table = self._table(name, sets)
+        return np.where(found, table[k] if len(table) else 0, 0.0)
+
+    def _variable(self, name, sets, positions, valid, rows):
+        """
+        The terms of a variable at the positions of the elements of its
+        indices, for the rows.
+        """
+
+        # the columns of a variable over its sets are consecutive
+        if name in self.domains and self.domains[name][1] == sets:
+            sizes = [len(self._set_positions(s)) for s in sets]
+            row = np.flatnonzero(valid)
+            col = self.domains[name][0] + np.ravel_multi_index([p[row] for p in positions], sizes)
+        else:
+            found, k = self._lookup(name, sets, positions, valid)
+            _, table = self._table(name, sets)
+            row = np.flatnonzero(found)
+            col = table[k[row]]
+
+        return _Terms(row, col, self._full(1, len(row)), self._full(0, rows.size))
+
+    def _set_positions(self, _set):
+        """
+        Element -> position of a set, or of a specific element.
+        """
+
+        if _set not in self._positions:
+            elements = _set if isinstance(_set, tuple) else self.container.set_elements[_set]
+            self._positions[_set] = {e: p for p, e in enumerate(elements)}
+        return self._positions[_set]
+
+    def _table(self, name, sets):
+        """
+        The entries of a parameter or variable on the elements of the sets,
+        as the sorted keys of their positions and the values.
+        """
+
+        if (name, sets) not in self._tables:
+
+            values = self.variables.get(name, self.container.values[name])
+            positions = [self._set_positions(s) for s in sets]
+            sizes = [len(p) for p in positions]
+            if math.prod(sizes) >= 2 ** 63:
+                raise NotImplementedError(f"The sets of '{name}' are too large.")
+
+            items = values.items()
+            if len(sets) > 1:
+                # the other keys are never found, as in `Symbol.evaluate`
+                items = [(k, v) for k, v in items if isinstance(k, tuple) and len(k) == len(sets)]
+            n = len(items)
+            keys, table = zip(*items) if n else ((), ())
+
+            # the positions of the elements of the keys, by index; the
+            # entries out of the sets are left out
+            elements = [keys] if len(sets) == 1 else list(zip(*keys)) if n else [()] * len(sets)
+            keys = [np.fromiter((p.get(e, -1) for e in column), dtype=np.int64, count=n)
+                    for p, column in zip(positions, elements)]
+            found = np.logical_and.reduce([k >= 0 for k in keys])
+            keys = np.ravel_multi_index([k[found] for k in keys], sizes)
+
+            try:
+                table = np.fromiter(table, dtype=np.int64 if name in self.variables else float, count=n)[found]
+            except (TypeError, ValueError) as e:
+                raise NotImplementedError(f"The values of '{name}' are not numbers.") from e
+            order = np.argsort(keys)
+            self._tables[name, sets] = keys[order], table[order]
+
+        return self._tables[name, sets]
+
+    def _operation(self, operator, operand_1, operand_2, rows):
+
+        if operator not in _ARRAY_OPERATIONS:
+            raise NotImplementedError(f"The operator '{operator}' is not vectorized.")
+        return _ARRAY_OPERATIONS[operator](self.evaluate(operand_1, rows), self.evaluate(operand_2, rows))
+
+    def _where(self, condition, node, rows):
+        """
+        The expression for the rows where the condition holds, and zero for
+        the other rows.
+        """
+
+        index = np.flatnonzero(self._condition(condition, rows))
+        res = self.evaluate(node, rows.subset(index))
+
+        # the rows are unique, the counts scatter the values
+        if isinstance(res, _Terms):
+            return _Terms(index[res.row], res.col, res.coef,
+                          np.bincount(index, weights=res.constant, minlength=rows.size))
+        return np.bincount(index, weights=res, minlength=rows.size)
+
+    def _sum(self, node, rows):
+        """
+        Sum up the expression over the elements of the indices: the rows are
+        repeated for each combination of the elements.
+        """
+
+        if not all(isinstance(_idx, str) for _idx in node.idx):
+            raise NotImplementedError("The sum indices are not vectorized.")
+
+        sizes = [len(self._elements(_idx)) for _idx in node.idx]
+        n = math.prod(sizes)
+
+        positions = {k: np.repeat(v, n) for k, v in rows.positions.items()}
+        positions.update({_idx: np.tile(g, rows.size) for _idx, g in zip(node.idx, _grid(sizes))})
+        terms = _Rows(positions, rows.size * n)
+        parent = np.repeat(np.arange(rows.size), n)
+
+        if node.condition is not None:
+            index = np.flatnonzero(self._condition(node.condition, terms))
+            terms, parent = terms.subset(index), parent[index]
+
+        res = self.evaluate(node.exp, terms)
+
+        if isinstance(res, _Terms):
+            # the terms in the order of the elements, as in `linear_sum`
+            order = np.argsort(res.row, kind='stable')
+            return _Terms(parent[res.row[order]], res.col[order], res.coef[order],
+                          np.bincount(parent, weights=res.constant, minlength=rows.size))
+        return np.bincount(parent, weights=res, minlength=rows.size)
+
+    def _function(self, node, rows):
+
+        op = node.operator.data
+        o = node.operands if isinstance(node.operands, list) else [node.operands]
+
+        if op == 'fn_ord':
+            if not isinstance(o[0], Symbol) or o[0].name not in rows.positions:
+                raise NotImplementedError("The index of ord is not controlled.")
+            self._elements(o[0].name)
+            return rows.positions[o[0].name] + 1.0
+        if op == 'fn_card':
+            if not isinstance(o[0], Symbol):
+                raise NotImplementedError("The operand of card is not a set.")
+            return self._full(len(self._elements(o[0].name)), rows.size)
+        if op not in _ARRAY_FUNCTIONS:
+            raise NotImplementedError(f"The function '{op}' is not vectorized.")
+
+        operands = [self.evaluate(_o, rows) for _o in o]
+        if any(isinstance(_o, _Terms) for _o in operands):
+            if op == 'fn_power':
+                return _power(*operands)
+            raise NotImplementedError(f"The function '{op}' of variables is nonlinear.")
+        with np.errstate(all='ignore'):
+            res = _ARRAY_FUNCTIONS[op](*operands)
+        if not np.isfinite(res).all():
+            # e.g., the logarithm of zero
+            raise NotImplementedError(f"The function '{op}' is not defined for all the rows.")
+        return res
+
+
+class LinearModelBuilder(StatementExecutor):
+    """
+    Compile the linear model of the first solve statement into a
+    `LinearModel`, without Pyomo.
+
+    The statements are executed as in `StatementExecutor`. The rows of an
+    equation are built for all the elements of its indices at once with
+    NumPy arrays (see `_Vectorizer`). The equations with other expressions
+    are evaluated one row at a time: the variables are entered in the
+    container as `LinearExpression` of their columns, such that the equations
+    evaluate to linear expressions. Nonlinear equations and model types raise
+    a ValueError.
+
+    Args:
+        container (ComponentContainer): The container with the root statements
+            (see `GAMSTransformer` with `assemble=False`).
+    """
+
+    def __init__(self, container):
+
+        super().__init__(container)
+
+        self.model = LinearModel()
+        # the solve statement of the model
+        self.solve = None
+        # variable name -> column index, or dict of element -> column index
+        self.variables = {}
+        # variable name -> the index of its first column and its sets
+        self.domains = {}
+        self._vectorizer = _Vectorizer(container, self.variables, self.domains)
+
+        container.math_functions['sum'] = linear_sum
+
+    def build(self):
+        """
+        Build the linear model.
+
+        Returns:
+            LinearModel: The model of the first solve statement.
+        """
+
+        solve = self.solve = self.run()
+
+        if solve is None:
+            raise ValueError("No solve statement found.")
+        if solve.type.lower() not in _LINEAR_MODEL_TYPES:
+            raise ValueError(f"The model '{solve.name}' is solved as '{solve.type}', which is not a linear model type.")
+
+        model = self.model
+        model.name = self.container.model_title or solve.name
+        model.maximize = solve.sense == 'maximizing'
+
+        objective = self.container.values[solve.obj_var]
+        if isinstance(objective, dict) or not isinstance(objective, LinearExpression):
+            raise ValueError(f"The objective '{solve.obj_var}' should be a scalar variable.")
+        model.objective = dict(objective.terms)
+
+        for equation in self.model_equations(solve):
+            self._build_equation(equation)
+
+        return model
+
+    def _declare_variable(self, definition):
+
+        name = definition.symbol.name
+        model = self.model
+
+        if definition.type == 'p_variable':
+            lower, upper, integer = 0, math.inf, False
+        elif definition.type == 'b_variable':
+            lower, upper, integer = 0, 1, True
+        else:
+            lower, upper, integer = -math.inf, math.inf, False
+
+        # the declaration updates the domain
+        if name in self.variables:
+            columns = self.variables[name]
+            for k in (columns.values() if isinstance(columns, dict) else [columns]):
+                model.lower[k], model.upper[k], model.integer[k] = lower, upper, integer
+            return
+
+        index_list = definition.symbol.index_list
+        if not index_list:
+            k = model.add_column(name, lower, upper, integer)
+            model.variable_blocks[name] = (k, None)
+            self.variables[name] = k
+            self.container.values[name] = LinearExpression({k: 1})
+            return
+
+        set_names, sets = [], []
+        for _idx in index_list:
+            _set = self.container.index_set(_idx)
+            if not _set:
+                raise NotImplementedError(f"The elements of '{_idx}' are not known.")
+            set_names.append(_set)
+            sets.append(self.container.set_elements[_set])
+
+        columns = {}
+        values = {}
+        start = len(model.columns)
+        for elements in product(*sets):
+            key = elements[0] if len(elements) == 1 else elements
+            k = columns[key] = model.add_column(_name(name, key), lower, upper, integer)
+            values[key] = LinearExpression({k: 1})
+        model.variable_blocks[name] = (start, list(columns))
+        self.variables[name] = columns
+        self.domains[name] = (start, tuple(set_names))
+        self.container.values[name] = values
+
+    def _set_variable_attribute(self, symbol, key, value):
+
+        columns = self.variables.get(symbol.name)
+        if columns is None:
+            raise NotImplementedError(f"The attribute of '{symbol!r}' is not supported.")
+        k = columns if key is None else columns[key]
+
+        model = self.model
+        if symbol.suffix == 'lo':
+            model.lower[k] = value
+        elif symbol.suffix == 'up':
+            model.upper[k] = value
+        elif symbol.suffix == 'fx':
+            model.lower[k] = model.upper[k] = value
+        # the levels are not part of the model
+
+    def _build_equation(self, equation):
+
+        try:
+            rows = self._vectorized_rows(equation)
+        except NotImplementedError as e:
+            logger.info(f"The rows of '{equation.name}' are built element by element: {e}")
+            rows = self._element_rows(equation)
+
+        start = len(self.model.rows)
+        self.model.add_rows(*rows)
+        self.model.equation_blocks[equation.name] = range(start, len(self.model.rows))
+
+    def _vectorized_rows(self, equation):
+        """
+        Build the rows of an equation for all the elements at once (see
+        `_Vectorizer`).
+
+        Returns:
+            tuple: The arguments of `LinearModel.add_rows`.
+        """
+
+        vectorizer = self._vectorizer
+        sense = _SENSES[equation.eq_sign]
+
+        rows = vectorizer.rows(equation)
+        expression = _add(vectorizer.evaluate(equation.lhs, rows), - vectorizer.evaluate(equation.rhs, rows))
+        if not isinstance(expression, _Terms):
+            expression = _Terms(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), expression)
+
+        keys = vectorizer.keys(equation, rows)
+        constant = np.asarray(expression.constant)
+
+        # the rows without variables hold or not
+        has_terms = np.bincount(expression.row, minlength=rows.size) > 0
+        infeasible = {'E': constant != 0, 'L': constant > 0, 'G': constant < 0}[sense] & ~has_terms
+        if infeasible.any():
+            raise ValueError(f"The equation '{_name(equation.name, keys[int(np.argmax(infeasible))])}' is infeasible.")
+
+        # the terms by row, in the order of their first appearance as in
+        # `LinearExpression`, with the coefficients of a variable summed up
+        order = np.argsort(expression.row, kind='stable')
+        row, col, coef = expression.row[order], expression.col[order], expression.coef[order]
+        unique, first, inverse = np.unique(row * len(self.model.columns) + col, return_index=True,
+                                           return_inverse=True)
+        if len(unique) < len(row):
+            coef = np.bincount(inverse, weights=coef, minlength=len(unique))
+            order = np.argsort(first, kind='stable')
+            row, col, coef = row[first[order]], col[first[order]], coef[order]
+
+        generated = np.flatnonzero(has_terms)
+        names = [_name(equation.name, keys[i]) for i in generated.tolist()]
+        return names, np.searchsorted(generated, row), col, coef, sense, 0 - expression.constant[generated]
+
+    def _element_rows(self, equation):
+        """
+        Build the rows of an equation element by element, with
+        `LinearExpression`.
+
+        Returns:
+            tuple: The arguments of `LinearModel.add_rows`.
+        """
+
+        container = self.container
+        sense = _SENSES[equation.eq_sign]
+        names, terms, rhs = [], [], []
+
+        for elements, scope in self.equation_scopes(equation):
+
+            key = None
+            if elements:
+                key = elements[0] if len(elements) == 1 else elements
+            name = _name(equation.name, key)
+
+            try:
+                expression = evaluate(equation.lhs, container, scope) - evaluate(equation.rhs, container, scope)
+            except (TypeError, ValueError, NotImplementedError) as e:
+                # e.g., a function that cannot be evaluated
+                raise ValueError(f"The equation '{name}' is not linear: {e}.") from e
+
+            if not isinstance(expression, LinearExpression):
+                # no variables, the constraint holds or not
+                if (sense == 'E' and expression != 0) or (sense == 'L' and expression > 0) or \
+                        (sense == 'G' and expression < 0):
+                    raise ValueError(f"The equation '{name}' is infeasible.")
+                continue
+
+            names.append(name)
+            terms.append(expression.terms)
+            rhs.append(0 - expression.constant)
+
+        lengths = [len(t) for t in terms]
+        row = np.repeat(np.arange(len(terms), dtype=np.int64), lengths)
+        col = np.fromiter((k for t in terms for k in t), dtype=np.int64, count=sum(lengths))
+        data = np.fromiter((c for t in terms for c in t.values()), dtype=float, count=sum(lengths))
+        return names, row, col, data, sense, rhs
@@ -6,13 +6,27 @@ for major interactions.
 import logging
 import logging.config
 import os
+import re
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
 from lark import Lark, UnexpectedCharacters
 from .transformer import GAMSTransformer
+from .components.instrument import describe
+from .hooks import EVENTS, Hooks, statement_lines
+from .source import open_source, decode, leading_comments_end
+from .include import IncludeCache, IncludeResolver, include_cache
 
 logging.config.fileConfig('gams2pyomo/config.ini', disable_existing_loggers=False)
 logger = logging.getLogger('gams_translator')
 logger.setLevel(logging.WARNING)
 
+# the single-line comments, and the lines that start or end a comment block
+_COMMENT_LINE = re.compile(r'^\*(.*)$', re.MULTILINE)
+_TEXT_BLOCK_LINE = re.compile(r'^.*\$(?:on|off)text.*$', re.MULTILINE | re.IGNORECASE)
+_INCLUDE_LINE = re.compile(r'^[ \t]*\$include\b', re.MULTILINE | re.IGNORECASE)
+
 grammar = os.path.join(os.path.dirname(__file__), 'gams.lark')
 
 
@@ -21,39 +35,114 @@ with open(grammar, 'r', encoding="utf8") as in_file:
     lark_gams = Lark(text, propagate_positions=True, maybe_placeholders=False, debug=True)
 
 
-class GAMSTranslator():
-
-    def __init__(self, file):
+@contextmanager
+def _phase(phases, name, hooks=None):
+    """
+    Record the wall time of a translation phase, and its peak memory if
+    `tracemalloc` is tracing, and emit the phase events to the hooks.
+    """
+
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        memory = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+
+    if hooks:
+        hooks.emit('phase_start', phase=name, time=start)
+
+    try:
+        yield
+    finally:
+        phases[name] = {'seconds': time.perf_counter() - start}
+        if tracing:
+            phases[name]['peak_memory'] = tracemalloc.get_traced_memory()[1] - memory
+        if hooks:
+            hooks.emit('phase_end', phase=name, **phases[name])
+
+
+def format_statistics(statistics):
+    """
+    Format the statistics of a translation (see `GAMSTranslator.translate`)
+    as a text report.
+    """
+
+    lines = [f"{'phase':<16} {'seconds':>10} {'peak memory (MB)':>18}"]
+    for name, p in statistics.get('phases', {}).items():
+        memory = f"{p['peak_memory'] / 2 ** 20:.3f}" if 'peak_memory' in p else '-'
+        lines.append(f"{name:<16} {p['seconds']:>10.4f} {memory:>18}")
+    lines.append(f"{'total':<16} {sum(p['seconds'] for p in statistics.get('phases', {}).values()):>10.4f}")
+
+    lines.append('')
+    lines.append(f"parse tree nodes: {statistics.get('tree_nodes', 0)}")
+    lines.append("statements: " + ', '.join(f"{n} {k}" for k, n in statistics.get('statements', {}).items()))
+    if 'equations' in statistics:
+        lines.append("equations: " + ', '.join(f"{n} {k}" for k, n in statistics['equations'].items()))
+    if 'includes' in statistics:
+        includes = statistics['includes']
+        lines.append(f"included files: {len(includes)} ({sum(i['cached'] for i in includes)} parsed before)")
+    lines.append(f"output: {statistics.get('output_size', 0)} characters, {statistics.get('output_lines', 0)} lines")
+
+    return '\n'.join(lines)
 
-        if isinstance(file, str):
-            self.file = open(file, 'r', encoding="utf8")
-        else:
-            self.file = file
 
-        self.text = self.file.read()
+class GAMSTranslator():
+    """
+    Translate a GAMS file.
+
+    Args:
+        file (str or file): The GAMS file or its name.
+        hooks (Hooks, optional): The callbacks of the translation events,
+            e.g., for tracing the phases and the statements. The callbacks
+            can also be registered later with `hooks.register`, except for
+            the preprocessing phase. Defaults to None.
+        include_dirs (list, optional): The directories of the files included
+            with `$include`, besides the directory of the file and the working
+            directory. Defaults to ().
+        variables (dict, optional): The compile-time variables (`%name%`) in
+            the names of the included files, as given to GAMS with
+            `--name=value`. Defaults to None.
+        workers (int, optional): The maximum number of processes parsing the
+            included files. Defaults to the number of CPUs.
+    """
+
+    def __init__(self, file, hooks=None, include_dirs=(), variables=None, workers=None):
+
+        self.file = file
 
         # store the file name
-        if isinstance(file, str):
-            self.f_name = file.split('/')[-1]
+        if isinstance(file, (str, os.PathLike)):
+            self.f_name = os.path.basename(file)
+            directory = os.path.dirname(os.path.abspath(file))
         else:
             self.f_name = ''
+            directory = None
+
+        # the `$include` options, see `parse`
+        self.include_resolver = IncludeResolver(directory, include_dirs, variables, workers)
 
-        self._preprocess()
+        # the statistics of the last translation, see `translate`
+        self.statistics = {}
 
-    def _preprocess(self):
+        # translation phase -> wall time and peak memory
+        self._phases = {}
+
+        # the callbacks of the translation events, shared with the container
+        self.hooks = Hooks() if hooks is None else hooks
+
+        with _phase(self._phases, 'preprocessing', self.hooks), open_source(file) as source:
+            self._preprocess(source)
+
+    def _preprocess(self, source):
         """
-        Preprocess the text.
+        Preprocess the source (see `open_source`) into the text.
         """
 
         logger.info("Preprocessing the text...")
 
-        lines = self.text.split('\n')
-
-        # remove the first-line comments (as they lack `\n` and cannot be parsed by lark)
-        while len(lines[0]) > 0 and lines[0][0] == '*':
-            lines.pop(0)
-
-        self.text = '\n'.join(lines)
+        # skip the first-line comments (as they lack `\n` and cannot be parsed
+        # by lark) by offset, such that the source is decoded into one string
+        self.text = decode(source, leading_comments_end(source))
 
         logger.info("Done.")
 
@@ -68,21 +157,33 @@ class GAMSTranslator():
 
         logger.info("Parsing comments...")
 
-        lines = self.text.split('\n')
+        text = self.text
+
+        # the lines with `$ontext` or `$offtext`, by position
+        markers = [(m.start(), m.group(0).lower()) for m in _TEXT_BLOCK_LINE.finditer(text)]
 
         comments = []
 
         comment_block = False
-        for i, line in enumerate(lines):
-
-            if len(line) >= 7 and '$ontext' in line.lower():
-                comment_block = True
-            if len(line) >= 8 and '$offtext' in line.lower():
-                comment_block = False
-
-            if not comment_block and len(line) > 0 and line[0] == '*':
+        k = 0
+        # the line number at `position`
+        i = position = 0
+        count = text.count
+        for m in _COMMENT_LINE.finditer(text):
+
+            start = m.start()
+            while k < len(markers) and markers[k][0] <= start:
+                if '$ontext' in markers[k][1]:
+                    comment_block = True
+                if '$offtext' in markers[k][1]:
+                    comment_block = False
+                k += 1
+
+            if not comment_block:
+                i += count('\n', position, start)
+                position = start
                 # store line number and comment contents
-                comments.append((i, line[1:]))
+                comments.append((i, m.group(1)))
 
         # try to parse the comments in case they are executable
         if translate_comment:
@@ -111,43 +212,231 @@ class GAMSTranslator():
         """
         Parse the GAMS code.
 
+        If the code has `$include` options, the included files are parsed
+        separately, and the statements of all the files are in the tree (see
+        `IncludeResolver`). The statements of a file included between
+        statements are located at the line of its `$include`. The included
+        files are listed in `include_resolver.includes`.
+
         Returns:
             Tree: the resulting Lark Tree.
         """
 
         logger.info("Parsing the text...")
         try:
-            res = lark_gams.parse(self.text)
+            if _INCLUDE_LINE.search(self.text):
+                path = self.file if isinstance(self.file, (str, os.PathLike)) else None
+                res = self.include_resolver.parse(self.text, path)
+            else:
+                self.include_resolver.includes = []
+                res = lark_gams.parse(self.text)
         except UnexpectedCharacters as e:
             logger.error("An error occurred during the parsing step. Program terminates.")
             raise e
         logger.info("Done.")
         return res
 
-    def translate(self, translate_comment=True):
+    def profile_parse(self):
+        """Parse the GAMS code with the Earley parser instrumented, to find
+        the grammar rules, the terminals, and the source lines that make the
+        parsing slow, and the ambiguities (see `ParseProfile`).
+
+        The line numbers are those of the parsed text, i.e., after removing
+        the leading comment lines, as in the statement locations.
+
+        Returns:
+            ParseProfile: The profile; `report()` formats it.
+        """
+
+        from .parse_profile import profile_parse
+
+        logger.info("Profiling the parsing...")
+        _, profile = profile_parse(lark_gams, self.text)
+        logger.info("Done.")
+
+        return profile
+
+    def _transform(self, phases, comments=None, **options):
+        """
+        Parse the code and transform the tree into the components, as the
+        first steps of all the backends. The phases are timed into `phases`
+        and the hooks are called; the statistics of the parsing and the
+        transformation are stored in `statistics`.
+
+        Args:
+            phases (dict): Phase -> wall time and peak memory.
+            comments (list, optional): The comments, see `parse_comments`.
+                Defaults to None.
+            **options: Code generation options, see `ComponentContainer`.
+
+        Returns:
+            ComponentContainer: The container with the root statements.
+        """
+
+        # parse into tree
+        with _phase(phases, 'parsing', self.hooks):
+            parse_tree = self.parse()
+
+        if 'statement_parsed' in self.hooks:
+            for c in parse_tree.children:
+                self.hooks.emit('statement_parsed', statement=c, lines=statement_lines(c), start=None, seconds=None)
+
+        transformer = GAMSTransformer(assemble=False, **options)
+        transformer.container.hooks = self.hooks
+        if comments is not None:
+            transformer.container.import_comments(comments)
+        transformer.container.import_f_name(self.f_name)
+        # transform
+        with _phase(phases, 'transformation', self.hooks):
+            container = transformer.transform(parse_tree)
+
+        statements = Counter()
+        for statement in container.root_statements:
+            for _s in (statement if isinstance(statement, list) else [statement]):
+                statements[describe(_s)['statement']] += 1
+
+        self.statistics = {
+            'phases': phases,
+            'statements': dict(statements.most_common()),
+            'tree_nodes': sum(1 for _ in parse_tree.iter_subtrees()),
+        }
+        if self.include_resolver.includes:
+            self.statistics['includes'] = self.include_resolver.includes
+
+        return container
+
+    def translate(self, translate_comment=True, return_statistics=False, **options):
         """Translate the GAMS code into Python-Pyomo code.
 
+        The statistics of the translation are stored in `statistics`: the
+        wall time of each phase (preprocessing, comment parsing, parsing,
+        transformation, and assembly) and its peak memory if `tracemalloc` is
+        tracing, the number of root statements of each type, the number of
+        parse tree nodes, the size of the output, the number of linear,
+        quadratic, and nonlinear equations, and the declared type and the
+        class of each solved model (see also `format_statistics`).
+
         Args:
-            parse_comment (bool, optional): _description_. Defaults to True.
+            translate_comment (bool, optional): Whether to translate the code
+                in the comments. Defaults to True.
+            return_statistics (bool, optional): Whether to return the
+                statistics with the code. Defaults to False.
+            **options: Code generation options, see `ComponentContainer`.
 
         Returns:
-            _type_: _description_
+            str: The generated Python-Pyomo code, or a tuple of the code and
+                the statistics (dict) if `return_statistics` is True.
         """
 
         logger.info("Translating the GAMS code...")
 
+        phases = dict(self._phases)
+
         # extract comments
-        comments = self.parse_comments(translate_comment=translate_comment)
+        with _phase(phases, 'comments', self.hooks):
+            comments = self.parse_comments(translate_comment=translate_comment)
 
-        # parse into tree
-        parse_tree = lark_gams.parse(self.text)
+        container = self._transform(phases, comments, **options)
 
-        transformer = GAMSTransformer()
-        transformer.container.import_comments(comments)
-        transformer.container.import_f_name(self.f_name)
-        # transform
-        res = transformer.transform(parse_tree)
+        with _phase(phases, 'assembly', self.hooks):
+            res = container.assemble()
+
+        # e.g., the classes of the equations and of the solved models
+        self.statistics = dict(container.statistics, **self.statistics)
+        self.statistics.update({
+            'output_size': len(res),
+            'output_lines': res.count('\n'),
+        })
+
+        logger.info("Done.")
+
+        if return_statistics:
+            return res, self.statistics
+        return res
+
+    def build(self):
+        """Build the Pyomo model directly from the GAMS code, without
+        generating and executing Python code. Requires Pyomo.
+
+        The statements are executed until the first solve statement, see
+        `ModelBuilder` for the supported statements.
+
+        Returns:
+            ConcreteModel: The Pyomo model, not solved.
+        """
+
+        # Pyomo is only needed by this backend
+        from .builder import ModelBuilder
+
+        logger.info("Building the Pyomo model...")
+
+        phases = dict(self._phases)
+        container = self._transform(phases)
+
+        with _phase(phases, 'assembly', self.hooks):
+            model = ModelBuilder(container).build()
+
+        logger.info("Done.")
+
+        return model
+
+    def translate_kernel(self, data_file=None, code_file=None):
+        """Translate a linear GAMS model into array-oriented `pyomo.kernel`
+        code, where each equation is one matrix constraint whose coefficients
+        are NumPy expressions of the parameter arrays, see
+        `KernelCodeGenerator`.
+
+        Args:
+            data_file (str, optional): The NumPy `.npz` file for the large
+                arrays. If None, all the arrays are written in the code.
+                Defaults to None.
+            code_file (str, optional): The file where the code is saved, from
+                which the code finds the data file. Defaults to a file in the
+                directory of the data file.
+
+        Raises:
+            ValueError: If the model is not linear.
+
+        Returns:
+            str: The generated Python code.
+        """
+
+        from .kernel import KernelCodeGenerator
+
+        logger.info("Translating the GAMS code into kernel code...")
+
+        phases = dict(self._phases)
+        container = self._transform(phases)
+
+        with _phase(phases, 'assembly', self.hooks):
+            res = KernelCodeGenerator(container, data_file=data_file, code_file=code_file).assemble()
 
         logger.info("Done.")
 
         return res
+
+    def build_linear(self):
+        """Compile the linear model of the first solve statement into a sparse
+        coefficient representation, without Pyomo. The model can be written
+        as an LP or MPS file with `LinearModel.write`.
+
+        Raises:
+            ValueError: If the model is not linear.
+
+        Returns:
+            LinearModel: The linear model.
+        """
+
+        from .linear import LinearModelBuilder
+
+        logger.info("Building the linear model...")
+
+        phases = dict(self._phases)
+        container = self._transform(phases)
+
+        with _phase(phases, 'assembly', self.hooks):
+            model = LinearModelBuilder(container).build()
+
+        logger.info("Done.")
+
+        return model
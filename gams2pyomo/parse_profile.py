@@ -0,0 +1,218 @@
+"""
+This module profiles the Earley parser on a GAMS text, to find the grammar
+rules, the terminals, and the source regions that make the parsing slow (see
+`GAMSTranslator.profile_parse`).
+"""
+
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from lark.parsers.earley_forest import SymbolNode
+
+
+class ParseProfile:
+    """
+    The profile of the parsing of a text.
+
+    The Earley parser processes the text character by character: at each
+    position, the items (partially matched rules) are predicted and
+    completed, and the terminals expected by the items are matched with
+    regular expressions. The time of the prediction and completion at a
+    position is divided among the rules by their number of items there, so
+    the time of a rule is an estimate; the time of a terminal is measured.
+
+    Attributes:
+        seconds (float): The total parsing time, including the construction
+            of the parse tree.
+        earley_seconds (float): The time of the prediction, completion, and
+            terminal matching.
+        rules (dict): Rule -> the number of items and the estimated time
+            (seconds).
+        terminals (dict): Terminal -> its pattern, the number of match
+            attempts and successful matches, and the time (seconds).
+        lines (dict): Source line -> the number of items and the time
+            (seconds) at the positions of the line.
+        ambiguities (list): The ambiguous parts of the text: the rule, the
+            source lines, and the number of derivations.
+    """
+
+    def __init__(self):
+
+        self.seconds = 0.0
+        self.earley_seconds = 0.0
+        self.rules = defaultdict(lambda: {'items': 0, 'seconds': 0.0})
+        self.terminals = {}
+        self.lines = defaultdict(lambda: {'items': 0, 'seconds': 0.0})
+        self.ambiguities = []
+
+    def to_dict(self):
+        """
+        The profile as a dict, e.g., for saving as JSON.
+        """
+
+        return {
+            'seconds': self.seconds,
+            'earley_seconds': self.earley_seconds,
+            'rules': dict(self.rules),
+            'terminals': self.terminals,
+            'lines': dict(self.lines),
+            'ambiguities': self.ambiguities,
+        }
+
+    def report(self, top=10):
+        """
+        Format the profile as a text report with the most expensive rules,
+        terminals, and source lines, and the ambiguities.
+
+        Args:
+            top (int, optional): The number of entries in each section.
+                Defaults to 10.
+        """
+
+        res = [f"parsing: {self.seconds:.4f} s (Earley items and terminals: {self.earley_seconds:.4f} s, "
+               f"parse tree: {self.seconds - self.earley_seconds:.4f} s)", ""]
+
+        res.append(f"{'rule':<32} {'items':>10} {'seconds':>10}")
+        for name, r in sorted(self.rules.items(), key=lambda item: item[1]['seconds'], reverse=True)[:top]:
+            res.append(f"{name:<32} {r['items']:>10} {r['seconds']:>10.4f}")
+
+        res += ["", f"{'terminal':<32} {'attempts':>10} {'matches':>10} {'seconds':>10}"]
+        for name, t in sorted(self.terminals.items(), key=lambda item: item[1]['seconds'], reverse=True)[:top]:
+            label = name if not name.startswith('__ANON') else f"{name} {t['pattern']}"
+            res.append(f"{label[:32]:<32} {t['attempts']:>10} {t['matches']:>10} {t['seconds']:>10.4f}")
+
+        res += ["", f"{'line':>8} {'items':>10} {'seconds':>10}"]
+        for line, r in sorted(self.lines.items(), key=lambda item: item[1]['seconds'], reverse=True)[:top]:
+            res.append(f"{line:>8} {r['items']:>10} {r['seconds']:>10.4f}")
+
+        res += ["", f"ambiguities: {len(self.ambiguities)}"]
+        counts = defaultdict(int)
+        for a in self.ambiguities:
+            counts[a['rule']] += 1
+        for rule, n in sorted(counts.items(), key=lambda item: item[1], reverse=True)[:top]:
+            lines = sorted({a['lines'][0] for a in self.ambiguities if a['rule'] == rule})
+            more = ', ...' if len(lines) > 5 else ''
+            res.append(f"  {rule}: {n} (lines {', '.join(map(str, lines[:5]))}{more})")
+
+        return '\n'.join(res)
+
+
+def profile_parse(lark, text):
+    """
+    Parse a text with the Earley parser of a Lark instance (with the dynamic
+    lexer), and profile the rules, the terminals, the source lines, and the
+    ambiguities.
+
+    The parser is instrumented during the parsing, so the instance must not
+    be used by other threads meanwhile.
+
+    Args:
+        lark (Lark): The Lark instance.
+        text (str): The text.
+
+    Returns:
+        tuple: The parse tree and the profile (`ParseProfile`).
+    """
+
+    profile = ParseProfile()
+    parser = lark.parser.parser
+
+    # the first position of each line
+    line_starts = [0] + [n + 1 for n, c in enumerate(text) if c == '\n']
+
+    def line(position):
+        return bisect_right(line_starts, position)
+
+    # the columns (Earley sets) of the parse, for the ambiguities
+    state = {}
+
+    predict_and_complete = parser.predict_and_complete
+    term_matcher = parser.term_matcher
+
+    def _predict_and_complete(i, to_scan, columns, transitives):
+
+        start = time.perf_counter()
+        predict_and_complete(i, to_scan, columns, transitives)
+        seconds = time.perf_counter() - start
+
+        state['columns'] = columns
+
+        items = defaultdict(int)
+        for item in columns[i]:
+            items[item.rule.origin.name] += 1
+        for item in to_scan:
+            items[item.rule.origin.name] += 1
+        n_items = sum(items.values()) or 1
+
+        for name, n in items.items():
+            r = profile.rules[name]
+            r['items'] += n
+            r['seconds'] += seconds * n / n_items
+
+        r = profile.lines[line(i)]
+        r['items'] += n_items
+        r['seconds'] += seconds
+        profile.earley_seconds += seconds
+
+    def _term_matcher(term, stream, index=0):
+
+        start = time.perf_counter()
+        m = term_matcher(term, stream, index)
+        seconds = time.perf_counter() - start
+
+        t = profile.terminals.get(term.name)
+        if t is None:
+            t = profile.terminals[term.name] = {'pattern': lark.get_terminal(term.name).pattern.value,
+                                                'attempts': 0, 'matches': 0, 'seconds': 0.0}
+        t['attempts'] += 1
+        t['matches'] += m is not None
+        t['seconds'] += seconds
+
+        profile.lines[line(index)]['seconds'] += seconds
+        profile.earley_seconds += seconds
+
+        return m
+
+    parser.predict_and_complete = _predict_and_complete
+    parser.term_matcher = _term_matcher
+
+    start = time.perf_counter()
+    try:
+        tree = lark.parse(text)
+    finally:
+        profile.seconds = time.perf_counter() - start
+        del parser.predict_and_complete
+        parser.term_matcher = term_matcher
+
+    # the ambiguities in the shared packed parse forest
+    roots = [item.node for item in state['columns'][-1]
+             if item.is_complete and item.node is not None and item.start == 0]
+    for node in _symbol_nodes(roots):
+        derivations = len(node.children)
+        if derivations > 1:
+            rule = node.s[0].origin.name if node.is_intermediate else node.s.name
+            profile.ambiguities.append({'rule': rule, 'lines': (line(node.start), line(max(node.end - 1, 0))),
+                                        'derivations': derivations})
+
+    profile.ambiguities.sort(key=lambda a: a['lines'])
+
+    return tree, profile
+
+
+def _symbol_nodes(roots):
+    """
+    Iterate through the symbol nodes of a shared packed parse forest.
+    """
+
+    visited = set()
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        yield node
+        for packed in node.children:
+            for child in (packed.left, packed.right):
+                if isinstance(child, SymbolNode):
+                    stack.append(child)
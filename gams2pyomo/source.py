@@ -0,0 +1,78 @@
+"""
+This module reads the GAMS source for the translator: from a file name (large
+files are memory-mapped), from a file object, or from a bytes-like object. The
+source is decoded into text once, from the offset where the code starts, such
+that the peak memory stays close to one copy of the text.
+"""
+
+import mmap
+import os
+import re
+from contextlib import contextmanager
+
+# the files of at least this size (bytes) are memory-mapped
+MMAP_THRESHOLD = 16 * 2 ** 20
+
+# the comment lines at the beginning, which are skipped
+_LEADING_COMMENTS = re.compile(r'(?:\*[^\n]*\n)*')
+_LEADING_COMMENTS_BYTES = re.compile(rb'(?:\*[^\n]*\n)*')
+
+
+@contextmanager
+def open_source(file):
+    """
+    Open the GAMS source.
+
+    Args:
+        file (str, os.PathLike, bytes, bytearray, memoryview, or file): The
+            name of the file, its contents as UTF-8 bytes, or a file object
+            in text or binary mode.
+
+    Yields:
+        The contents: a string, or a bytes-like object (a memory map for the
+            files of at least `MMAP_THRESHOLD` bytes), valid in the context.
+    """
+
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        yield file
+        return
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    yield m
+            else:
+                yield f.read()
+        return
+
+    yield file.read()
+
+
+def leading_comments_end(source):
+    """
+    The offset of the first line of the source that is not a comment, i.e.,
+    does not start with `*`.
+    """
+
+    pattern = _LEADING_COMMENTS if isinstance(source, str) else _LEADING_COMMENTS_BYTES
+    return pattern.match(source).end()
+
+
+def decode(source, start=0):
+    """
+    The text of the source from an offset, with the line endings converted
+    to `\\n` as when reading a file in text mode. Bytes are decoded as UTF-8
+    without an intermediate copy.
+    """
+
+    if isinstance(source, str):
+        text = source[start:] if start else source
+    else:
+        with memoryview(source) as view, view[start:] as part:
+            text = str(part, 'utf8')
+
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+    return text
@@ -1,8 +1,11 @@
 import logging
+import time
 from typing import List
 from lark import Transformer, Tree, Token, v_args
 from .components import *
-from .util import sequence_set
+from .util import sequence_set, ElementRange
+from .delimited import DelimitedData
+from .hooks import statement_lines
 from .components.container import _ARITHMETIC_TYPES
 
 logging.config.fileConfig('gams2pyomo/config.ini', disable_existing_loggers=False)
@@ -16,18 +19,45 @@ class GAMSTransformer(Transformer):
     The transformer class that transforms a Lark tree into Python/Pyomo code.
     """
 
-    def __init__(self, visit_tokens: bool = True) -> None:
+    def __init__(self, visit_tokens: bool = True, assemble: bool = True, **options) -> None:
         super().__init__(visit_tokens)
-        self.container = ComponentContainer()
+        # `options` are the code generation options of the container
+        self.container = ComponentContainer(**options)
+        # whether to generate the code at the root node, or to return the
+        # container with the components (e.g., for `ModelBuilder`)
+        self._assemble = assemble
 
     # root node transforming ---------------------------------------------------
 
+    def transform(self, tree):
+        """
+        Transform the tree. With callbacks for `statement_transformed` in
+        `container.hooks`, the root statements are transformed and timed one
+        by one.
+        """
+
+        hooks = self.container.hooks
+        if 'statement_transformed' not in hooks or tree.data != 'start':
+            return super().transform(tree)
+
+        children = []
+        for c in tree.children:
+            start = time.perf_counter()
+            res = list(self._transform_children([c]))
+            hooks.emit('statement_transformed', statement=res[0] if res else None, lines=statement_lines(c),
+                       start=start, seconds=time.perf_counter() - start)
+            children += res
+
+        return self._call_userfunc(tree, children)
+
     def start(self, _, children):
         """
         Assemble the result string at the root node.
         """
 
         self.container.add_root_statements(children)
+        if not self._assemble:
+            return self.container
         res = self.container.assemble()
         return res
 
@@ -136,6 +166,8 @@ class GAMSTransformer(Transformer):
         # `.type` attributes
         for set_def in children:
             set_def.type = 'set'
+            if isinstance(set_def.data, DelimitedData):
+                set_def.data = set_def.data.set_elements(_dimension(set_def.symbol))
             # update their names to upper cases
             set_def.symbol.name = set_def.symbol.name.upper()
         return children
@@ -143,6 +175,8 @@ class GAMSTransformer(Transformer):
     def parameter_list(self, _, children):
         for param in children:
             param.type = 'parameter'
+            if isinstance(param.data, DelimitedData):
+                param.data = param.data.parameter_values(_dimension(param.symbol))
         return children
 
     def scalar_list(self, _, children):
@@ -272,9 +306,19 @@ class GAMSTransformer(Transformer):
 
     def data(self, meta, children):
         if isinstance(children, list):
-            if isinstance(children[0], list) and len(children) == 1:
-                return children[0]
-            return [c for c in children if c is not None]
+            elements = [c for c in children if c is not None]
+            # the delimited files, read when the symbol is known
+            if any(isinstance(c, DelimitedData) for c in elements):
+                if not all(isinstance(c, DelimitedData) for c in elements):
+                    raise NotImplementedError("Delimited data mixed with other elements is not supported.")
+                return DelimitedData(path for c in elements for path in c.paths)
+            # a range is kept as it is, e.g., `t1*t100`
+            if len(elements) == 1 and isinstance(elements[0], (list, ElementRange)):
+                return elements[0]
+            # the ranges among other elements, e.g., `a, t1*t3`
+            if any(isinstance(c, (list, ElementRange)) for c in elements):
+                return [e for c in elements for e in (c if isinstance(c, (list, ElementRange)) else [c])]
+            return elements
         if len(children) == 1:
             return children[0]
         # idx_value
@@ -295,7 +339,7 @@ class GAMSTransformer(Transformer):
         # probably most of the time?
         if len(children) == 1:
             c = children[0]
-            if isinstance(c, (list, float, int, str)):
+            if isinstance(c, (list, ElementRange, DelimitedData, float, int, str)):
                 return c
         raise NotImplementedError
 
@@ -510,6 +554,9 @@ class GAMSTransformer(Transformer):
     def macro(self, meta, children):
         option = children[0].value
         args = children[1].value
+        # a delimited file, see `IncludeResolver`
+        if option.lower() == 'ondelim':
+            return DelimitedData([args.strip()])
         return Macro(option, args, meta)
 
     def table_definition(self, meta, children):
@@ -520,6 +567,8 @@ class GAMSTransformer(Transformer):
         for c in children[1:]:
             if isinstance(c, dict):
                 data = c
+            elif isinstance(c, DelimitedData):
+                data = c.table_values(_dimension(symbol))
             else:
                 description = c
         return Definition(symbol, description, data, meta, type='parameter')
@@ -565,3 +614,10 @@ class GAMSTransformer(Transformer):
 
     def acronym_def(self, meta, children):
         return NotImplementedError("Acronym definition is not translated.")
+
+
+def _dimension(symbol):
+    """
+    The number of indices of a declared symbol.
+    """
+    return len(symbol.index_list) if getattr(symbol, 'index_list', None) else 1
@@ -1,26 +1,108 @@
-import numpy as np
+import re
+from collections.abc import Sequence
+
+# the prefix and the number of an element, e.g., `t` and `12` in `t12`
+_ELEMENT = re.compile(r'(.+?)(\d*)')
+
+
+class ElementRange(Sequence):
+    """
+    The elements of a range of numbered set elements, e.g., `t1*t100` or
+    `1*100`, computed on demand, such that a long range takes constant space.
+
+    The `repr` is the Python code of the elements, e.g.,
+    `[f't{i}' for i in range(1, 101)]`, for the generated code.
+
+    Args:
+        prefix (str): The prefix of the elements; the elements are integers
+            if the prefix is empty.
+        first (int): The number of the first element.
+        last (int): The number of the last element.
+    """
+
+    def __init__(self, prefix, first, last):
+
+        self.prefix = prefix
+        self.range = range(first, last + 1)
+
+    def __len__(self):
+        return len(self.range)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self._element(i) for i in self.range[k]]
+        return self._element(self.range[k])
+
+    def __iter__(self):
+        if not self.prefix:
+            return iter(self.range)
+        return (self.prefix + str(i) for i in self.range)
+
+    def __contains__(self, element):
+        return self._number(element) is not None
+
+    def index(self, element, *args):
+        n = self._number(element)
+        if n is None or args:
+            # e.g., with the start and stop arguments
+            return super().index(element, *args)
+        return self.range.index(n)
+
+    def __eq__(self, other):
+        if isinstance(other, ElementRange) and self.prefix == other.prefix:
+            return self.range == other.range
+        if isinstance(other, (ElementRange, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __hash__(self):
+        # equal to the tuple of the elements, as the ranges are equal to it
+        return hash(tuple(self))
+
+    def __repr__(self):
+        if not self.prefix:
+            return f"range({self.range.start}, {self.range.stop})"
+        element = self.prefix.replace('{', '{{').replace('}', '}}') + '{i}'
+        return f"[f{element!r} for i in range({self.range.start}, {self.range.stop})]"
+
+    def _element(self, i):
+        return self.prefix + str(i) if self.prefix else i
+
+    def _number(self, element):
+        """
+        The number of an element of the range, or None.
+        """
+
+        if not self.prefix:
+            n = element if isinstance(element, int) and not isinstance(element, bool) else None
+        elif isinstance(element, str) and element.startswith(self.prefix):
+            digits = element[len(self.prefix):]
+            n = int(digits) if digits.isdigit() and str(int(digits)) == digits else None
+        else:
+            n = None
+
+        return n if n is not None and n in self.range else None
 
-NUMBER = '0123456789'
 
 def sequence_set(idx1, idx2):
     """
     Generate a set as a sequence from idx1 to idx2.
+
+    Returns:
+        ElementRange or list: The numbered elements as a range, or a list of
+            the letters from idx1 to idx2.
     """
 
     # when index is int, directly return a range
     if isinstance(idx1, int):
-        return list(range(idx1, idx2 + 1))
+        return ElementRange('', idx1, idx2)
 
-    # get the string prefix to see if it is string + int or pure string
-    prefix = ''
-    for i, c in enumerate(idx1):
-        prefix = idx1[:i + 1]
-        left = idx1[i + 1:]
-        if all([c in NUMBER for c in left]):
-            break
+    # the shortest prefix after which there are only digits, e.g., `a` and
+    # `10` in `a10`, or the whole string if it does not end with digits
+    prefix, digits = _ELEMENT.fullmatch(idx1).groups()
 
     # pure string, e.g., a * i
-    if prefix == idx1:
+    if not digits:
         char = idx1
         res = []
         while char != idx2:
@@ -30,13 +112,9 @@ def sequence_set(idx1, idx2):
         return res
 
     # string + int, e.g., a1 * a10
-    try:
-        n1 = int(idx1.split(prefix)[1])
-        n2 = int(idx2.split(prefix)[1])
-        _set = range(n1, n2 + 1)
-        return [prefix + str(i) for i in _set]
-    except ValueError:
-        return list(range(int(idx1), int(idx2) + 1))
+    if isinstance(idx2, str) and idx2.startswith(prefix) and idx2[len(prefix):].isdigit():
+        return ElementRange(prefix, int(digits), int(idx2[len(prefix):]))
+    return ElementRange('', int(idx1), int(idx2))
 
 def change_case(string):
     """Change string format into snake case."""